@@ -7,15 +7,27 @@ from PyQt6.QtWidgets import QApplication
 from ai_radio_gui.app import MainWindow
 from ai_radio_gui.models.state import AppState
 from ai_radio_gui.services.mock_backend import MockBackend
+from ai_radio_gui.services.snapshot import (
+    SnapshotWriter,
+    default_snapshot_path,
+    load_snapshot,
+)
 
 
 def main() -> None:
     app = QApplication(sys.argv)
     app.setApplicationName("AI News Radio")
     state = AppState()
+    snapshot_path = default_snapshot_path()
+    load_snapshot(state, snapshot_path)
     backend = MockBackend(state)
     window = MainWindow(state, backend)
     window.show()
+    app.processEvents()
+    backend.start()
+    snapshot_writer = SnapshotWriter(state, snapshot_path)
+    app.aboutToQuit.connect(snapshot_writer.close)
+    app.aboutToQuit.connect(backend.stop)
     sys.exit(app.exec())
 
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
@@ -35,6 +35,10 @@ class SegmentEntry:
     start_time: str
     duration_seconds: int
     remaining_seconds: int
+    segment_id: str = ""
+    start_deadline: float = 0.0
+    end_deadline: float = 0.0
+    tts_status: str = ""
 
 
 @dataclass
@@ -48,6 +52,13 @@ class TrackEntry:
     name: str
     kind: str
     level: int
+    gain_db: float = 0.0
+    pan: float = 0.0
+    muted: bool = False
+    solo: bool = False
+    loudness_lufs: float = -120.0
+    true_peak_dbtp: float = -120.0
+    norm_gain_db: float = 0.0
 
 
 @dataclass
@@ -56,6 +67,34 @@ class StreamStats:
     bitrate_kbps: int
     listeners: int
     url: str
+    profile: str = ""
+    encoder_cpu_percent: float = 0.0
+    queue_ms: float = 0.0
+    switchover_ms: float = 0.0
+    hls_url: str = ""
+
+
+@dataclass
+class MountStats:
+    mount: str
+    profile: str
+    status: str
+    bitrate_kbps: int
+    listeners: int
+    listener_peak: int = 0
+    encoder_cpu_percent: float = 0.0
+    queue_ms: float = 0.0
+    url: str = ""
+
+
+@dataclass
+class AudiencePoint:
+    start: float
+    uniques: float
+    sessions: int
+    peak_concurrent: int
+    avg_concurrent: float
+    listen_hours: float
 
 
 @dataclass
@@ -81,15 +120,27 @@ class ConfigState:
     retention_days: int
     auto_update: bool
     policy_mode: str
+    breaking_slo_seconds: int = 300
+
+
+@dataclass
+class BreakingLatency:
+    last_seconds: float
+    p95_seconds: float
+    samples: int
+    violations: int
 
 
 class AppState(QObject):
     ingestion_updated = pyqtSignal()
     memory_updated = pyqtSignal()
     scheduler_updated = pyqtSignal()
+    scheduler_plan_updated = pyqtSignal()
     scripting_updated = pyqtSignal()
+    scripting_token = pyqtSignal(str)
     audio_updated = pyqtSignal()
     streaming_updated = pyqtSignal()
+    audience_updated = pyqtSignal()
     observability_updated = pyqtSignal()
     config_updated = pyqtSignal()
     system_updated = pyqtSignal()
@@ -107,19 +158,29 @@ class AppState(QObject):
         self.scheduler_rundown: List[SegmentEntry] = []
         self.scheduler_upcoming: List[SegmentEntry] = []
         self.scheduler_paused = False
+        self.scheduler_plan: List[SegmentEntry] = []
+        self.breaking_latency = BreakingLatency(
+            last_seconds=0.0, p95_seconds=0.0, samples=0, violations=0
+        )
 
         self.scripting_last_script = ""
         self.scripting_roles: List[ScriptRole] = []
         self.scripting_humor = 40
         self.scripting_tone = 55
+        self.scripting_generating = False
 
         self.audio_tracks: List[TrackEntry] = []
         self.audio_ducking = False
         self.audio_fallback = False
+        self.audio_loudness: Dict[str, str] = {}
 
         self.streaming_stats = StreamStats(
             status="Offline", bitrate_kbps=0, listeners=0, url=""
         )
+        self.stream_mounts: List[MountStats] = []
+        self.audience_hourly: List[AudiencePoint] = []
+        self.audience_summary: Dict[str, str] = {}
+        self.audience_listen_times: List[Tuple[str, int]] = []
 
         self.logs: List[LogEntry] = []
         self.metrics: List[MetricEntry] = []
@@ -163,31 +224,64 @@ class AppState(QObject):
         self.scheduler_paused = paused
         self.scheduler_updated.emit()
 
+    def update_scheduler_plan(self, plan: List[SegmentEntry]) -> None:
+        self.scheduler_plan = plan
+        self.scheduler_plan_updated.emit()
+
+    def update_breaking_latency(self, latency: BreakingLatency) -> None:
+        self.breaking_latency = latency
+        self.scheduler_updated.emit()
+
     def update_scripting(
         self,
         script_text: str,
         roles: List[ScriptRole],
         humor: int,
         tone: int,
+        generating: bool = False,
     ) -> None:
         self.scripting_last_script = script_text
         self.scripting_roles = roles
         self.scripting_humor = humor
         self.scripting_tone = tone
+        self.scripting_generating = generating
         self.scripting_updated.emit()
 
+    def append_script_token(self, token: str) -> None:
+        self.scripting_last_script += token
+        self.scripting_token.emit(token)
+
     def update_audio(
-        self, tracks: List[TrackEntry], ducking: bool, fallback: bool
+        self,
+        tracks: List[TrackEntry],
+        ducking: bool,
+        fallback: bool,
+        loudness: Optional[Dict[str, str]] = None,
     ) -> None:
         self.audio_tracks = tracks
         self.audio_ducking = ducking
         self.audio_fallback = fallback
+        self.audio_loudness = loudness or {}
         self.audio_updated.emit()
 
-    def update_streaming(self, stats: StreamStats) -> None:
+    def update_streaming(
+        self, stats: StreamStats, mounts: Optional[List[MountStats]] = None
+    ) -> None:
         self.streaming_stats = stats
+        self.stream_mounts = mounts or []
         self.streaming_updated.emit()
 
+    def update_audience(
+        self,
+        hourly: List[AudiencePoint],
+        summary: Dict[str, str],
+        listen_times: List[Tuple[str, int]],
+    ) -> None:
+        self.audience_hourly = hourly
+        self.audience_summary = summary
+        self.audience_listen_times = listen_times
+        self.audience_updated.emit()
+
     def update_logs(self, logs: List[LogEntry]) -> None:
         self.logs = logs
         self.observability_updated.emit()
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Upper bounds (seconds) of the listen-time bins; the last bin is open.
+LISTEN_TIME_BOUNDS = np.array([30, 60, 300, 900, 1800, 3600, 7200], dtype=np.float64)
+LISTEN_TIME_LABELS = ("<30s", "30s-1m", "1-5m", "5-15m", "15-30m", "30-60m", "1-2h", ">2h")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audience_hourly (
+    start INTEGER PRIMARY KEY,
+    uniques REAL NOT NULL,
+    sessions INTEGER NOT NULL,
+    listen_seconds REAL NOT NULL,
+    peak_concurrent INTEGER NOT NULL,
+    avg_concurrent REAL NOT NULL,
+    histogram BLOB NOT NULL,
+    sketch BLOB,
+    concurrent_seconds REAL NOT NULL DEFAULT 0,
+    sampled_seconds REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS audience_daily (
+    start INTEGER PRIMARY KEY,
+    uniques REAL NOT NULL,
+    sessions INTEGER NOT NULL,
+    listen_seconds REAL NOT NULL,
+    peak_concurrent INTEGER NOT NULL,
+    avg_concurrent REAL NOT NULL,
+    histogram BLOB NOT NULL,
+    sketch BLOB,
+    concurrent_seconds REAL NOT NULL DEFAULT 0,
+    sampled_seconds REAL NOT NULL DEFAULT 0
+);
+"""
+_MIGRATIONS = (
+    ("concurrent_seconds", "ADD COLUMN concurrent_seconds REAL NOT NULL DEFAULT 0"),
+    ("sampled_seconds", "ADD COLUMN sampled_seconds REAL NOT NULL DEFAULT 0"),
+)
+_COLUMNS = "start, uniques, sessions, listen_seconds, peak_concurrent, avg_concurrent, histogram"
+# What an open period needs beyond its rollup to carry on after a restart.
+_STATE_COLUMNS = "sketch, concurrent_seconds, sampled_seconds"
+
+
+class HyperLogLog:
+    # 2**precision one-byte registers (4 KiB at the default), ~1.6% standard
+    # error at any cardinality. Sketches merge by register-wise max, so
+    # hourly and daily sketches combine into uniques over any range.
+    def __init__(self, precision: int = 12, registers: Optional[bytes] = None) -> None:
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is not None:
+            self.registers = np.frombuffer(registers, dtype=np.uint8).copy()
+        else:
+            self.registers = np.zeros(self.size, dtype=np.uint8)
+
+    def add(self, item: str) -> None:
+        value = int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "big")
+        bits = 64 - self.precision
+        index = value >> bits
+        rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> float:
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / float(np.exp2(-self.registers.astype(np.float64)).sum())
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * size and zeros:
+            # Linear counting is more accurate while many registers are empty.
+            return size * math.log(size / zeros)
+        return estimate
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(self.registers.tobytes(), 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, precision: int = 12) -> "HyperLogLog":
+        return cls(precision, zlib.decompress(data))
+
+
+def listen_time_bin(seconds: float) -> int:
+    return int(np.searchsorted(LISTEN_TIME_BOUNDS, seconds, side="right"))
+
+
+@dataclass
+class AudienceRollup:
+    start: int
+    uniques: float
+    sessions: int
+    listen_seconds: float
+    peak_concurrent: int
+    avg_concurrent: float
+    histogram: List[int]
+
+
+@dataclass
+class _Bucket:
+    start: int
+    sketch: HyperLogLog
+    sessions: int = 0
+    listen_seconds: float = 0.0
+    peak_concurrent: int = 0
+    concurrent_seconds: float = 0.0
+    sampled_seconds: float = 0.0
+    histogram: np.ndarray = field(
+        default_factory=lambda: np.zeros(len(LISTEN_TIME_LABELS), dtype=np.int64)
+    )
+
+    def rollup(self) -> AudienceRollup:
+        average = self.concurrent_seconds / self.sampled_seconds if self.sampled_seconds else 0.0
+        return AudienceRollup(
+            self.start,
+            round(self.sketch.count(), 1),
+            self.sessions,
+            self.listen_seconds,
+            self.peak_concurrent,
+            average,
+            self.histogram.tolist(),
+        )
+
+    def row(self) -> tuple:
+        rollup = self.rollup()
+        return (
+            rollup.start,
+            rollup.uniques,
+            rollup.sessions,
+            rollup.listen_seconds,
+            rollup.peak_concurrent,
+            rollup.avg_concurrent,
+            self.histogram.astype("<i8").tobytes(),
+            self.sketch.to_bytes(),
+            self.concurrent_seconds,
+            self.sampled_seconds,
+        )
+
+
+def _rollup_from_row(row: tuple) -> AudienceRollup:
+    start, uniques, sessions, listen_seconds, peak, average, histogram = row
+    return AudienceRollup(
+        start,
+        uniques,
+        sessions,
+        listen_seconds,
+        peak,
+        average,
+        np.frombuffer(histogram, dtype="<i8").tolist(),
+    )
+
+
+class ListenerAnalytics:
+    # Listener accounting at constant memory: only the open hour and day
+    # are held in memory, as HyperLogLog sketches plus counters and a
+    # listen-time histogram. Closed periods are rolled up into one SQLite
+    # row each (the open ones are upserted every flush_seconds), so weeks
+    # of trends are a small indexed table. Hourly sketches are dropped
+    # after sketch_days; daily sketches are kept for range uniques.
+    def __init__(
+        self,
+        db_path: Path,
+        precision: int = 12,
+        sketch_days: int = 14,
+        flush_seconds: float = 60.0,
+        clock=time.time,
+    ) -> None:
+        self.db_path = db_path
+        self.precision = precision
+        self.sketch_days = sketch_days
+        self.flush_seconds = flush_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        with self._db:
+            for table in ("audience_hourly", "audience_daily"):
+                columns = {row[1] for row in self._db.execute(f"PRAGMA table_info({table})")}
+                for column, statement in _MIGRATIONS:
+                    if column not in columns:
+                        self._db.execute(f"ALTER TABLE {table} {statement}")
+        now = self._clock()
+        self._hour = self._restore("audience_hourly", int(now // 3600 * 3600))
+        self._day = self._restore("audience_daily", int(now // 86400 * 86400))
+        # Live sessions only: session key -> (client id, started at).
+        self._active: Dict[int, Tuple[str, float]] = {}
+        self._last_sample = now
+        self._last_flush = now
+        self.sessions_total = 0
+
+    def _restore(self, table: str, start: int) -> _Bucket:
+        # Continue a period that was open when the process last stopped.
+        row = self._db.execute(
+            f"SELECT {_COLUMNS}, {_STATE_COLUMNS} FROM {table} WHERE start = ?", (start,)
+        ).fetchone()
+        if row is None or row[-3] is None:
+            return _Bucket(start, HyperLogLog(self.precision))
+        rollup = _rollup_from_row(row[:-3])
+        sketch, concurrent_seconds, sampled_seconds = row[-3:]
+        return _Bucket(
+            start,
+            HyperLogLog.from_bytes(sketch, self.precision),
+            rollup.sessions,
+            rollup.listen_seconds,
+            rollup.peak_concurrent,
+            concurrent_seconds,
+            sampled_seconds,
+            np.array(rollup.histogram, dtype=np.int64),
+        )
+
+    def session_started(self, key: int, client_id: str) -> None:
+        with self._lock:
+            now = self._clock()
+            self._roll(now)
+            self._active[key] = (client_id, now)
+            concurrent = len(self._active)
+            for bucket in (self._hour, self._day):
+                bucket.sketch.add(client_id)
+                bucket.sessions += 1
+                bucket.peak_concurrent = max(bucket.peak_concurrent, concurrent)
+            self.sessions_total += 1
+
+    def session_ended(self, key: int) -> None:
+        with self._lock:
+            now = self._clock()
+            self._roll(now)
+            session = self._active.pop(key, None)
+            if session is None:
+                return
+            index = listen_time_bin(now - session[1])
+            self._hour.histogram[index] += 1
+            self._day.histogram[index] += 1
+
+    def sample(self) -> None:
+        # Integrates concurrency over time (listener-seconds, average
+        # concurrency) and persists the open periods now and then.
+        with self._lock:
+            now = self._clock()
+            self._roll(now)
+            if now - self._last_flush >= self.flush_seconds:
+                self._flush()
+
+    @property
+    def concurrent(self) -> int:
+        return len(self._active)
+
+    def _accumulate(self, now: float) -> None:
+        elapsed = max(0.0, now - self._last_sample)
+        concurrent = len(self._active)
+        for bucket in (self._hour, self._day):
+            bucket.listen_seconds += concurrent * elapsed
+            bucket.concurrent_seconds += concurrent * elapsed
+            bucket.sampled_seconds += elapsed
+        self._last_sample = now
+
+    def _roll(self, now: float) -> None:
+        # Close out each period at its boundary, then open the next with
+        # everyone still listening counted in it. A gap spanning several
+        # hours closes every hour in between, so none loses its
+        # listener-seconds or its row.
+        while now >= self._hour.start + 3600:
+            hour = self._hour.start + 3600
+            self._accumulate(hour)
+            self._flush()
+            closed_day = hour >= self._day.start + 86400
+            self._hour = _Bucket(hour, HyperLogLog(self.precision))
+            if closed_day:
+                self._day = _Bucket(hour // 86400 * 86400, HyperLogLog(self.precision))
+                self._prune(self._day.start)
+            buckets = (self._hour, self._day) if closed_day else (self._hour,)
+            for bucket in buckets:
+                for client_id, _ in self._active.values():
+                    bucket.sketch.add(client_id)
+                bucket.peak_concurrent = len(self._active)
+            self._last_sample = max(self._last_sample, hour)
+        self._accumulate(now)
+
+    def _flush(self) -> None:
+        placeholders = ", ".join("?" * 10)
+        with self._db:
+            for table, bucket in (("audience_hourly", self._hour), ("audience_daily", self._day)):
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {table} ({_COLUMNS}, {_STATE_COLUMNS})"
+                    f" VALUES ({placeholders})",
+                    bucket.row(),
+                )
+        self._last_flush = self._clock()
+
+    def _prune(self, day: int) -> None:
+        with self._db:
+            self._db.execute(
+                "UPDATE audience_hourly SET sketch = NULL WHERE start < ? AND sketch IS NOT NULL",
+                (day - self.sketch_days * 86400,),
+            )
+
+    def hourly(self, since: float) -> List[AudienceRollup]:
+        return self._rollups("audience_hourly", since, self._hour)
+
+    def daily(self, since: float) -> List[AudienceRollup]:
+        return self._rollups("audience_daily", since, self._day)
+
+    def _rollups(self, table: str, since: float, current: _Bucket) -> List[AudienceRollup]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM {table} WHERE start >= ? AND start < ? ORDER BY start",
+                (since, current.start),
+            ).fetchall()
+            rollups = [_rollup_from_row(row) for row in rows]
+            if current.start >= since:
+                rollups.append(current.rollup())
+            return rollups
+
+    def uniques_between(self, start: float, end: float) -> float:
+        # Unique listeners over whole days, by merging daily sketches.
+        with self._lock:
+            merged = HyperLogLog(self.precision)
+            for (blob,) in self._db.execute(
+                "SELECT sketch FROM audience_daily WHERE start >= ? AND start < ?"
+                " AND start != ? AND sketch IS NOT NULL",
+                (start, end, self._day.start),
+            ):
+                merged.merge(HyperLogLog.from_bytes(blob, self.precision))
+            if start <= self._day.start < end:
+                merged.merge(self._day.sketch)
+            return merged.count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._roll(self._clock())
+            self._flush()
+            self._db.close()
+
+    def summary(self) -> Dict[str, str]:
+        now = self._clock()
+        week = self.uniques_between(now // 86400 * 86400 - 6 * 86400, now + 1)
+        with self._lock:
+            hour, day = self._hour.rollup(), self._day.rollup()
+        sessions = sum(day.histogram)
+        median = "n/a"
+        if sessions:
+            position = int(np.searchsorted(np.cumsum(day.histogram), (sessions + 1) / 2))
+            median = LISTEN_TIME_LABELS[position]
+        return {
+            "Listening Now": str(self.concurrent),
+            "Uniques This Hour": f"{hour.uniques:.0f}",
+            "Uniques Today": f"{day.uniques:.0f}",
+            "Uniques 7 Days": f"{week:.0f}",
+            "Peak Today": str(day.peak_concurrent),
+            "Listener Hours Today": f"{day.listen_seconds / 3600:.1f}",
+            "Median Session": median,
+            "Sessions Total": str(self.sessions_total),
+        }
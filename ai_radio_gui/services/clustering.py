@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import re
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ai_radio_gui.services.event_store import StoredEvent
+from ai_radio_gui.services.feed_parser import FeedItem
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9']{2,}")
+_STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has have "
+    "his how its may new now old see two way who did get let say she too use "
+    "with from that this will into over after than then them they what when "
+    "says said amid about more their there which would could while where".split()
+)
+_REPORTS = "\n\nReports: "
+
+
+def _document(title: str, summary: str) -> str:
+    # The title counts twice; headlines carry most of the signal.
+    return f"{title} {title} {summary}"
+
+
+@dataclass
+class EventCluster:
+    event_id: str
+    title: str
+    status: str
+    detail: str
+    created_at: float
+    updated_at: float
+    first_fetched_at: float
+    last_fetched_at: float = 0.0
+    item_count: int = 0
+    sources: Set[str] = field(default_factory=set)
+    recent: Deque[Tuple[float, str]] = field(default_factory=deque)
+
+
+class EventClusterer:
+    def __init__(
+        self,
+        dims: int = 4096,
+        threshold: float = 0.35,
+        breaking_window_seconds: float = 900,
+        breaking_min_items: int = 3,
+        breaking_min_sources: int = 2,
+        resolve_after_seconds: float = 6 * 3600,
+        first_event_number: int = 1,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.dims = dims
+        self.threshold = threshold
+        self.breaking_window_seconds = breaking_window_seconds
+        self.breaking_min_items = breaking_min_items
+        self.breaking_min_sources = breaking_min_sources
+        self.resolve_after_seconds = resolve_after_seconds
+        self._clock = clock
+        self._next_number = first_event_number
+        self._doc_freq = np.zeros(dims, dtype=np.float32)
+        self._documents = 0
+        self._centroids = np.zeros((64, dims), dtype=np.float32)
+        self._sums = np.zeros((64, dims), dtype=np.float32)
+        self._clusters: List[EventCluster] = []
+        self.items_processed = 0
+        self._batch_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    @property
+    def next_event_number(self) -> int:
+        return self._next_number
+
+    def _token_buckets(self, document: str) -> np.ndarray:
+        tokens = [
+            token for token in _TOKEN_RE.findall(document.lower()) if token not in _STOPWORDS
+        ]
+        return np.fromiter(
+            (zlib.crc32(token.encode()) % self.dims for token in tokens),
+            dtype=np.int64,
+            count=len(tokens),
+        )
+
+    def _vectorize(self, documents: List[str]) -> np.ndarray:
+        counts = np.zeros((len(documents), self.dims), dtype=np.float32)
+        for row, document in enumerate(documents):
+            np.add.at(counts[row], self._token_buckets(document), 1.0)
+        present = counts > 0
+        self._doc_freq += present.sum(axis=0)
+        self._documents += len(documents)
+        idf = np.log((1.0 + self._documents) / (1.0 + self._doc_freq)) + 1.0
+        vectors = np.log1p(counts) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+    def _ensure_capacity(self) -> None:
+        if len(self._clusters) < self._centroids.shape[0]:
+            return
+        extra = self._centroids.shape[0]
+        padding = np.zeros((extra, self.dims), dtype=np.float32)
+        self._centroids = np.vstack([self._centroids, padding])
+        self._sums = np.vstack([self._sums, padding])
+
+    def add_items(self, items: List[FeedItem]) -> List[EventCluster]:
+        if not items:
+            return []
+        started = time.perf_counter()
+        now = self._clock()
+        vectors = self._vectorize([_document(item.title, item.summary) for item in items])
+        existing = len(self._clusters)
+        similarities = vectors @ self._centroids[:existing].T
+        changed: Dict[str, EventCluster] = {}
+        for row, item in enumerate(items):
+            vector = vectors[row]
+            best_index = -1
+            best_score = self.threshold
+            if existing:
+                index = int(similarities[row].argmax())
+                if similarities[row, index] >= best_score:
+                    best_index, best_score = index, float(similarities[row, index])
+            if len(self._clusters) > existing:
+                fresh = self._centroids[existing : len(self._clusters)] @ vector
+                index = int(fresh.argmax())
+                if fresh[index] >= best_score:
+                    best_index = existing + index
+            if best_index < 0:
+                cluster = self._open_cluster(item, vector, now)
+            else:
+                cluster = self._join_cluster(best_index, item, vector, now)
+            changed[cluster.event_id] = cluster
+        self.items_processed += len(items)
+        self._batch_seconds += time.perf_counter() - started
+        return list(changed.values())
+
+    def restore(self, events: List[StoredEvent]) -> None:
+        # Reopens events that were live when the process last stopped, so
+        # reports arriving after a restart join them instead of opening
+        # duplicates. Centroids are rebuilt from the title and the latest
+        # summary kept in the detail text. Fetch times are on the fetcher's
+        # monotonic clock, which restarts with the process, so restored
+        # events start without one.
+        if not events:
+            return
+        clusters = [
+            EventCluster(
+                event_id=event.event_id,
+                title=event.title,
+                status=event.status,
+                detail=event.detail,
+                created_at=event.updated_at,
+                updated_at=event.updated_at,
+                first_fetched_at=0.0,
+                last_fetched_at=0.0,
+                item_count=event.item_count,
+                sources=set(filter(None, event.sources.split("\n"))),
+            )
+            for event in events
+        ]
+        vectors = self._vectorize(
+            [_document(cluster.title, cluster.detail.split(_REPORTS)[0]) for cluster in clusters]
+        )
+        for cluster, vector in zip(clusters, vectors):
+            self._ensure_capacity()
+            index = len(self._clusters)
+            self._sums[index] = vector
+            self._centroids[index] = vector
+            self._clusters.append(cluster)
+
+    def _open_cluster(self, item: FeedItem, vector: np.ndarray, now: float) -> EventCluster:
+        self._ensure_capacity()
+        index = len(self._clusters)
+        self._sums[index] = vector
+        self._centroids[index] = vector
+        cluster = EventCluster(
+            event_id=f"E{self._next_number:06d}",
+            title=item.title,
+            status="Ongoing",
+            detail="",
+            created_at=now,
+            updated_at=now,
+            first_fetched_at=item.fetched_at,
+            last_fetched_at=item.fetched_at,
+        )
+        self._next_number += 1
+        self._clusters.append(cluster)
+        self._record(cluster, item, now)
+        return cluster
+
+    def _join_cluster(
+        self, index: int, item: FeedItem, vector: np.ndarray, now: float
+    ) -> EventCluster:
+        self._sums[index] += vector
+        norm = np.linalg.norm(self._sums[index])
+        self._centroids[index] = self._sums[index] / max(norm, 1e-9)
+        cluster = self._clusters[index]
+        self._record(cluster, item, now)
+        return cluster
+
+    def _record(self, cluster: EventCluster, item: FeedItem, now: float) -> None:
+        cluster.updated_at = now
+        if item.duplicate_of is not None and cluster.item_count:
+            # A syndicated copy keeps the event alive but is not another
+            # report: it neither corroborates breaking nor adds a source.
+            return
+        cluster.item_count += 1
+        cluster.first_fetched_at = cluster.first_fetched_at or item.fetched_at
+        cluster.last_fetched_at = max(cluster.last_fetched_at, item.fetched_at)
+        cluster.sources.add(item.feed)
+        cluster.recent.append((now, item.feed))
+        self._trim_recent(cluster, now)
+        if self._is_breaking(cluster):
+            cluster.status = "Breaking"
+        elif cluster.status == "Resolved":
+            cluster.status = "Ongoing"
+        summary = item.summary or item.title
+        cluster.detail = (
+            f"{summary}{_REPORTS}{cluster.item_count} from "
+            f"{', '.join(sorted(cluster.sources))}."
+        )
+
+    def _trim_recent(self, cluster: EventCluster, now: float) -> None:
+        horizon = now - self.breaking_window_seconds
+        while cluster.recent and cluster.recent[0][0] < horizon:
+            cluster.recent.popleft()
+
+    def _is_breaking(self, cluster: EventCluster) -> bool:
+        if len(cluster.recent) < self.breaking_min_items:
+            return False
+        return len({feed for _, feed in cluster.recent}) >= self.breaking_min_sources
+
+    def decay(self) -> List[EventCluster]:
+        now = self._clock()
+        changed: List[EventCluster] = []
+        index = 0
+        while index < len(self._clusters):
+            cluster = self._clusters[index]
+            self._trim_recent(cluster, now)
+            if now - cluster.updated_at >= self.resolve_after_seconds:
+                cluster.status = "Resolved"
+                cluster.updated_at = now
+                changed.append(cluster)
+                self._remove(index)
+                continue
+            if cluster.status == "Breaking" and not self._is_breaking(cluster):
+                cluster.status = "Ongoing"
+                changed.append(cluster)
+            index += 1
+        return changed
+
+    def _remove(self, index: int) -> None:
+        last = len(self._clusters) - 1
+        if index != last:
+            self._clusters[index] = self._clusters[last]
+            self._sums[index] = self._sums[last]
+            self._centroids[index] = self._centroids[last]
+        self._clusters.pop()
+        self._sums[last] = 0.0
+        self._centroids[last] = 0.0
+
+    def find(self, event_id: str) -> Optional[EventCluster]:
+        for cluster in self._clusters:
+            if cluster.event_id == event_id:
+                return cluster
+        return None
+
+    def throughput_per_hour(self) -> float:
+        if not self._batch_seconds:
+            return 0.0
+        return self.items_processed / self._batch_seconds * 3600
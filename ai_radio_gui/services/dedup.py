@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_BAND_SHIFT = np.uint64(56)
+_KEY_MASK = np.uint64((1 << 56) - 1)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_EMPTY = np.iinfo(np.uint32).max
+
+
+@lru_cache(maxsize=262144)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+
+
+def shingles(text: str) -> List[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    return tokens + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+
+
+@dataclass
+class DedupResult:
+    item_id: str
+    duplicate_of: Optional[str]
+    similarity: float
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        num_perm: int = 64,
+        bands: int = 10,
+        rows_per_band: int = 3,
+        retention_seconds: float = 72 * 3600,
+        merge_every: int = 4096,
+        seed: int = 7,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if bands * rows_per_band > num_perm:
+            raise ValueError("bands * rows_per_band must not exceed num_perm.")
+        rng = np.random.default_rng(seed)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = rows_per_band
+        self.retention_seconds = retention_seconds
+        self.merge_every = merge_every
+        self._clock = clock
+        self._seeds = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self._band_ids = np.arange(bands, dtype=np.uint64) << _BAND_SHIFT
+
+        # Signatures live in a ring indexed by a monotonically increasing slot;
+        # items expire in insertion order, so expiry just advances _oldest_slot.
+        self._capacity = 1024
+        self._signatures = np.zeros((self._capacity, num_perm), dtype=np.uint32)
+        self._expires = np.zeros(self._capacity, dtype=np.float64)
+        self._item_ids = np.empty(self._capacity, dtype=object)
+        self._next_slot = 0
+        self._oldest_slot = 0
+
+        # Band keys are kept in one sorted array (band id in the top byte) plus a
+        # small dict of recent inserts that is merged in periodically.
+        self._index_keys = np.empty(0, dtype=np.uint64)
+        self._index_slots = np.empty(0, dtype=np.int64)
+        self._pending: Dict[int, List[int]] = {}
+        self._pending_items = 0
+
+        self.checked = 0
+        self.duplicates = 0
+        self._check_seconds = 0.0
+
+    def __len__(self) -> int:
+        return self._next_slot - self._oldest_slot
+
+    def signature(self, title: str, body: str = "") -> np.ndarray:
+        features = set(shingles(title)) | set(shingles(body))
+        if not features:
+            return np.full(self.num_perm, _EMPTY, dtype=np.uint32)
+        hashes = np.fromiter(
+            (_feature_hash(feature) for feature in features),
+            dtype=np.uint64,
+            count=len(features),
+        )
+        # One splitmix64 finalizer per (feature, seed) pair acts as num_perm
+        # independent hash functions; uint64 arrays wrap silently on overflow.
+        values = hashes[:, None] ^ self._seeds[None, :]
+        values ^= values >> np.uint64(30)
+        values *= _MIX_1
+        values ^= values >> np.uint64(27)
+        values *= _MIX_2
+        values ^= values >> np.uint64(31)
+        return (values.min(axis=0) >> np.uint64(32)).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> np.ndarray:
+        rows = signature[: self.bands * self.rows_per_band].astype(np.uint64)
+        rows = rows.reshape(self.bands, self.rows_per_band)
+        mixed = np.zeros(self.bands, dtype=np.uint64)
+        for column in range(self.rows_per_band):
+            mixed = (mixed ^ rows[:, column]) * _MIX
+        return self._band_ids | (mixed & _KEY_MASK)
+
+    def check(self, item_id: str, title: str, body: str = "") -> DedupResult:
+        started = time.perf_counter()
+        now = self._clock()
+        self._expire(now)
+        self.checked += 1
+        if not _TOKEN_RE.search(f"{title} {body}".lower()):
+            # Nothing to compare; empty items would all share one signature.
+            self._check_seconds += time.perf_counter() - started
+            return DedupResult(item_id, None, 0.0)
+        signature = self.signature(title, body)
+        keys = self._band_keys(signature)
+        candidates = self._candidates(keys)
+        result = DedupResult(item_id, None, 0.0)
+        if candidates.size:
+            rows = candidates % self._capacity
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+            best = int(similarity.argmax())
+            if similarity[best] >= self.threshold:
+                self.duplicates += 1
+                result = DedupResult(
+                    item_id, self._item_ids[rows[best]], float(similarity[best])
+                )
+        if result.duplicate_of is None:
+            self._insert(item_id, signature, keys, now)
+        self._check_seconds += time.perf_counter() - started
+        return result
+
+    def _candidates(self, keys: np.ndarray) -> np.ndarray:
+        found: List[np.ndarray] = []
+        if self._index_keys.size:
+            left = np.searchsorted(self._index_keys, keys, side="left")
+            right = np.searchsorted(self._index_keys, keys, side="right")
+            for start, stop in zip(left.tolist(), right.tolist()):
+                if stop > start:
+                    found.append(self._index_slots[start:stop])
+        for key in keys.tolist():
+            slots = self._pending.get(key)
+            if slots:
+                found.append(np.asarray(slots, dtype=np.int64))
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        slots = np.unique(np.concatenate(found))
+        return slots[slots >= self._oldest_slot]
+
+    def _insert(
+        self, item_id: str, signature: np.ndarray, keys: np.ndarray, now: float
+    ) -> None:
+        if len(self) == self._capacity:
+            self._grow()
+        slot = self._next_slot
+        row = slot % self._capacity
+        self._signatures[row] = signature
+        self._expires[row] = now + self.retention_seconds
+        self._item_ids[row] = item_id
+        self._next_slot += 1
+        for key in keys.tolist():
+            self._pending.setdefault(key, []).append(slot)
+        self._pending_items += 1
+        if self._pending_items >= self.merge_every:
+            self._merge()
+
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        live = np.arange(self._oldest_slot, self._next_slot, dtype=np.int64)
+        old_rows = live % self._capacity
+        new_rows = live % capacity
+        signatures = np.zeros((capacity, self.num_perm), dtype=np.uint32)
+        signatures[new_rows] = self._signatures[old_rows]
+        expires = np.zeros(capacity, dtype=np.float64)
+        expires[new_rows] = self._expires[old_rows]
+        item_ids = np.empty(capacity, dtype=object)
+        item_ids[new_rows] = self._item_ids[old_rows]
+        self._capacity = capacity
+        self._signatures = signatures
+        self._expires = expires
+        self._item_ids = item_ids
+
+    def _merge(self) -> None:
+        pending_keys = np.fromiter(
+            (key for key, slots in self._pending.items() for _ in slots), dtype=np.uint64
+        )
+        pending_slots = np.fromiter(
+            (slot for slots in self._pending.values() for slot in slots), dtype=np.int64
+        )
+        order = np.argsort(pending_keys, kind="stable")
+        pending_keys = pending_keys[order]
+        pending_slots = pending_slots[order]
+        live = self._index_slots >= self._oldest_slot
+        keys = self._index_keys[live]
+        slots = self._index_slots[live]
+        positions = np.searchsorted(keys, pending_keys, side="right")
+        self._index_keys = np.insert(keys, positions, pending_keys)
+        self._index_slots = np.insert(slots, positions, pending_slots)
+        self._pending = {}
+        self._pending_items = 0
+
+    def _expire(self, now: float) -> None:
+        while (
+            self._oldest_slot < self._next_slot
+            and self._expires[self._oldest_slot % self._capacity] <= now
+        ):
+            self._item_ids[self._oldest_slot % self._capacity] = None
+            self._oldest_slot += 1
+
+    @property
+    def dedup_rate(self) -> float:
+        return self.duplicates / self.checked if self.checked else 0.0
+
+    def summary(self) -> Dict[str, str]:
+        average_us = self._check_seconds / self.checked * 1e6 if self.checked else 0.0
+        return {
+            "Dedup Rate": f"{self.dedup_rate:.1%}",
+            "Duplicates": str(self.duplicates),
+            "Indexed Items": str(len(self)),
+            "Avg Check": f"{average_us:.0f} us",
+        }
@@ -0,0 +1,758 @@
+from __future__ import annotations
+
+import fcntl
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import termios
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_PIPE_BYTES = 1 << 20
+_READ_BYTES = 64 * 1024
+_F_SETPIPE_SZ = 1031
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    name: str
+    codec: str
+    bitrate_kbps: int
+    sample_rate: int = 48000
+    channels: int = 2
+
+
+ENCODER_PROFILES: Dict[str, EncoderProfile] = {
+    profile.name: profile
+    for profile in (
+        EncoderProfile("AAC 48k", "aac", 48),
+        EncoderProfile("AAC 64k", "aac", 64),
+        EncoderProfile("AAC 128k", "aac", 128),
+        EncoderProfile("AAC 192k", "aac", 192),
+        EncoderProfile("AAC 256k", "aac", 256),
+        EncoderProfile("Opus 64k", "opus", 64),
+        EncoderProfile("Opus 96k", "opus", 96),
+        EncoderProfile("Opus 128k", "opus", 128),
+    )
+}
+
+LADDER_ENV = "AI_RADIO_ENCODER_LADDER"
+DEFAULT_LADDER = "/live=AAC 128k,/live-48k=AAC 48k,/live-256k=AAC 256k,/live-opus=Opus 96k"
+
+
+@dataclass(frozen=True)
+class LadderRung:
+    mount: str
+    profile: EncoderProfile
+
+
+def parse_ladder(spec: str) -> List[LadderRung]:
+    rungs = []
+    for item in spec.split(","):
+        mount, _, name = item.partition("=")
+        profile = ENCODER_PROFILES.get(name.strip())
+        if profile is None:
+            raise ValueError(f"Unknown encoder profile: {name.strip()!r}")
+        rungs.append(LadderRung("/" + mount.strip().lstrip("/"), profile))
+    return rungs
+
+
+def default_ladder() -> List[LadderRung]:
+    return parse_ladder(os.environ.get(LADDER_ENV, DEFAULT_LADDER))
+
+
+@dataclass(frozen=True)
+class Framing:
+    kind: str
+    samples_per_frame: int
+    # Samples of encoder priming before the first frame's audio.
+    delay: int
+    content_type: str
+    # Stream headers (Ogg identification and comment pages) that a decoder
+    # needs before any audio frame.
+    header_frames: int = 0
+
+
+def encoder_command(
+    profile: EncoderProfile, engine: Optional[str]
+) -> Tuple[List[str], Framing]:
+    if engine:
+        argv = [
+            engine,
+            "-hide_banner",
+            "-loglevel", "error",
+            "-nostdin",
+            "-f", "f32le",
+            "-ar", str(profile.sample_rate),
+            "-ac", str(profile.channels),
+            "-i", "pipe:0",
+            "-b:a", f"{profile.bitrate_kbps}k",
+            "-flush_packets", "1",
+        ]
+        if profile.codec == "opus":
+            # One 20 ms packet per Ogg page keeps pages on a fixed grid.
+            return argv + [
+                "-c:a", "libopus",
+                "-frame_duration", "20",
+                "-page_duration", "20000",
+                "-f", "ogg",
+                "pipe:1",
+            ], Framing("ogg", 960, 312, "audio/ogg", header_frames=2)
+        return argv + [
+            "-c:a", "aac",
+            "-f", "adts",
+            "pipe:1",
+        ], Framing("adts", 1024, 1024, "audio/aac")
+    # Without ffmpeg a small child process frames 16-bit PCM instead, so
+    # supervision, pipes and switchover behave the same.
+    return [
+        sys.executable,
+        "-m", "ai_radio_gui.services.encoder",
+        str(profile.channels),
+    ], Framing(
+        "pcm", 1024, 0, f"audio/L16;rate={profile.sample_rate};channels={profile.channels}"
+    )
+
+
+def engine_label(engine: Optional[str]) -> str:
+    return "ffmpeg" if engine else "PCM framer (ffmpeg not installed)"
+
+
+class FrameSplitter:
+    def __init__(self, framing: Framing, channels: int) -> None:
+        self.framing = framing
+        self._pcm_bytes = framing.samples_per_frame * channels * 2
+        self._buffer = bytearray()
+        self.resyncs = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self._buffer += data
+        if self.framing.kind == "pcm":
+            count = len(self._buffer) // self._pcm_bytes
+            end = count * self._pcm_bytes
+            step = self._pcm_bytes
+            frames = [bytes(self._buffer[i : i + step]) for i in range(0, end, step)]
+            del self._buffer[:end]
+            return frames
+        if self.framing.kind == "ogg":
+            return self._ogg_pages()
+        frames = []
+        buffer = self._buffer
+        offset = 0
+        while len(buffer) - offset >= 7:
+            if buffer[offset] != 0xFF or buffer[offset + 1] & 0xF6 != 0xF0:
+                # Lost sync: skip to the next candidate ADTS header.
+                following = buffer.find(b"\xff", offset + 1)
+                offset = following if following >= 0 else len(buffer)
+                self.resyncs += 1
+                continue
+            length = (
+                (buffer[offset + 3] & 0x03) << 11
+                | buffer[offset + 4] << 3
+                | buffer[offset + 5] >> 5
+            )
+            if length < 7:
+                offset += 1
+                self.resyncs += 1
+                continue
+            if len(buffer) - offset < length:
+                break
+            frames.append(bytes(buffer[offset : offset + length]))
+            offset += length
+        del buffer[:offset]
+        return frames
+
+    def _ogg_pages(self) -> List[bytes]:
+        pages = []
+        buffer = self._buffer
+        offset = 0
+        while len(buffer) - offset >= 27:
+            if buffer[offset : offset + 4] != b"OggS":
+                following = buffer.find(b"OggS", offset + 1)
+                offset = following if following >= 0 else len(buffer) - 3
+                self.resyncs += 1
+                continue
+            segments = buffer[offset + 26]
+            if len(buffer) - offset < 27 + segments:
+                break
+            length = 27 + segments + sum(buffer[offset + 27 : offset + 27 + segments])
+            if len(buffer) - offset < length:
+                break
+            pages.append(bytes(buffer[offset : offset + length]))
+            offset += length
+        del buffer[:offset]
+        return pages
+
+
+def _proc_cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as handle:
+            fields = handle.read().rsplit(b")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class EncoderProcess:
+    def __init__(
+        self,
+        profile: EncoderProfile,
+        engine: Optional[str],
+        on_frame: Callable[["EncoderProcess", Optional[int], bytes], None],
+    ) -> None:
+        self.profile = profile
+        argv, self.framing = encoder_command(profile, engine)
+        env = dict(os.environ)
+        package_root = str(Path(__file__).resolve().parents[2])
+        env["PYTHONPATH"] = os.pathsep.join(
+            part for part in (package_root, env.get("PYTHONPATH", "")) if part
+        )
+        self.process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            env=env,
+        )
+        self._stdin = self.process.stdin.fileno()
+        try:
+            fcntl.fcntl(self._stdin, _F_SETPIPE_SZ, _PIPE_BYTES)
+        except OSError:
+            pass
+        os.set_blocking(self._stdin, False)
+        self._on_frame = on_frame
+        self._splitter = FrameSplitter(self.framing, profile.channels)
+        self._pending = b""
+        # Set by the supervisor (under its lock) when PCM starts flowing.
+        self.pcm_start = 0
+        self.frames_out = 0
+        self.headers: List[bytes] = []
+        self.dropped_writes = 0
+        # Samples the encoder actually received, and the blocks it missed as
+        # (received samples at the drop, samples dropped). Output positions
+        # skip each gap once the encoder's output reaches it.
+        self.samples_in = 0
+        self._gaps: Deque[Tuple[int, int]] = deque()
+        self._skipped = 0
+        # Gap samples and drop count applied at the frame just reported.
+        self.frame_gap = (0, 0)
+        self.broken = False
+        self.retired_at: Optional[float] = None
+        self.errors: Deque[str] = deque(maxlen=5)
+        self.started = time.monotonic()
+        self._cpu = (self.started, 0.0)
+        threading.Thread(target=self._read, name="encoder-out", daemon=True).start()
+        threading.Thread(target=self._read_errors, name="encoder-err", daemon=True).start()
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        return not self.broken and self.process.poll() is None
+
+    def write(self, block: np.ndarray) -> None:
+        # The block is handed to the kernel straight from the ring buffer's
+        # memory; only a short write (pipe full) copies its tail.
+        if self.broken:
+            return
+        data = memoryview(block).cast("B")
+        try:
+            if self._pending:
+                written = os.write(self._stdin, self._pending)
+                self._pending = self._pending[written:]
+                if self._pending:
+                    self._drop(len(block))
+                    return
+            written = os.write(self._stdin, data)
+            if written < len(data):
+                self._pending = bytes(data[written:])
+        except BlockingIOError:
+            self._drop(len(block))
+            return
+        except (BrokenPipeError, OSError):
+            self.broken = True
+            return
+        self.samples_in += len(block)
+
+    def _drop(self, samples: int) -> None:
+        self.dropped_writes += 1
+        self._gaps.append((self.samples_in, samples))
+
+    def _read(self) -> None:
+        stdout = self.process.stdout
+        samples = self.framing.samples_per_frame
+        while True:
+            try:
+                data = stdout.read(_READ_BYTES)
+            except (OSError, ValueError):
+                break
+            if not data:
+                break
+            for frame in self._splitter.feed(data):
+                if len(self.headers) < self.framing.header_frames:
+                    self.headers.append(frame)
+                    self._on_frame(self, None, frame)
+                    continue
+                offset = self.frames_out * samples - self.framing.delay
+                gap = drops = 0
+                while self._gaps and self._gaps[0][0] <= offset:
+                    gap += self._gaps.popleft()[1]
+                    drops += 1
+                self._skipped += gap
+                self.frame_gap = (gap, drops)
+                position = self.pcm_start + offset + self._skipped
+                self.frames_out += 1
+                self._on_frame(self, position, frame)
+
+    def _read_errors(self) -> None:
+        for line in self.process.stderr:
+            self.errors.append(line.decode("utf-8", "replace").strip())
+
+    def queue_bytes(self) -> int:
+        try:
+            raw = fcntl.ioctl(self._stdin, termios.FIONREAD, b"\0\0\0\0")
+        except OSError:
+            return len(self._pending)
+        return struct.unpack("i", raw)[0] + len(self._pending)
+
+    def cpu_percent(self) -> Optional[float]:
+        seconds = _proc_cpu_seconds(self.pid)
+        if seconds is None:
+            return None
+        now = time.monotonic()
+        then, previous = self._cpu
+        self._cpu = (now, seconds)
+        return (seconds - previous) / (now - then) * 100 if now > then else 0.0
+
+    def close_input(self) -> None:
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+    def close(self, timeout: float = 1.0) -> None:
+        self.close_input()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class EncoderSupervisor:
+    # The active encoder receives every mixed block through its stdin pipe.
+    # A restart or profile change starts a standby that is attached on the
+    # active encoder's frame grid and fed the same PCM; once it has produced
+    # warm_frames frames, output switches to it at the first frame the active
+    # encoder has not emitted yet, so the stream neither skips nor repeats.
+    def __init__(
+        self,
+        profile: EncoderProfile,
+        on_frame: Optional[Callable[[bytes], None]] = None,
+        on_switchover: Optional[Callable[[float], None]] = None,
+        engine: Optional[str] = None,
+        on_header: Optional[Callable[[bytes], None]] = None,
+        warm_frames: int = 4,
+        max_backoff_seconds: float = 30.0,
+    ) -> None:
+        self.profile = profile
+        self.engine = engine if engine is not None else shutil.which("ffmpeg")
+        self.on_frame = on_frame
+        self.on_switchover = on_switchover
+        self.on_header = on_header
+        self.warm_frames = warm_frames
+        self.max_backoff_seconds = max_backoff_seconds
+        self._lock = threading.Lock()
+        self.active: Optional[EncoderProcess] = None
+        self.standby: Optional[EncoderProcess] = None
+        self._pending: Optional[EncoderProcess] = None
+        self._retired: List[EncoderProcess] = []
+        self._switch_at: Optional[int] = None
+        self._held: List[Tuple[int, bytes, Tuple[int, int]]] = []
+        self._requested_at = 0.0
+        self._last_position: Optional[int] = None
+        self._next_attempt = 0.0
+        self._crash_streak = 0
+        self.pcm_position = 0
+        self.frames_out = 0
+        self.bytes_out = 0
+        self.discontinuities = 0
+        self.restarts = 0
+        self.crashes = 0
+        self.last_switchover_seconds: Optional[float] = None
+        self._rate: Deque[Tuple[float, int]] = deque(maxlen=64)
+        self._cpu_percent: Optional[float] = None
+
+    def _spawn(self, profile: EncoderProfile) -> Optional[EncoderProcess]:
+        try:
+            return EncoderProcess(profile, self.engine, self._route)
+        except OSError:
+            return None
+
+    def start(self) -> None:
+        with self._lock:
+            if self.active is None:
+                self.active = self._spawn(self.profile)
+
+    def restart(self, profile: Optional[EncoderProfile] = None) -> bool:
+        # Spawned on the caller's thread; the audio thread attaches it at
+        # the next aligned block.
+        with self._lock:
+            if self._pending is not None or self.standby is not None or self.active is None:
+                return False
+        standby = self._spawn(profile or self.profile)
+        if standby is None:
+            return False
+        with self._lock:
+            self._pending = standby
+            self._requested_at = time.monotonic()
+        return True
+
+    def write(self, block: np.ndarray) -> None:
+        # Called from the audio consumer thread once per block.
+        with self._lock:
+            active = self.active
+            if active is not None and not active.alive:
+                self._on_crash(active)
+                active = self.active
+            elif active is None and time.monotonic() >= self._next_attempt:
+                self._respawn()
+                active = self.active
+            pending = self._pending
+            if pending is not None and active is not None:
+                samples = active.framing.samples_per_frame
+                if (self.pcm_position - active.pcm_start) % samples == 0:
+                    pending.pcm_start = self.pcm_position
+                    self.standby, self._pending = pending, None
+            standby = self.standby
+            for encoder in self._retired:
+                if encoder.process.stdin and not encoder.process.stdin.closed:
+                    encoder.close_input()
+        if active is not None:
+            active.write(block)
+        if standby is not None:
+            standby.write(block)
+        self.pcm_position += len(block)
+
+    def _respawn(self) -> None:
+        encoder = self._spawn(self.profile)
+        if encoder is None:
+            self._schedule_retry()
+            return
+        encoder.pcm_start = self.pcm_position
+        self.active = encoder
+
+    def _schedule_retry(self) -> None:
+        self._crash_streak += 1
+        delay = min(self.max_backoff_seconds, 0.5 * 2 ** (self._crash_streak - 1))
+        self._next_attempt = time.monotonic() + delay
+
+    def _on_crash(self, encoder: EncoderProcess) -> None:
+        # Unplanned exit: promote a warming standby if there is one (its
+        # first frames still land in order), otherwise restart cold with
+        # exponential backoff so a broken install does not spin.
+        self.crashes += 1
+        self._retire(encoder)
+        if self.standby is not None and self.standby.alive:
+            self.active, self.standby = self.standby, None
+            self._switch_at = None
+            self._held = []
+            self._emit_headers(self.active)
+            return
+        self.active = None
+        self._schedule_retry()
+
+    def _route(self, encoder: EncoderProcess, position: Optional[int], frame: bytes) -> None:
+        # Runs on the encoders' reader threads.
+        samples = encoder.framing.samples_per_frame
+        with self._lock:
+            last = self._last_position
+            if position is None:
+                # A standby's headers are sent when it is promoted.
+                complete = len(encoder.headers) == encoder.framing.header_frames
+                if encoder is self.active and complete:
+                    self._emit_headers(encoder)
+                return
+            if encoder is self.standby:
+                if self._switch_at is None and encoder.frames_out >= self.warm_frames:
+                    following = last + samples if last is not None else position
+                    self._switch_at = max(position, following)
+                if self._switch_at is None or position < self._switch_at:
+                    return
+                # Held until the active encoder has emitted everything before
+                # the switch point.
+                self._held.append((position, frame, encoder.frame_gap))
+                if last is None or last + samples >= self._switch_at:
+                    self._promote()
+            elif encoder is self.active:
+                if self._switch_at is not None and position >= self._switch_at:
+                    return
+                self._emit(position, frame, samples, encoder.frame_gap)
+                if self._held and position + samples >= self._switch_at:
+                    self._promote()
+
+    def _emit(
+        self, position: int, frame: bytes, samples: int, gap: Tuple[int, int] = (0, 0)
+    ) -> None:
+        # gap is the PCM an encoder missed (dropped writes) just before this
+        # frame; each drop is one discontinuity, and the position jump it
+        # explains is not counted again.
+        if position < 0:
+            return
+        skipped, drops = gap
+        self.discontinuities += drops
+        last = self._last_position
+        if last is not None and position != last + samples + skipped:
+            self.discontinuities += 1
+        self._last_position = position
+        self._crash_streak = 0
+        self.frames_out += 1
+        self.bytes_out += len(frame)
+        if self.on_frame is not None:
+            self.on_frame(frame)
+
+    def _emit_headers(self, encoder: EncoderProcess) -> None:
+        # Starts a new chained Ogg stream in the output; the mount also keeps
+        # the headers for listeners who join later.
+        if not encoder.headers:
+            return
+        headers = b"".join(encoder.headers)
+        self.bytes_out += len(headers)
+        if self.on_frame is not None:
+            self.on_frame(headers)
+        if self.on_header is not None:
+            self.on_header(headers)
+
+    def _retire(self, encoder: EncoderProcess) -> None:
+        encoder.retired_at = time.monotonic()
+        self._retired.append(encoder)
+
+    def _promote(self) -> None:
+        standby = self.standby
+        if self.active is not None:
+            self._retire(self.active)
+        self.active, self.standby = standby, None
+        self.profile = standby.profile
+        self._switch_at = None
+        self._emit_headers(standby)
+        held, self._held = self._held, []
+        for position, frame, gap in held:
+            self._emit(position, frame, standby.framing.samples_per_frame, gap)
+        self.restarts += 1
+        self.last_switchover_seconds = time.monotonic() - self._requested_at
+        if self.on_switchover is not None:
+            self.on_switchover(self.last_switchover_seconds)
+
+    @property
+    def framing(self) -> Framing:
+        return encoder_command(self.profile, self.engine)[1]
+
+    @property
+    def content_type(self) -> str:
+        return self.framing.content_type
+
+    @property
+    def status(self) -> str:
+        if self.active is None:
+            return "Failed" if self._crash_streak else "Offline"
+        if self.standby is not None or self._pending is not None:
+            return "Switching"
+        return "Live"
+
+    def maintain(self) -> None:
+        # Called periodically from the GUI thread: reap retired encoders and
+        # sample throughput and CPU.
+        with self._lock:
+            retired = list(self._retired)
+        finished = []
+        for encoder in retired:
+            if encoder.process.poll() is not None:
+                finished.append(encoder)
+            elif time.monotonic() - (encoder.retired_at or 0.0) > 2.0:
+                # Its remaining output is past the switch point; no need to
+                # wait for a graceful flush.
+                encoder.process.kill()
+        with self._lock:
+            self._retired = [e for e in self._retired if e not in finished]
+        now = time.monotonic()
+        self._rate.append((now, self.bytes_out))
+        active = self.active
+        self._cpu_percent = active.cpu_percent() if active is not None else None
+
+    @property
+    def cpu_percent(self) -> Optional[float]:
+        return self._cpu_percent
+
+    def output_kbps(self) -> float:
+        if len(self._rate) < 2:
+            return 0.0
+        (start, first), (end, last) = self._rate[0], self._rate[-1]
+        while len(self._rate) > 2 and end - self._rate[0][0] > 10.0:
+            self._rate.popleft()
+            start, first = self._rate[0]
+        return (last - first) * 8 / 1000 / (end - start) if end > start else 0.0
+
+    def queue_seconds(self) -> float:
+        active = self.active
+        if active is None:
+            return 0.0
+        bytes_per_second = self.profile.sample_rate * self.profile.channels * 4
+        return active.queue_bytes() / bytes_per_second
+
+    def close(self) -> None:
+        with self._lock:
+            encoders = [self.active, self.standby, self._pending, *self._retired]
+            self.active = self.standby = self._pending = None
+            self._retired = []
+        for encoder in encoders:
+            if encoder is not None:
+                encoder.close()
+
+    def summary(self) -> Dict[str, str]:
+        active = self.active
+        errors = list(active.errors) if active is not None else []
+        return {
+            "Engine": engine_label(self.engine),
+            "Profile": self.profile.name,
+            "State": self.status,
+            "PID": str(active.pid) if active is not None else "-",
+            "Encoder CPU": (
+                f"{self._cpu_percent:.1f}%" if self._cpu_percent is not None else "n/a"
+            ),
+            "Queue Depth": f"{self.queue_seconds() * 1000:.0f} ms",
+            "Output": f"{self.output_kbps():.0f} kbps",
+            "Frames Out": str(self.frames_out),
+            "Dropped Writes": str(active.dropped_writes if active is not None else 0),
+            "Restarts": str(self.restarts),
+            "Last Switchover": (
+                f"{self.last_switchover_seconds * 1000:.0f} ms"
+                if self.last_switchover_seconds is not None
+                else "n/a"
+            ),
+            "Discontinuities": str(self.discontinuities),
+            "Crashes": str(self.crashes),
+            "Last Error": errors[-1] if errors else "None",
+        }
+
+
+
+class EncoderLadder:
+    # One mixer output, one encoder process per rung. The audio thread only
+    # hands each block to every rung's pipe; the encoding itself runs in
+    # the child processes, which the OS spreads across cores.
+    def __init__(
+        self,
+        rungs: List[LadderRung],
+        on_switchover: Optional[Callable[[str, float], None]] = None,
+        engine: Optional[str] = None,
+    ) -> None:
+        self.encoders: Dict[str, EncoderSupervisor] = {}
+        for rung in rungs:
+            self.encoders[rung.mount] = EncoderSupervisor(
+                rung.profile,
+                on_switchover=(
+                    (lambda seconds, mount=rung.mount: on_switchover(mount, seconds))
+                    if on_switchover is not None
+                    else None
+                ),
+                engine=engine,
+            )
+        self._supervisors = list(self.encoders.values())
+
+    def start(self) -> None:
+        for encoder in self._supervisors:
+            encoder.start()
+
+    def write(self, block: np.ndarray) -> None:
+        for encoder in self._supervisors:
+            encoder.write(block)
+
+    def restart(self, mount: Optional[str] = None) -> bool:
+        targets = [self.encoders[mount]] if mount else self._supervisors
+        results = [encoder.restart() for encoder in targets]
+        return any(results)
+
+    def set_profile(self, mount: str, profile: EncoderProfile) -> bool:
+        encoder = self.encoders[mount]
+        # Listeners' decoders cannot follow a codec change mid-stream.
+        if profile.codec != encoder.profile.codec:
+            return False
+        return encoder.restart(profile)
+
+    def maintain(self) -> None:
+        for encoder in self._supervisors:
+            encoder.maintain()
+
+    def close(self) -> None:
+        for encoder in self._supervisors:
+            encoder.close()
+
+    @property
+    def status(self) -> str:
+        states = {encoder.status for encoder in self._supervisors}
+        if states <= {"Live"}:
+            return "Live"
+        if states <= {"Live", "Switching"}:
+            return "Switching"
+        return states.pop() if len(states) == 1 else "Degraded"
+
+    @property
+    def last_switchover_seconds(self) -> Optional[float]:
+        values = [
+            encoder.last_switchover_seconds
+            for encoder in self._supervisors
+            if encoder.last_switchover_seconds is not None
+        ]
+        return values[-1] if values else None
+
+    def summary(self) -> Dict[str, str]:
+        supervisors = self._supervisors
+        cpu = [encoder.cpu_percent for encoder in supervisors if encoder.cpu_percent is not None]
+        details = {
+            "Engine": engine_label(supervisors[0].engine if supervisors else None),
+            "State": self.status,
+            "Rungs": str(len(supervisors)),
+            "Encoder CPU": f"{sum(cpu):.1f}%" if cpu else "n/a",
+            "Queue Depth": (
+                f"{max(encoder.queue_seconds() for encoder in supervisors) * 1000:.0f} ms"
+                if supervisors
+                else "0 ms"
+            ),
+            "Restarts": str(sum(encoder.restarts for encoder in supervisors)),
+            "Discontinuities": str(sum(encoder.discontinuities for encoder in supervisors)),
+            "Crashes": str(sum(encoder.crashes for encoder in supervisors)),
+        }
+        for mount, encoder in self.encoders.items():
+            details[mount] = (
+                f"{encoder.profile.name}, {encoder.status}, {encoder.output_kbps():.0f} kbps"
+            )
+        return details
+
+
+def _pcm_framer_main(channels: int) -> None:
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    frame_bytes = 1024 * channels * 4
+    while True:
+        data = stdin.read(frame_bytes)
+        if not data:
+            break
+        usable = len(data) - len(data) % 4
+        samples = np.frombuffer(data[:usable], dtype="<f4")
+        stdout.write((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    _pcm_framer_main(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
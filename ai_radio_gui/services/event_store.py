@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ai_radio_gui.models.state import EventEntry, TimelineEntry
+
+EventCursor = Tuple[float, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    sources TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS events_updated ON events (updated_at, event_id);
+CREATE INDEX IF NOT EXISTS events_status_updated ON events (status, updated_at, event_id);
+CREATE TABLE IF NOT EXISTS timeline (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timeline_created ON timeline (created_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+_MIGRATIONS = (
+    ("item_count", "ALTER TABLE events ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0"),
+    ("sources", "ALTER TABLE events ADD COLUMN sources TEXT NOT NULL DEFAULT ''"),
+)
+
+
+def format_timestamp(value: float) -> str:
+    return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@dataclass
+class StoredEvent:
+    event_id: str
+    title: str
+    status: str
+    detail: str
+    updated_at: float
+    item_count: int = 0
+    # Newline-separated feed names.
+    sources: str = ""
+
+
+@dataclass
+class EventPage:
+    events: List[EventEntry]
+    next_cursor: Optional[EventCursor]
+
+
+class EventStore:
+    def __init__(self, path: Path | str) -> None:
+        self._db = sqlite3.connect(str(path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(events)")}
+        with self._db:
+            for column, statement in _MIGRATIONS:
+                if column not in columns:
+                    self._db.execute(statement)
+
+    def close(self) -> None:
+        self._db.close()
+
+    @staticmethod
+    def _entry(row: tuple) -> EventEntry:
+        event_id, title, status, detail, updated_at = row
+        return EventEntry(
+            event_id=event_id,
+            title=title,
+            status=status,
+            timestamp=format_timestamp(updated_at),
+            detail=detail,
+        )
+
+    def upsert_events(
+        self, events: Iterable[StoredEvent], next_event_number: Optional[int] = None
+    ) -> None:
+        # The event-number counter is saved in the same transaction as the
+        # events it numbered.
+        with self._db:
+            self._db.executemany(
+                """
+                INSERT INTO events (
+                    event_id, title, status, detail, created_at, updated_at,
+                    item_count, sources
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (event_id) DO UPDATE SET
+                    title = excluded.title,
+                    status = excluded.status,
+                    detail = excluded.detail,
+                    updated_at = excluded.updated_at,
+                    item_count = excluded.item_count,
+                    sources = excluded.sources
+                """,
+                [
+                    (
+                        event.event_id,
+                        event.title,
+                        event.status,
+                        event.detail,
+                        event.updated_at,
+                        event.updated_at,
+                        event.item_count,
+                        event.sources,
+                    )
+                    for event in events
+                ],
+            )
+            if next_event_number is not None:
+                self._db.execute(
+                    "INSERT INTO counters (name, value) VALUES ('next_event_number', ?)"
+                    " ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)",
+                    (next_event_number,),
+                )
+
+    def set_status(self, event_id: str, status: str, at: float) -> Optional[str]:
+        with self._db:
+            row = self._db.execute(
+                "SELECT status FROM events WHERE event_id = ?", (event_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] != status:
+                self._db.execute(
+                    "UPDATE events SET status = ?, updated_at = ? WHERE event_id = ?",
+                    (status, at, event_id),
+                )
+            return row[0]
+
+    def resolve_stale(self, before: float, at: float) -> int:
+        with self._db:
+            return self._db.execute(
+                "UPDATE events SET status = 'Resolved', updated_at = ?"
+                " WHERE status != 'Resolved' AND updated_at < ?",
+                (at, before),
+            ).rowcount
+
+    def get_event(self, event_id: str) -> Optional[EventEntry]:
+        row = self._db.execute(
+            "SELECT event_id, title, status, detail, updated_at FROM events"
+            " WHERE event_id = ?",
+            (event_id,),
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def statuses(self, event_ids: Iterable[str]) -> Dict[str, str]:
+        ids = list(event_ids)
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        rows = self._db.execute(
+            f"SELECT event_id, status FROM events WHERE event_id IN ({placeholders})", ids
+        )
+        return dict(rows.fetchall())
+
+    def events_page(
+        self,
+        status: Optional[str] = None,
+        cursor: Optional[EventCursor] = None,
+        limit: int = 50,
+    ) -> EventPage:
+        clauses = []
+        params: list = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if cursor:
+            clauses.append("(updated_at, event_id) < (?, ?)")
+            params.extend(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._db.execute(
+            "SELECT event_id, title, status, detail, updated_at FROM events"
+            f" {where} ORDER BY updated_at DESC, event_id DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][4], rows[-1][0])
+        return EventPage([self._entry(row) for row in rows], next_cursor)
+
+    def events_between(
+        self,
+        start: float,
+        end: float,
+        status: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[EventEntry]:
+        query = (
+            "SELECT event_id, title, status, detail, updated_at FROM events"
+            " WHERE updated_at >= ? AND updated_at < ?"
+        )
+        params: list = [start, end]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+        return [self._entry(row) for row in self._db.execute(query, params)]
+
+    def count_events(self, status: Optional[str] = None) -> int:
+        if status:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM events WHERE status = ?", (status,)
+            ).fetchone()
+        else:
+            row = self._db.execute("SELECT COUNT(*) FROM events").fetchone()
+        return row[0]
+
+    def status_counts(self) -> Dict[str, int]:
+        rows = self._db.execute("SELECT status, COUNT(*) FROM events GROUP BY status")
+        return dict(rows.fetchall())
+
+    def open_events(self, since: float) -> List[StoredEvent]:
+        rows = self._db.execute(
+            "SELECT event_id, title, status, detail, updated_at, item_count, sources"
+            " FROM events WHERE status != 'Resolved' AND updated_at >= ?"
+            " ORDER BY updated_at",
+            (since,),
+        )
+        return [StoredEvent(*row) for row in rows]
+
+    def next_event_number(self) -> int:
+        row = self._db.execute(
+            "SELECT value FROM counters WHERE name = 'next_event_number'"
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        # Stores written before the counter existed.
+        (highest,) = self._db.execute(
+            "SELECT COALESCE(MAX(CAST(SUBSTR(event_id, 2) AS INTEGER)), 0) FROM events"
+        ).fetchone()
+        return highest + 1
+
+    def append_timeline(self, entries: Iterable[Tuple[float, str]]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO timeline (created_at, description) VALUES (?, ?)",
+                list(entries),
+            )
+
+    @staticmethod
+    def _timeline_rows(rows: Iterable[tuple]) -> List[Tuple[int, TimelineEntry]]:
+        return [
+            (row_id, TimelineEntry(timestamp=format_timestamp(created_at), description=text))
+            for row_id, created_at, text in rows
+        ]
+
+    def timeline_before(
+        self, before_id: Optional[int] = None, limit: int = 200
+    ) -> List[Tuple[int, TimelineEntry]]:
+        if before_id is None:
+            rows = self._db.execute(
+                "SELECT id, created_at, description FROM timeline ORDER BY id DESC LIMIT ?",
+                (limit,),
+            )
+        else:
+            rows = self._db.execute(
+                "SELECT id, created_at, description FROM timeline WHERE id < ?"
+                " ORDER BY id DESC LIMIT ?",
+                (before_id, limit),
+            )
+        return self._timeline_rows(rows)
+
+    def timeline_after(
+        self, after_id: int, limit: int = 200
+    ) -> List[Tuple[int, TimelineEntry]]:
+        rows = self._db.execute(
+            "SELECT id, created_at, description FROM timeline WHERE id > ?"
+            " ORDER BY id ASC LIMIT ?",
+            (after_id, limit),
+        )
+        return self._timeline_rows(rows)
+
+    def timeline_between(
+        self, start: float, end: float, limit: int = 1000
+    ) -> List[Tuple[int, TimelineEntry]]:
+        rows = self._db.execute(
+            "SELECT id, created_at, description FROM timeline"
+            " WHERE created_at >= ? AND created_at < ? ORDER BY id DESC LIMIT ?",
+            (start, end, limit),
+        )
+        return self._timeline_rows(rows)
+
+    def count_timeline(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM timeline").fetchone()[0]
+
+    def prune(self, before: float) -> int:
+        with self._db:
+            removed = self._db.execute(
+                "DELETE FROM events WHERE updated_at < ?", (before,)
+            ).rowcount
+            removed += self._db.execute(
+                "DELETE FROM timeline WHERE created_at < ?", (before,)
+            ).rowcount
+        return removed
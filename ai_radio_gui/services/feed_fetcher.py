@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ai_radio_gui.models.state import FeedStatus
+from ai_radio_gui.services.feed_parser import FeedItem, FeedParser, HighWaterMark
+from ai_radio_gui.services.http_client import HttpClient, HttpError
+
+FEEDS_ENV = "AI_RADIO_FEEDS"
+DEFAULT_FEEDS = (
+    "World=https://feeds.bbci.co.uk/news/world/rss.xml,"
+    "National=https://feeds.npr.org/1001/rss.xml,"
+    "Technology=https://feeds.arstechnica.com/arstechnica/index,"
+    "Business=https://www.theguardian.com/business/rss,"
+    "Science=https://www.sciencedaily.com/rss/top/science.xml"
+)
+
+
+@dataclass
+class FeedSource:
+    name: str
+    url: str
+
+
+def parse_feeds(entries: List[str]) -> List[FeedSource]:
+    sources = []
+    for entry in entries:
+        entry = entry.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        name, _, url = entry.partition("=")
+        if not url.strip().startswith(("http://", "https://")):
+            raise ValueError(f"Invalid feed entry: {entry!r}")
+        sources.append(FeedSource(name.strip(), url.strip()))
+    return sources
+
+
+def load_feed_sources(path: Path) -> List[FeedSource]:
+    # AI_RADIO_FEEDS ("Name=URL,...") wins, then a "Name = URL" per line
+    # feeds file, then the built-in list.
+    spec = os.environ.get(FEEDS_ENV)
+    if spec:
+        return parse_feeds(spec.split(","))
+    if path.exists():
+        return parse_feeds(path.read_text(encoding="utf-8").splitlines())
+    return parse_feeds(DEFAULT_FEEDS.split(","))
+
+
+@dataclass
+class _FeedState:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    failures: int = 0
+    next_attempt: float = 0.0
+    status: str = "Pending"
+    last_fetch: str = "Never"
+    items: int = 0
+    last_error: str = ""
+    high_water: Optional[HighWaterMark] = None
+
+
+@dataclass
+class PollSummary:
+    feeds: List[FeedStatus]
+    items: List[FeedItem]
+    fetched: int
+    not_modified: int
+    skipped: int
+    failures: Dict[str, str]
+    elapsed_seconds: float
+
+
+class FeedFetcher:
+    def __init__(
+        self,
+        sources: List[FeedSource],
+        client: Optional[HttpClient] = None,
+        max_concurrency: int = 16,
+        timeout_seconds: float = 10.0,
+        max_items_per_fetch: Optional[int] = 500,
+        slow_seconds: float = 4.0,
+        backoff_base_seconds: float = 15.0,
+        backoff_max_seconds: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.sources = list(sources)
+        self.client = client or HttpClient()
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.max_items_per_fetch = max_items_per_fetch
+        self.slow_seconds = slow_seconds
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._clock = clock
+        self._random = random.Random()
+        self._feeds: Dict[str, _FeedState] = {}
+
+    def _feed_state(self, source: FeedSource) -> _FeedState:
+        feed = self._feeds.get(source.url)
+        if feed is None:
+            feed = _FeedState()
+            self._feeds[source.url] = feed
+        return feed
+
+    async def poll(self) -> PollSummary:
+        started = self._clock()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        items: List[FeedItem] = []
+        outcomes = await asyncio.gather(
+            *(self._poll_source(source, semaphore, items) for source in self.sources)
+        )
+        feeds = [
+            FeedStatus(
+                name=source.name,
+                status=self._feed_state(source).status,
+                last_fetch=self._feed_state(source).last_fetch,
+                items=self._feed_state(source).items,
+            )
+            for source in self.sources
+        ]
+        return PollSummary(
+            feeds=feeds,
+            items=items,
+            fetched=outcomes.count("fetched"),
+            not_modified=outcomes.count("not_modified"),
+            skipped=outcomes.count("skipped"),
+            failures={
+                source.name: self._feed_state(source).last_error
+                for source, outcome in zip(self.sources, outcomes)
+                if outcome == "error"
+            },
+            elapsed_seconds=self._clock() - started,
+        )
+
+    async def _poll_source(
+        self, source: FeedSource, semaphore: asyncio.Semaphore, items: List[FeedItem]
+    ) -> str:
+        feed = self._feed_state(source)
+        if self._clock() < feed.next_attempt:
+            return "skipped"
+        async with semaphore:
+            started = self._clock()
+            try:
+                outcome = await self._fetch(source, feed, items)
+            except asyncio.TimeoutError:
+                self._record_failure(feed, "Timed out.")
+                return "error"
+            except (
+                OSError,
+                HttpError,
+                ET.ParseError,
+                asyncio.IncompleteReadError,
+                ValueError,
+            ) as exc:
+                self._record_failure(feed, str(exc) or exc.__class__.__name__)
+                return "error"
+            elapsed = self._clock() - started
+            feed.failures = 0
+            feed.next_attempt = 0.0
+            feed.last_error = ""
+            feed.status = "Lagging" if elapsed > self.slow_seconds else "Healthy"
+            feed.last_fetch = datetime.now().strftime("%H:%M:%S")
+            return outcome
+
+    async def _fetch(
+        self, source: FeedSource, feed: _FeedState, items: List[FeedItem]
+    ) -> str:
+        headers = {"Accept": "application/rss+xml, application/atom+xml, */*"}
+        if feed.etag:
+            headers["If-None-Match"] = feed.etag
+        if feed.last_modified:
+            headers["If-Modified-Since"] = feed.last_modified
+        async with self.client.stream(
+            "GET", source.url, headers, timeout=self.timeout_seconds
+        ) as stream:
+            response = stream.response
+            if response.status == 304:
+                return "not_modified"
+            if response.status != 200:
+                raise HttpError(f"HTTP {response.status} {response.reason}".strip())
+            parser = FeedParser(
+                source.name, self._clock(), feed.high_water, self.max_items_per_fetch
+            )
+            async for chunk in stream.iter_chunks():
+                parser.feed(chunk)
+                if parser.done:
+                    break
+            parser.close()
+        feed.etag = response.headers.get("etag")
+        feed.last_modified = response.headers.get("last-modified")
+        feed.high_water = parser.newest_mark()
+        feed.items += len(parser.items)
+        items.extend(parser.items)
+        return "fetched"
+
+    def _record_failure(self, feed: _FeedState, message: str) -> None:
+        feed.failures += 1
+        delay = min(
+            self.backoff_max_seconds,
+            self.backoff_base_seconds * (2 ** (feed.failures - 1)),
+        )
+        feed.next_attempt = self._clock() + delay * self._random.uniform(0.8, 1.2)
+        feed.status = "Error"
+        feed.last_error = message
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+
+_ITEM_TAGS = {"item", "entry"}
+_TITLE_TAGS = {"title"}
+_LINK_TAGS = {"link"}
+_GUID_TAGS = {"guid", "id"}
+_SUMMARY_TAGS = {"description", "summary", "content", "encoded"}
+_DATE_TAGS = {"pubDate", "published", "updated", "date"}
+_MAX_SUMMARY_CHARS = 2000
+
+
+@dataclass
+class FeedItem:
+    feed: str
+    guid: str
+    title: str
+    link: str
+    summary: str
+    published: Optional[float]
+    fetched_at: float
+    # Item ID of the earlier report this one near-duplicates, set at ingest.
+    duplicate_of: Optional[str] = None
+
+
+@dataclass
+class HighWaterMark:
+    guid: str
+    published: Optional[float]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_feed_date(value: str) -> Optional[float]:
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class FeedParser:
+    def __init__(
+        self,
+        feed_name: str,
+        fetched_at: float,
+        high_water: Optional[HighWaterMark] = None,
+        max_items: Optional[int] = None,
+    ) -> None:
+        self.feed_name = feed_name
+        self.fetched_at = fetched_at
+        self.high_water = high_water
+        self.max_items = max_items
+        self.items: List[FeedItem] = []
+        self.done = False
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: List[ET.Element] = []
+        self._fields: Optional[dict] = None
+
+    def feed(self, data: bytes) -> None:
+        if self.done:
+            return
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self) -> None:
+        if not self.done:
+            self._parser.close()
+            self._drain()
+            self.done = True
+
+    def newest_mark(self) -> Optional[HighWaterMark]:
+        if not self.items:
+            return self.high_water
+        newest = self.items[0]
+        return HighWaterMark(guid=newest.guid, published=newest.published)
+
+    def _drain(self) -> None:
+        for event, element in self._parser.read_events():
+            if self.done:
+                return
+            name = _local_name(element.tag)
+            if event == "start":
+                if name in _ITEM_TAGS and self._fields is None:
+                    self._fields = {}
+                self._stack.append(element)
+                continue
+            self._stack.pop()
+            if self._fields is None:
+                continue
+            if name in _ITEM_TAGS:
+                self._finish_item()
+                element.clear()
+                if self._stack:
+                    self._stack[-1].clear()
+            else:
+                self._capture(name, element)
+
+    def _capture(self, name: str, element: ET.Element) -> None:
+        fields = self._fields
+        text = (element.text or "").strip()
+        if name in _LINK_TAGS:
+            href = element.get("href")
+            if href and element.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href)
+            elif text:
+                fields.setdefault("link", text)
+        elif name in _TITLE_TAGS:
+            fields.setdefault("title", text)
+        elif name in _GUID_TAGS:
+            fields.setdefault("guid", text)
+        elif name in _SUMMARY_TAGS:
+            fields.setdefault("summary", text[:_MAX_SUMMARY_CHARS])
+        elif name in _DATE_TAGS:
+            fields.setdefault("published", parse_feed_date(text))
+
+    def _finish_item(self) -> None:
+        fields = self._fields
+        self._fields = None
+        title = fields.get("title", "")
+        guid = fields.get("guid") or fields.get("link") or title
+        published = fields.get("published")
+        if self._reached_high_water(guid, published):
+            self.done = True
+            return
+        self.items.append(
+            FeedItem(
+                feed=self.feed_name,
+                guid=guid,
+                title=title,
+                link=fields.get("link", ""),
+                summary=fields.get("summary", ""),
+                published=published,
+                fetched_at=self.fetched_at,
+            )
+        )
+        if self.max_items is not None and len(self.items) >= self.max_items:
+            self.done = True
+
+    def _reached_high_water(self, guid: str, published: Optional[float]) -> bool:
+        mark = self.high_water
+        if mark is None:
+            return False
+        if guid == mark.guid:
+            return True
+        return (
+            published is not None
+            and mark.published is not None
+            and published < mark.published
+        )
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import math
+import os
+import queue
+import sqlite3
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    sequence INTEGER PRIMARY KEY,
+    start REAL NOT NULL,
+    duration REAL NOT NULL,
+    path TEXT NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_start ON segments (start);
+"""
+
+_ID3_OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+_PRUNE_INTERVAL = 600.0
+_RESYNC_SECONDS = 2.0
+
+
+@dataclass(frozen=True)
+class HlsSegment:
+    sequence: int
+    start: float
+    duration: float
+    path: str
+    data: bytes = b""
+
+
+def id3_timestamp(start: float) -> bytes:
+    # Packed-audio segments carry their first sample's MPEG-TS timestamp in
+    # an ID3 PRIV frame (RFC 8216, section 3.4).
+    payload = _ID3_OWNER + struct.pack(">Q", int(start * 90000) % (1 << 33))
+    frame = b"PRIV" + struct.pack(">I", len(payload)) + b"\x00\x00" + payload
+    size = len(frame)
+    syncsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + frame
+
+
+def format_program_date(timestamp: float) -> str:
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def parse_timestamp(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+
+
+def render_playlist(
+    segments: List[HlsSegment],
+    target_seconds: float,
+    vod: bool = False,
+    prefix: str = "",
+) -> str:
+    longest = max([target_seconds] + [segment.duration for segment in segments])
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{math.ceil(longest)}",
+        f"#EXT-X-MEDIA-SEQUENCE:{segments[0].sequence if segments else 0}",
+    ]
+    if vod:
+        lines.append("#EXT-X-PLAYLIST-TYPE:VOD")
+    previous: Optional[HlsSegment] = None
+    for segment in segments:
+        # A gap (station was off air) or a sequence jump breaks continuity.
+        if previous is not None and (
+            segment.sequence != previous.sequence + 1
+            or segment.start - (previous.start + previous.duration) > 1.0
+        ):
+            lines.append("#EXT-X-DISCONTINUITY")
+        if previous is None or lines[-1] == "#EXT-X-DISCONTINUITY":
+            lines.append(f"#EXT-X-PROGRAM-DATE-TIME:{format_program_date(segment.start)}")
+        lines.append(f"#EXTINF:{segment.duration:.3f},")
+        lines.append(prefix + segment.path)
+        previous = segment
+    if vod:
+        lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+class HlsSegmenter:
+    # Cuts an encoded frame stream into HLS packed-audio segments. push()
+    # runs on the encoder's reader thread and only appends to a list; closed
+    # segments go through a queue to one writer thread, which writes every
+    # segment waiting in the queue, indexes them in one SQLite transaction
+    # and rewrites the rolling playlist once per batch. Segments stay on
+    # disk under archive/YYYY/MM/DD/HH/ as the broadcast archive, indexed by
+    # start time so any past window is one range query away, and are
+    # pruned after retention_days.
+    def __init__(
+        self,
+        root: Path,
+        frame_seconds: float,
+        extension: str = ".aac",
+        content_type: str = "audio/aac",
+        target_seconds: float = 6.0,
+        window: int = 6,
+        retention_days: int = 30,
+        batch_size: int = 32,
+    ) -> None:
+        self.root = root
+        self.frame_seconds = frame_seconds
+        self.extension = extension
+        self.content_type = content_type
+        self.target_seconds = target_seconds
+        self.window = window
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self._frames_per_segment = max(1, round(target_seconds / frame_seconds))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "archive.sqlite3"
+        db = self._connect()
+        db.executescript(_SCHEMA)
+        (last,) = db.execute("SELECT MAX(sequence) FROM segments").fetchone()
+        db.close()
+        self._sequence = (last or 0) + 1
+        self._frames: List[bytes] = []
+        self._segment_start = 0.0
+        self._origin: Optional[float] = None
+        self._frame_count = 0
+        self._live: Deque[HlsSegment] = deque(maxlen=window)
+        self.live_playlist = render_playlist([], target_seconds)
+        self._queue: "queue.Queue[Optional[HlsSegment]]" = queue.Queue()
+        self.segments_written = 0
+        self.bytes_written = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.last_batch_seconds = 0.0
+        self.pruned = 0
+        self.errors = 0
+        self.last_error = ""
+        self._next_prune = 0.0
+        self._writer = threading.Thread(
+            target=self._write_loop, name="hls-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.db_path))
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def push(self, frame: bytes) -> None:
+        if not self._frames:
+            self._segment_start = self._frame_time()
+        self._frames.append(frame)
+        self._frame_count += 1
+        if len(self._frames) >= self._frames_per_segment:
+            self._close_segment()
+
+    def _frame_time(self) -> float:
+        # Start times follow the frame count from a fixed origin, so segments
+        # tile exactly instead of picking up reader-thread jitter. The origin
+        # moves only when the wall clock is _RESYNC_SECONDS away (the stream
+        # stalled or was off air), which the playlist shows as a gap.
+        now = time.time()
+        if self._origin is not None:
+            expected = self._origin + self._frame_count * self.frame_seconds
+            if abs(now - expected) <= _RESYNC_SECONDS:
+                return expected
+        self._origin, self._frame_count = now, 0
+        return now
+
+    def _close_segment(self) -> None:
+        frames, self._frames = self._frames, []
+        start = self._segment_start
+        moment = datetime.fromtimestamp(start, timezone.utc)
+        sequence = self._sequence
+        self._sequence += 1
+        path = f"archive/{moment:%Y/%m/%d/%H}/{sequence:09d}{self.extension}"
+        data = b"".join(frames)
+        if self.extension == ".aac":
+            data = id3_timestamp(start) + data
+        duration = len(frames) * self.frame_seconds
+        self._queue.put(HlsSegment(sequence, start, duration, path, data))
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def _write_loop(self) -> None:
+        # The writer thread owns its own connection.
+        self._db = self._connect()
+        while True:
+            segment = self._queue.get()
+            if segment is None:
+                break
+            batch = [segment]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    segment = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if segment is None:
+                    stop = True
+                    break
+                batch.append(segment)
+            self._write_batch(batch)
+            if stop:
+                break
+            if time.monotonic() >= self._next_prune:
+                self._next_prune = time.monotonic() + _PRUNE_INTERVAL
+                try:
+                    self.prune()
+                except (OSError, sqlite3.Error) as exc:
+                    self.errors += 1
+                    self.last_error = f"Prune failed: {exc}"
+        self._db.close()
+
+    def _write_batch(self, batch: List[HlsSegment]) -> None:
+        # Only segments that are both on disk and indexed count as written;
+        # a file whose row could not be inserted is removed again, so prune
+        # and the archive index never disagree.
+        started = time.perf_counter()
+        written: List[HlsSegment] = []
+        for segment in batch:
+            try:
+                path = self.root / segment.path
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(segment.data)
+            except OSError as exc:
+                self.errors += 1
+                self.last_error = str(exc)
+                continue
+            written.append(segment)
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            segment.sequence,
+                            segment.start,
+                            segment.duration,
+                            segment.path,
+                            len(segment.data),
+                        )
+                        for segment in written
+                    ],
+                )
+        except sqlite3.Error as exc:
+            self.errors += 1
+            self.last_error = str(exc)
+            for segment in written:
+                try:
+                    (self.root / segment.path).unlink()
+                except OSError:
+                    pass
+            written = []
+        for segment in written:
+            self._live.append(
+                HlsSegment(segment.sequence, segment.start, segment.duration, segment.path)
+            )
+            self.bytes_written += len(segment.data)
+        self.live_playlist = render_playlist(list(self._live), self.target_seconds)
+        playlist = self.root / "live.m3u8"
+        temporary = playlist.with_suffix(".tmp")
+        try:
+            temporary.write_text(self.live_playlist)
+            os.replace(temporary, playlist)
+        except OSError as exc:
+            self.errors += 1
+            self.last_error = str(exc)
+        self.segments_written += len(written)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.last_batch_seconds = time.perf_counter() - started
+
+    def prune(self) -> int:
+        # Runs on the writer thread.
+        cutoff = time.time() - self.retention_days * 86400
+        expired = self._db.execute(
+            "SELECT sequence, path FROM segments WHERE start < ?", (cutoff,)
+        ).fetchall()
+        if not expired:
+            return 0
+        folders = set()
+        for _, relative in expired:
+            path = self.root / relative
+            folders.add(path.parent)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        with self._db:
+            self._db.execute("DELETE FROM segments WHERE start < ?", (cutoff,))
+        for folder in sorted(folders, key=lambda item: len(item.parts), reverse=True):
+            while folder != self.root and folder.is_relative_to(self.root):
+                try:
+                    folder.rmdir()
+                except OSError:
+                    break
+                folder = folder.parent
+        self.pruned += len(expired)
+        return len(expired)
+
+    def archive_segments(self, start: float, seconds: float = 3600.0) -> List[HlsSegment]:
+        # Starts with the segment playing at `start`, found through the
+        # start-time index.
+        db = self._connect()
+        try:
+            rows = db.execute(
+                "SELECT sequence, start, duration, path FROM segments"
+                " WHERE start > ? AND start < ? ORDER BY start",
+                (start - self.target_seconds * 2, start + seconds),
+            ).fetchall()
+        finally:
+            db.close()
+        segments = [HlsSegment(*row) for row in rows]
+        while len(segments) > 1 and segments[1].start <= start:
+            segments.pop(0)
+        return segments
+
+    def archive_playlist(self, start: float, seconds: float = 3600.0) -> str:
+        return render_playlist(
+            self.archive_segments(start, seconds), self.target_seconds, vod=True
+        )
+
+    def http_get(self, path: str, query: str) -> Optional[Tuple[bytes, str, str]]:
+        # For StreamServer routes; runs in an executor thread. Returns body,
+        # content type and Cache-Control.
+        if path == "live.m3u8":
+            return self.live_playlist.encode(), "application/vnd.apple.mpegurl", "max-age=1"
+        if path == "archive.m3u8":
+            params = parse_qs(query)
+            try:
+                start = parse_timestamp(params.get("start", [""])[0])
+                seconds = float(params.get("seconds", ["3600"])[0])
+            except ValueError:
+                return None
+            return (
+                self.archive_playlist(start, min(seconds, 86400.0)).encode(),
+                "application/vnd.apple.mpegurl",
+                "max-age=60",
+            )
+        if not path.startswith("archive/") or ".." in path.split("/"):
+            return None
+        try:
+            data = (self.root / path).read_bytes()
+        except OSError:
+            return None
+        # Segments never change once written.
+        return data, self.content_type, "public, max-age=31536000, immutable"
+
+    def close(self, timeout: float = 2.0) -> None:
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    def summary(self) -> Dict[str, str]:
+        return {
+            "HLS Segments": f"{self.segments_written} written, {self.queued} queued",
+            "HLS Batches": (
+                f"{self.batches} (largest {self.largest_batch}, "
+                f"last {self.last_batch_seconds * 1000:.1f} ms)"
+            ),
+            "HLS Archive": f"{self.bytes_written / 1e6:.1f} MB written, {self.pruned} pruned",
+            "HLS Retention": f"{self.retention_days} days",
+            "HLS Errors": self.last_error or "None",
+        }
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+_HostKey = Tuple[str, str, int]
+_READ_SIZE = 65536
+_T = TypeVar("_T")
+
+
+class HttpError(Exception):
+    pass
+
+
+async def _until(deadline: Optional[float], awaitable: Awaitable[_T]) -> _T:
+    if deadline is None:
+        return await awaitable
+    remaining = deadline - asyncio.get_running_loop().time()
+    return await asyncio.wait_for(awaitable, max(0.0, remaining))
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    reason: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def is_usable(self) -> bool:
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HostPool:
+    def __init__(self, max_connections: int) -> None:
+        self.slots = asyncio.Semaphore(max_connections)
+        self.idle: List[_Connection] = []
+
+
+class HttpStream:
+    def __init__(
+        self,
+        connection: _Connection,
+        response: HttpResponse,
+        method: str,
+        deadline: Optional[float] = None,
+    ) -> None:
+        self.response = response
+        self._connection = connection
+        self._deadline = deadline
+        self._keep_alive = response.headers.get("connection", "").lower() != "close"
+        self._remaining: Optional[int] = None
+        self._chunked = False
+        self._done = False
+        if method == "HEAD" or response.status in (204, 304) or response.status < 200:
+            self._done = True
+        elif "chunked" in response.headers.get("transfer-encoding", "").lower():
+            self._chunked = True
+        elif "content-length" in response.headers:
+            self._remaining = int(response.headers["content-length"])
+            self._done = self._remaining == 0
+        else:
+            self._keep_alive = False
+
+    @property
+    def reusable(self) -> bool:
+        return self._done and self._keep_alive
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        reader = self._connection.reader
+        deadline = self._deadline
+        while not self._done:
+            if self._chunked:
+                size_line = await _until(deadline, reader.readline())
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await _until(deadline, reader.readline())) not in (
+                        b"\r\n",
+                        b"\n",
+                        b"",
+                    ):
+                        pass
+                    self._done = True
+                    return
+                data = await _until(deadline, reader.readexactly(size))
+                await _until(deadline, reader.readexactly(2))
+                yield data
+            elif self._remaining is not None:
+                data = await _until(deadline, reader.read(min(_READ_SIZE, self._remaining)))
+                if not data:
+                    raise HttpError("Connection closed before body completed.")
+                self._remaining -= len(data)
+                self._done = self._remaining == 0
+                yield data
+            else:
+                data = await _until(deadline, reader.read(_READ_SIZE))
+                if not data:
+                    self._done = True
+                    return
+                yield data
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+
+class HttpClient:
+    def __init__(
+        self,
+        max_connections_per_host: int = 4,
+        user_agent: str = "AI-News-Radio/1.0",
+    ) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self.user_agent = user_agent
+        self._pools: Dict[_HostKey, _HostPool] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self.connections_opened = 0
+
+    def _pool(self, key: _HostKey) -> _HostPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _HostPool(self.max_connections_per_host)
+            self._pools[key] = pool
+        return pool
+
+    async def _connect(self, key: _HostKey) -> _Connection:
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def _checkout_idle(self, pool: _HostPool) -> Optional[_Connection]:
+        while pool.idle:
+            connection = pool.idle.pop()
+            if connection.is_usable():
+                connection.reused = True
+                return connection
+            connection.close()
+        return None
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[HttpStream]:
+        # The timeout starts once a pooled connection slot is held, so time
+        # spent queued behind other requests to the host does not count. It
+        # covers connecting, the response headers and reading the body.
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise HttpError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{port}"
+        request_headers = {
+            "Host": host_header,
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "identity",
+            "Connection": "keep-alive",
+        }
+        if body is not None:
+            request_headers["Content-Length"] = str(len(body))
+        request_headers.update(headers or {})
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in request_headers.items()
+        )
+        payload = head.encode("latin-1") + b"\r\n" + (body or b"")
+
+        pool = self._pool(key)
+        async with pool.slots:
+            deadline = None
+            if timeout is not None:
+                deadline = asyncio.get_running_loop().time() + timeout
+            connection = self._checkout_idle(pool)
+            if connection is None:
+                connection = await _until(deadline, self._connect(key))
+            try:
+                try:
+                    response = await _until(deadline, self._send(connection, payload))
+                except (ConnectionError, asyncio.IncompleteReadError, HttpError):
+                    connection.close()
+                    if not connection.reused:
+                        raise
+                    connection = await _until(deadline, self._connect(key))
+                    response = await _until(deadline, self._send(connection, payload))
+            except BaseException:
+                # Includes timeouts and cancellation mid-request.
+                connection.close()
+                raise
+            stream = HttpStream(connection, response, method, deadline)
+            try:
+                yield stream
+            except BaseException:
+                connection.close()
+                raise
+            if stream.reusable and connection.is_usable():
+                pool.idle.append(connection)
+            else:
+                connection.close()
+
+    async def _send(self, connection: _Connection, payload: bytes) -> HttpResponse:
+        connection.writer.write(payload)
+        await connection.writer.drain()
+        while True:
+            try:
+                raw = await connection.reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError:
+                raise HttpError("Response headers too large.") from None
+            lines = raw.decode("latin-1").split("\r\n")
+            status_parts = lines[0].split(" ", 2)
+            if (
+                len(status_parts) < 2
+                or not status_parts[0].startswith("HTTP/")
+                or not status_parts[1].isdigit()
+            ):
+                raise HttpError(f"Malformed status line: {lines[0]!r}")
+            status = int(status_parts[1])
+            headers: Dict[str, str] = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            if status != 100:
+                reason = status_parts[2] if len(status_parts) > 2 else ""
+                return HttpResponse(status=status, reason=reason, headers=headers)
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            for connection in pool.idle:
+                connection.close()
+            pool.idle.clear()
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ITU-R BS.1770 / EBU R128 constants.
+HOP_SECONDS = 0.1
+MOMENTARY_HOPS = 4
+SHORT_TERM_HOPS = 30
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+SILENCE = -120.0
+# Integrated loudness is kept as a histogram of 400 ms gating-block energies,
+# so it updates in constant memory and is re-gated in one vectorised pass.
+_HISTOGRAM_STEP = 0.1
+_HISTOGRAM_BINS = int((10.0 - ABSOLUTE_GATE) / _HISTOGRAM_STEP)
+_OVERSAMPLE = 4
+_TRUE_PEAK_TAPS = 48
+_FILTER_BLOCK = 256
+
+
+def k_weighting_sos(sample_rate: int) -> np.ndarray:
+    # Head-related high shelf followed by the RLB high-pass, designed for any
+    # sample rate; at 48 kHz this reproduces the coefficients in BS.1770.
+    k = math.tan(math.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [
+        (vh + vb * k / q + k * k) / a0,
+        2 * (k * k - vh) / a0,
+        (vh - vb * k / q + k * k) / a0,
+        1.0,
+        2 * (k * k - 1) / a0,
+        (1 - k / q + k * k) / a0,
+    ]
+    k = math.tan(math.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    high_pass = [1.0, -2.0, 1.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    return np.array([shelf, high_pass])
+
+
+def lowpass_taps(count: int, cutoff: float) -> np.ndarray:
+    # Hamming-windowed sinc with unity DC gain; cutoff is a fraction of
+    # Nyquist.
+    centre = np.arange(count) - (count - 1) / 2
+    taps = cutoff * np.sinc(cutoff * centre) * np.hamming(count)
+    return taps / taps.sum()
+
+
+class _Biquad:
+    # One direct-form II transposed section applied a block at a time. The
+    # recursion over a block is unrolled once into its impulse-response matrix
+    # and the response to the carried state, so filtering every row is two
+    # matrix products per block; the state after the block follows from its
+    # last two inputs and outputs.
+    def __init__(self, section: Sequence[float], block: int = _FILTER_BLOCK) -> None:
+        b0, b1, b2, _, a1, a2 = section
+        self._coefficients = (b0, b1, b2, a1, a2)
+        # Three runs side by side: a unit impulse, then unit z1 and z2 state.
+        x = np.array([1.0, 0.0, 0.0])
+        z1 = np.array([0.0, 1.0, 0.0])
+        z2 = np.array([0.0, 0.0, 1.0])
+        responses = np.empty((block, 3))
+        for n in range(block):
+            y = b0 * x + z1
+            z1, z2 = b1 * x - a1 * y + z2, b2 * x - a2 * y
+            responses[n] = y
+            x = np.zeros(3)
+        lag = np.arange(block)[None, :] - np.arange(block)[:, None]
+        self._transfer = np.where(lag >= 0, responses[np.maximum(lag, 0), 0], 0.0)
+        self._carry = np.ascontiguousarray(responses[:, 1:].T)
+
+    def apply(self, samples: np.ndarray, state: np.ndarray):
+        # samples: (rows, frames), state: (rows, 2) as (z1, z2).
+        b0, b1, b2, a1, a2 = self._coefficients
+        block = len(self._transfer)
+        output = np.empty(samples.shape)
+        for start in range(0, samples.shape[1], block):
+            x = samples[:, start : start + block]
+            size = x.shape[1]
+            y = x @ self._transfer[:size, :size] + state @ self._carry[:, :size]
+            output[:, start : start + size] = y
+            z2 = b2 * x[:, -2] - a2 * y[:, -2] if size > 1 else state[:, 1]
+            state = np.stack(
+                [b1 * x[:, -1] - a1 * y[:, -1] + z2, b2 * x[:, -1] - a2 * y[:, -1]], axis=1
+            )
+        return output, state
+
+
+def energy_to_lufs(energy):
+    energy = np.asarray(energy, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        lufs = -0.691 + 10 * np.log10(energy)
+    return np.maximum(lufs, SILENCE)
+
+
+def gain_to_db(gain):
+    gain = np.asarray(gain, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        return np.maximum(20 * np.log10(gain), SILENCE)
+
+
+@dataclass(frozen=True)
+class LoudnessReading:
+    momentary: np.ndarray
+    short_term: np.ndarray
+    integrated: np.ndarray
+    true_peak: np.ndarray
+
+    @classmethod
+    def silent(cls, programmes: int) -> "LoudnessReading":
+        quiet = np.full(programmes, SILENCE)
+        return cls(quiet, quiet, quiet, quiet)
+
+
+class LoudnessMeter:
+    # Meters several programmes in one pass. Input rows are channels and
+    # `channels` gives how many consecutive rows make up each programme, so
+    # the mixer can meter every track (1 row each) and the stereo bus (2 rows)
+    # with a single filter call. Blocks of any size are accepted; filter and
+    # interpolator state carry across calls.
+    def __init__(self, sample_rate: int, channels: Sequence[int]) -> None:
+        self.sample_rate = sample_rate
+        self.channels = list(channels)
+        self.programmes = programmes = len(self.channels)
+        rows = sum(self.channels)
+        self._starts = np.cumsum([0] + self.channels[:-1])
+        self.hop_frames = int(round(sample_rate * HOP_SECONDS))
+        self._k_filters = [_Biquad(section) for section in k_weighting_sos(sample_rate)]
+        self._k_state = np.zeros((len(self._k_filters), rows, 2))
+        taps = lowpass_taps(_TRUE_PEAK_TAPS, 1.0 / _OVERSAMPLE) * _OVERSAMPLE
+        # Column p holds the taps of polyphase branch p, reversed so a sliding
+        # window of input samples times this matrix yields all four
+        # interpolated samples at once.
+        self._phases = np.ascontiguousarray(taps.reshape(-1, _OVERSAMPLE)[::-1])
+        self._history = np.zeros((rows, len(self._phases) - 1))
+        self._hop_sum = np.zeros(rows)
+        self._hop_fill = 0
+        self._hops = np.zeros((SHORT_TERM_HOPS, programmes))
+        self._hop_count = 0
+        self._histogram_count = np.zeros((programmes, _HISTOGRAM_BINS), dtype=np.int64)
+        self._histogram_energy = np.zeros((programmes, _HISTOGRAM_BINS))
+        self.true_peak = np.zeros(programmes)
+        self.frames = 0
+
+    def process(self, samples: np.ndarray) -> int:
+        # samples: (rows, frames). Returns how many 100 ms hops completed.
+        weighted = samples
+        for index, section in enumerate(self._k_filters):
+            weighted, self._k_state[index] = section.apply(weighted, self._k_state[index])
+        self._track_peaks(samples)
+        squares = weighted * weighted
+        frames = squares.shape[1]
+        offset = 0
+        closed = 0
+        while offset < frames:
+            take = min(frames - offset, self.hop_frames - self._hop_fill)
+            self._hop_sum += squares[:, offset : offset + take].sum(axis=1)
+            self._hop_fill += take
+            offset += take
+            if self._hop_fill == self.hop_frames:
+                self._close_hop()
+                closed += 1
+        self.frames += frames
+        return closed
+
+    def _track_peaks(self, samples: np.ndarray) -> None:
+        # 4x polyphase interpolation; the largest interpolated magnitude is
+        # the true peak (BS.1770 Annex 2).
+        extended = np.concatenate([self._history, samples], axis=1)
+        self._history = extended[:, extended.shape[1] - self._history.shape[1] :]
+        windows = sliding_window_view(extended, len(self._phases), axis=1)
+        peak = np.abs(windows @ self._phases).max(axis=(1, 2))
+        np.maximum(peak, np.abs(samples).max(axis=1), out=peak)
+        np.maximum(self.true_peak, np.maximum.reduceat(peak, self._starts), out=self.true_peak)
+
+    def _close_hop(self) -> None:
+        energy = np.add.reduceat(self._hop_sum, self._starts)
+        self._hops[self._hop_count % SHORT_TERM_HOPS] = energy / self.hop_frames
+        self._hop_count += 1
+        self._hop_sum[:] = 0.0
+        self._hop_fill = 0
+        if self._hop_count >= MOMENTARY_HOPS:
+            block = self._window(MOMENTARY_HOPS)
+            lufs = energy_to_lufs(block)
+            gated = lufs > ABSOLUTE_GATE
+            bins = np.clip(
+                ((lufs - ABSOLUTE_GATE) / _HISTOGRAM_STEP).astype(np.int64),
+                0,
+                _HISTOGRAM_BINS - 1,
+            )
+            rows = np.nonzero(gated)[0]
+            self._histogram_count[rows, bins[rows]] += 1
+            self._histogram_energy[rows, bins[rows]] += block[rows]
+
+    def _window(self, hops: int) -> np.ndarray:
+        available = min(hops, self._hop_count, SHORT_TERM_HOPS)
+        if not available:
+            return np.zeros(self.programmes)
+        end = self._hop_count % SHORT_TERM_HOPS
+        rows = np.arange(end - available, end) % SHORT_TERM_HOPS
+        return self._hops[rows].sum(axis=0) / hops
+
+    def momentary(self) -> np.ndarray:
+        return energy_to_lufs(self._window(MOMENTARY_HOPS))
+
+    def short_term(self) -> np.ndarray:
+        return energy_to_lufs(self._window(SHORT_TERM_HOPS))
+
+    def integrated(self) -> np.ndarray:
+        count = self._histogram_count
+        energy = self._histogram_energy
+        total = count.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = energy.sum(axis=1) / total
+        threshold = energy_to_lufs(mean) + RELATIVE_GATE
+        # A bin straddling the relative gate is kept whole; the error is at
+        # most one 0.1 LU step.
+        first = np.floor((threshold - ABSOLUTE_GATE) / _HISTOGRAM_STEP)
+        keep = np.arange(_HISTOGRAM_BINS)[None, :] >= first[:, None]
+        kept = (count * keep).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            gated = (energy * keep).sum(axis=1) / kept
+        return np.where(kept > 0, energy_to_lufs(gated), SILENCE)
+
+    def true_peak_dbtp(self) -> np.ndarray:
+        return gain_to_db(self.true_peak)
+
+    def reading(self) -> LoudnessReading:
+        return LoudnessReading(
+            self.momentary(), self.short_term(), self.integrated(), self.true_peak_dbtp()
+        )
+
+
+class LoudnessNormalizer:
+    # Slow automatic gain per track. Each track's loudness is tracked as a
+    # running average of momentary energy taken only while the track is
+    # audible, so speech pauses and gaps between clips neither dilute the
+    # estimate nor pump the gain; the correction toward the target is then
+    # slew-limited so it never audibly jumps.
+    def __init__(
+        self,
+        target_lufs: float = -18.0,
+        max_gain_db: float = 12.0,
+        slew_db_per_second: float = 1.5,
+        gate_lufs: float = -45.0,
+        window_seconds: float = 3.0,
+    ) -> None:
+        self.target_lufs = target_lufs
+        self.max_gain_db = max_gain_db
+        self.slew_db_per_second = slew_db_per_second
+        self.gate_lufs = gate_lufs
+        self.window_seconds = window_seconds
+        self.enabled = np.zeros(0, dtype=bool)
+        self.gain_db = np.zeros(0)
+        self._energy = np.zeros(0)
+
+    def resize(self, enabled: List[bool]) -> None:
+        count = len(enabled)
+        keep = min(count, len(self.gain_db))
+        gain_db = np.zeros(count)
+        energy = np.zeros(count)
+        gain_db[:keep] = self.gain_db[:keep]
+        energy[:keep] = self._energy[:keep]
+        self.enabled = np.array(enabled, dtype=bool)
+        self.gain_db = gain_db
+        self._energy = energy
+
+    def update(self, momentary: np.ndarray, elapsed_seconds: float) -> np.ndarray:
+        audible = momentary > self.gate_lufs
+        energy = 10 ** ((momentary + 0.691) / 10)
+        alpha = min(1.0, elapsed_seconds / self.window_seconds)
+        seeded = self._energy > 0
+        self._energy = np.where(
+            audible,
+            np.where(seeded, self._energy + alpha * (energy - self._energy), energy),
+            self._energy,
+        )
+        wanted = np.clip(
+            self.target_lufs - energy_to_lufs(self._energy), -self.max_gain_db, self.max_gain_db
+        )
+        wanted = np.where(self._energy > 0, wanted, self.gain_db)
+        step = self.slew_db_per_second * elapsed_seconds
+        self.gain_db = np.where(
+            self.enabled, self.gain_db + np.clip(wanted - self.gain_db, -step, step), 0.0
+        )
+        return self.gain_db
+
+
+def format_lufs(value: float) -> str:
+    return f"{value:.1f} LUFS" if value > SILENCE else "-inf LUFS"
+
+
+def format_dbtp(value: float) -> str:
+    return f"{value:+.1f} dBTP" if value > SILENCE else "-inf dBTP"
+
+
+def loudness_summary(reading: LoudnessReading, programme: int = 0) -> Dict[str, str]:
+    return {
+        "Momentary": format_lufs(float(reading.momentary[programme])),
+        "Short-term": format_lufs(float(reading.short_term[programme])),
+        "Integrated": format_lufs(float(reading.integrated[programme])),
+        "True Peak": format_dbtp(float(reading.true_peak[programme])),
+    }
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai_radio_gui.services.loudness import (
+    HOP_SECONDS,
+    LoudnessMeter,
+    LoudnessNormalizer,
+    LoudnessReading,
+    loudness_summary,
+)
+
+
+def db_to_gain(db: float) -> float:
+    return 10.0 ** (db / 20.0)
+
+
+def pan_gains(pan: float) -> Tuple[float, float]:
+    # Constant-power pan law: -1 hard left, 0 centre (-3 dB each side), 1 hard right.
+    angle = (min(max(pan, -1.0), 1.0) + 1.0) * math.pi / 4
+    return math.cos(angle), math.sin(angle)
+
+
+def pad_loop(sample_rate: int, seconds: float = 8.0) -> np.ndarray:
+    # Soft major-seventh pad with a slow swell; loops seamlessly because every
+    # partial completes a whole number of cycles.
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    pad = np.zeros_like(t)
+    for ratio in (1.0, 1.25, 1.5, 1.875):
+        frequency = round(110.0 * ratio * seconds) / seconds
+        pad += np.sin(2 * np.pi * frequency * t) + 0.3 * np.sin(4 * np.pi * frequency * t)
+    swell = 0.75 + 0.25 * np.sin(2 * np.pi * t / seconds)
+    return (0.12 * pad * swell).astype(np.float32)
+
+
+def stinger(sample_rate: int, seconds: float = 1.2) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    sweep = np.sin(2 * np.pi * (440.0 * t + 330.0 * t * t))
+    return (0.6 * sweep * np.exp(-3.0 * t)).astype(np.float32)
+
+
+class LoopSource:
+    def __init__(self, samples: np.ndarray) -> None:
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+
+    def render(self, out: np.ndarray, frame: int) -> None:
+        length = len(self.samples)
+        position = frame % length
+        filled = 0
+        while filled < len(out):
+            count = min(len(out) - filled, length - position)
+            out[filled : filled + count] = self.samples[position : position + count]
+            filled += count
+            position = 0
+
+
+class ClipSource:
+    # Clips are placed on the mixer timeline by absolute start frame, so a
+    # sequence can be queued ahead of air and played back sample-accurately.
+    def __init__(self) -> None:
+        self._clips: List[Tuple[int, np.ndarray]] = []
+
+    def enqueue(self, samples: np.ndarray, start_frame: int) -> int:
+        self._clips.append((start_frame, np.ascontiguousarray(samples, dtype=np.float32)))
+        self._clips.sort(key=lambda clip: clip[0])
+        return start_frame + len(samples)
+
+    def clear(self) -> None:
+        self._clips = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._clips)
+
+    def render(self, out: np.ndarray, frame: int) -> None:
+        end = frame + len(out)
+        out.fill(0.0)
+        for start, samples in self._clips:
+            if start >= end:
+                break
+            lo = max(start, frame)
+            hi = min(start + len(samples), end)
+            if lo < hi:
+                out[lo - frame : hi - frame] += samples[lo - start : hi - start]
+        if self._clips and self._clips[0][0] + len(self._clips[0][1]) <= end:
+            self._clips = [clip for clip in self._clips if clip[0] + len(clip[1]) > end]
+
+
+@dataclass
+class MixerTrack:
+    name: str
+    kind: str
+    source: object
+    gain_db: float = 0.0
+    pan: float = 0.0
+    muted: bool = False
+    solo: bool = False
+    normalize: bool = True
+
+
+@dataclass
+class Fade:
+    start_frame: int
+    end_frame: int
+    to_level: float
+    key: str = ""
+    from_level: Optional[float] = None
+
+    def level_at(self, frame: int) -> float:
+        if frame >= self.end_frame or self.from_level is None:
+            return self.to_level
+        progress = (frame - self.start_frame) / (self.end_frame - self.start_frame)
+        return self.from_level + (self.to_level - self.from_level) * progress
+
+
+class Mixer:
+    # Mixes every track for one block with array operations only: sources fill
+    # rows of a preallocated (tracks, frames) matrix, gain changes become a
+    # per-block linear ramp, and the stereo bus is a single matrix product.
+    # Control calls from other threads are queued and applied between blocks.
+    # Every track (pre-fader) and the bus are loudness-metered in one pass,
+    # and the track readings drive a slow normalisation gain.
+    def __init__(self, sample_rate: int = 48000, block_frames: int = 1024) -> None:
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self.frame = 0
+        self.tracks: List[MixerTrack] = []
+        self._index: Dict[str, int] = {}
+        self._fades: List[List[Fade]] = []
+        self._commands: Deque[Callable[[], None]] = deque()
+        self._ramp = (np.arange(1, block_frames + 1, dtype=np.float32) / block_frames)[None, :]
+        self._gain = np.zeros(0, dtype=np.float32)
+        self._mix_gain = np.zeros(0, dtype=np.float32)
+        self._fade_level = np.zeros(0, dtype=np.float32)
+        self._signals = np.zeros((0, block_frames), dtype=np.float32)
+        self._scratch = np.zeros((0, block_frames), dtype=np.float32)
+        self._pan = np.zeros((0, 2), dtype=np.float32)
+        self._levels = np.zeros(0, dtype=np.float32)
+        self._outgoing: List[Tuple[int, object]] = []
+        self._swap = np.zeros(block_frames, dtype=np.float32)
+        self._meter = LoudnessMeter(sample_rate, [2])
+        self._metered = np.zeros((2, block_frames), dtype=np.float32)
+        self.normalizer = LoudnessNormalizer()
+        self._norm_gain = np.zeros(0, dtype=np.float32)
+        # Replaced wholesale after every 100 ms hop, so readers on other
+        # threads always see one consistent snapshot.
+        self.loudness = LoudnessReading.silent(1)
+        self.normalization_db = np.zeros(0)
+        self.blocks = 0
+        self._mix_seconds = 0.0
+
+    def add_track(
+        self,
+        name: str,
+        kind: str,
+        source,
+        gain_db: float = 0.0,
+        pan: float = 0.0,
+        normalize: bool = True,
+    ) -> None:
+        def apply() -> None:
+            self.tracks.append(MixerTrack(name, kind, source, gain_db, pan, normalize=normalize))
+            self._index[name] = len(self.tracks) - 1
+            self._fades.append([])
+            count = len(self.tracks)
+            self._signals = np.zeros((count, self.block_frames), dtype=np.float32)
+            self._scratch = np.zeros_like(self._signals)
+            self._pan = np.array([pan_gains(t.pan) for t in self.tracks], dtype=np.float32)
+            self._fade_level = np.append(self._fade_level, np.float32(1.0))
+            self._gain = np.append(self._gain, np.float32(0.0))
+            self._levels = np.zeros(count, dtype=np.float32)
+            self._meter = LoudnessMeter(self.sample_rate, [1] * count + [2])
+            self._metered = np.zeros((count + 2, self.block_frames), dtype=np.float32)
+            self.normalizer.resize([t.normalize for t in self.tracks])
+            self._norm_gain = np.append(self._norm_gain, np.float32(1.0))
+            self.loudness = LoudnessReading.silent(count + 1)
+            self.normalization_db = self.normalizer.gain_db.copy()
+
+        self._commands.append(apply)
+
+    def track(self, name: str) -> MixerTrack:
+        return self.tracks[self._index[name]]
+
+    def replace_source(self, name: str, source) -> None:
+        # The old source is crossfaded out over the next block.
+        def apply() -> None:
+            index = self._index[name]
+            self._outgoing.append((index, self.tracks[index].source))
+            self.tracks[index].source = source
+
+        self._commands.append(apply)
+
+    def enqueue_clip(self, name: str, samples: np.ndarray, start_frame: int) -> None:
+        self.enqueue_sequence([(name, samples)], start_frame)
+
+    def enqueue_sequence(
+        self, clips: List[Tuple[str, np.ndarray]], start_frame: int, gap_frames: int = 0
+    ) -> None:
+        # Clips play back to back from start_frame, or from the next unmixed
+        # frame if that has already passed, so nothing is cut at the head.
+        def apply() -> None:
+            cursor = max(start_frame, self.frame)
+            for name, samples in clips:
+                cursor = self.track(name).source.enqueue(samples, cursor) + gap_frames
+
+        self._commands.append(apply)
+
+    def clear_clips(self, name: str) -> None:
+        self._commands.append(lambda: self.track(name).source.clear())
+
+    def set_gain(self, name: str, gain_db: float) -> None:
+        self._commands.append(lambda: setattr(self.track(name), "gain_db", gain_db))
+
+    def set_pan(self, name: str, pan: float) -> None:
+        def apply() -> None:
+            index = self._index[name]
+            self.tracks[index].pan = pan
+            self._pan[index] = pan_gains(pan)
+
+        self._commands.append(apply)
+
+    def set_mute(self, name: str, muted: bool) -> None:
+        self._commands.append(lambda: setattr(self.track(name), "muted", muted))
+
+    def set_solo(self, name: str, solo: bool) -> None:
+        self._commands.append(lambda: setattr(self.track(name), "solo", solo))
+
+    def fade(
+        self,
+        name: str,
+        to_level: float,
+        start_frame: int,
+        duration_frames: int,
+        key: str = "",
+    ) -> None:
+        self.schedule_fades(name, [(to_level, start_frame, duration_frames)], key)
+
+    def schedule_fades(
+        self, name: str, fades: List[Tuple[float, int, int]], key: str = ""
+    ) -> None:
+        # Keyed fades replace every not-yet-started fade with the same key, so
+        # boundary automation can simply be rescheduled after a replan.
+        def apply() -> None:
+            queued = self._fades[self._index[name]]
+            if key:
+                queued[:] = [f for f in queued if f.key != key or f.start_frame < self.frame]
+            for to_level, start_frame, duration_frames in fades:
+                start = max(start_frame, self.frame)
+                queued.append(Fade(start, start + max(1, duration_frames), to_level, key))
+            queued.sort(key=lambda f: f.start_frame)
+
+        self._commands.append(apply)
+
+    def crossfade(
+        self,
+        out_name: str,
+        in_name: str,
+        start_frame: int,
+        duration_frames: int,
+        out_level: float = 0.0,
+        key: str = "",
+    ) -> None:
+        self.fade(out_name, out_level, start_frame, duration_frames, key)
+        self.fade(in_name, 1.0, start_frame, duration_frames, key)
+
+    def _fade_levels(self, frame: int) -> np.ndarray:
+        levels = self._fade_level.copy()
+        for index, fades in enumerate(self._fades):
+            while fades and fades[0].start_frame < frame:
+                fade = fades[0]
+                if fade.from_level is None:
+                    fade.from_level = float(self._fade_level[index])
+                if frame < fade.end_frame:
+                    levels[index] = fade.level_at(frame)
+                    break
+                self._fade_level[index] = levels[index] = fade.to_level
+                fades.pop(0)
+        return levels
+
+    def _targets(self) -> np.ndarray:
+        soloed = any(track.solo for track in self.tracks)
+        return np.array(
+            [
+                0.0
+                if track.muted or (soloed and not track.solo)
+                else db_to_gain(track.gain_db)
+                for track in self.tracks
+            ],
+            dtype=np.float32,
+        )
+
+    def mix_into(self, out: np.ndarray) -> None:
+        started = time.perf_counter()
+        if self._commands:
+            while self._commands:
+                self._commands.popleft()()
+            self._mix_gain = self._targets()
+        end = self.frame + self.block_frames
+        signals = self._signals
+        for index, track in enumerate(self.tracks):
+            track.source.render(signals[index], self.frame)
+        while self._outgoing:
+            index, source = self._outgoing.pop()
+            source.render(self._swap, self.frame)
+            signals[index] -= self._swap
+            signals[index] *= self._ramp[0]
+            signals[index] += self._swap
+        start = self._gain
+        target = self._mix_gain * self._norm_gain * self._fade_levels(end)
+        if np.array_equal(start, target):
+            np.matmul(signals.T, start[:, None] * self._pan, out=out)
+        else:
+            # A per-block linear ramp from the previous gain to the new one
+            # keeps gain, mute, solo and fade changes free of zipper noise.
+            np.multiply((target - start)[:, None], self._ramp, out=self._scratch)
+            self._scratch += start[:, None]
+            self._scratch *= signals
+            np.matmul(self._scratch.T, self._pan, out=out)
+        self._gain = target
+        squares = np.einsum("tf,tf->t", signals, signals)
+        self._levels = np.sqrt(squares / self.block_frames) * target
+        self._metered[:-2] = signals
+        self._metered[-2:] = out.T
+        hops = self._meter.process(self._metered)
+        if hops:
+            reading = self._meter.reading()
+            gain_db = self.normalizer.update(reading.momentary[:-1], hops * HOP_SECONDS)
+            self._norm_gain = (10.0 ** (gain_db / 20.0)).astype(np.float32)
+            self.normalization_db = gain_db.copy()
+            self.loudness = reading
+        self.frame = end
+        self.blocks += 1
+        self._mix_seconds += time.perf_counter() - started
+
+    def levels_dbfs(self) -> Dict[str, float]:
+        levels = self._levels
+        return {
+            track.name: 20 * math.log10(float(level)) if level > 1e-6 else -120.0
+            for track, level in zip(self.tracks, levels)
+        }
+
+    def track_loudness(self) -> Dict[str, Tuple[float, float, float]]:
+        # name -> (short-term LUFS, true peak dBTP, normalisation gain dB)
+        reading = self.loudness
+        gains = self.normalization_db
+        return {
+            track.name: (
+                float(reading.short_term[index]),
+                float(reading.true_peak[index]),
+                float(gains[index]) if index < len(gains) else 0.0,
+            )
+            for index, track in enumerate(self.tracks)
+            if index < len(reading.short_term) - 1
+        }
+
+    def bus_loudness(self) -> Dict[str, str]:
+        return loudness_summary(self.loudness, programme=-1)
+
+    @property
+    def real_time_factor(self) -> float:
+        audio = self.blocks * self.block_frames / self.sample_rate
+        return self._mix_seconds / audio if audio else 0.0
+
+    def summary(self) -> Dict[str, str]:
+        average_us = self._mix_seconds / self.blocks * 1e6 if self.blocks else 0.0
+        return {
+            "Mixer Tracks": str(len(self.tracks)),
+            "Block Size": f"{self.block_frames} frames",
+            "Avg Mix": f"{average_us:.0f} us/block",
+            "Mix Real-time Factor": f"{self.real_time_factor:.4f}",
+        }
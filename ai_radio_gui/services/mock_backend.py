@@ -1,44 +1,83 @@
 from __future__ import annotations
 
+import math
 import random
-from datetime import datetime, timedelta
+import time
+import wave
+from collections import deque
+from datetime import datetime
+from typing import Callable
 
-from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtCore import QFileSystemWatcher, QObject, Qt, QTimer, pyqtSignal
 
 from ai_radio_gui.models.state import (
     AppState,
+    AudiencePoint,
+    BreakingLatency,
     ConfigState,
-    EventEntry,
-    FeedStatus,
     LogEntry,
     MetricEntry,
+    MountStats,
     ScriptRole,
     SegmentEntry,
     StreamStats,
     TimelineEntry,
     TrackEntry,
 )
+from ai_radio_gui.services.analytics import LISTEN_TIME_LABELS, ListenerAnalytics
+from ai_radio_gui.services.async_runtime import AsyncRuntime
+from ai_radio_gui.services.clustering import EventClusterer
+from ai_radio_gui.services.encoder import ENCODER_PROFILES, EncoderLadder, default_ladder
+from ai_radio_gui.services.dedup import NearDuplicateIndex
+from ai_radio_gui.services.event_store import EventCursor, EventPage, EventStore, StoredEvent
+from ai_radio_gui.services.feed_fetcher import FeedFetcher, PollSummary, load_feed_sources
+from ai_radio_gui.services.feed_parser import FeedItem
+from ai_radio_gui.services.hls import HlsSegmenter
+from ai_radio_gui.services.planner import (
+    PlannedSegment,
+    RundownPlanner,
+    SegmentTemplate,
+    next_hour,
+)
+from ai_radio_gui.services.mixer import ClipSource, LoopSource, Mixer, pad_loop, stinger
+from ai_radio_gui.services.music_library import MusicLibrary
+from ai_radio_gui.services.prompt_templates import PromptRegistry
+from ai_radio_gui.services.ring_buffer import AudioPipeline, PcmRingBuffer
+from ai_radio_gui.services.scheduler_engine import SchedulerEngine
+from ai_radio_gui.services.script_cache import ScriptCache, script_cache_key
+from ai_radio_gui.services.script_generator import (
+    GenerationResult,
+    ScriptGenerator,
+    ScriptRequest,
+)
+from ai_radio_gui.services.stream_server import StreamServer, default_stream_address
+from ai_radio_gui.services.tts import TtsRenderer, read_wav
+from ai_radio_gui.utils.paths import data_dir, data_path, music_dir
 
 
 class MockBackend(QObject):
+    _ingestion_polled = pyqtSignal(object)
+    _script_token = pyqtSignal(int, str)
+    _script_finished = pyqtSignal(int, str, object)
+    _tts_rendered = pyqtSignal(str, object)
+    _library_scanned = pyqtSignal(object)
+    _bed_loaded = pyqtSignal(str, str, object)
+    _encoder_switched = pyqtSignal(str, float)
+    _stream_started = pyqtSignal(object)
+
     def __init__(self, state: AppState, parent=None) -> None:
         super().__init__(parent)
         self.state = state
         self._random = random.Random()
-        self._feed_names = [
-            "Global Wire",
-            "Tech Pulse",
-            "Markets Daily",
-            "Civic Watch",
-            "Science Desk",
-        ]
-        self._segment_titles = [
-            "Top of Hour Headlines",
-            "Market Snapshot",
-            "Tech Briefing",
-            "Weather Update",
-            "Live Reporter Hit",
-            "Deep Dive Interview",
+        self._feed_sources = load_feed_sources(data_path("feeds.txt"))
+        self._segment_templates = [
+            SegmentTemplate("Top of Hour Headlines", 180, 300, priority=10, anchor_offset=0),
+            SegmentTemplate("Market Snapshot", 120, 240, priority=5),
+            SegmentTemplate("Tech Briefing", 180, 360, priority=4),
+            SegmentTemplate("Weather Update", 60, 120, priority=6),
+            SegmentTemplate("Live Reporter Hit", 90, 240, priority=4),
+            SegmentTemplate("Deep Dive Interview", 480, 900, priority=3),
+            SegmentTemplate("Music Bed", 30, 600, priority=1),
         ]
         self._headline_pool = [
             "Global markets stabilize after early turbulence.",
@@ -49,10 +88,10 @@ class MockBackend(QObject):
             "Municipal elections see record turnout.",
         ]
         self._track_catalog = [
-            ("Anchor Voice", "Voice"),
-            ("Ambient Bed", "Music"),
-            ("Breaking SFX", "Effects"),
-            ("Field Reporter", "Voice"),
+            ("Anchor Voice", "Voice", 0.0, 0.0),
+            ("Ambient Bed", "Music", -12.0, 0.0),
+            ("Breaking SFX", "Effects", -6.0, 0.0),
+            ("Field Reporter", "Voice", 0.0, 0.3),
         ]
         self._component_keys = [
             "Ingestion Guardrails",
@@ -70,26 +109,193 @@ class MockBackend(QObject):
             "System Settings",
             "System",
         ]
-        self._scheduler_rundown: list[SegmentEntry] = []
-        self._scheduler_upcoming: list[SegmentEntry] = []
+        # Feed fetch times and segment deadlines share this clock, so
+        # breaking latency is one subtraction on one clock.
+        self._scheduler = SchedulerEngine(clock=time.monotonic)
+        self._planner = RundownPlanner(self._segment_templates)
+        self._published_plan_revision = -1
+        self._breaking_pending: dict[str, tuple[str, float, SegmentTemplate]] = {}
+        self._breaking_aired: set[str] = set()
+        self._breaking_latencies: deque[float] = deque(maxlen=200)
+        self._breaking_violations = 0
         self._scripting_humor = state.scripting_humor
         self._scripting_tone = state.scripting_tone
         self._last_script = ""
         self._last_roles: list[ScriptRole] = []
+        self._script_generator = ScriptGenerator()
+        self._prompts = PromptRegistry(data_dir() / "prompts")
+        self._prompt_watcher = QFileSystemWatcher(self)
+        self._prompt_watcher.fileChanged.connect(self._queue_prompt_reload)
+        self._prompt_watcher.directoryChanged.connect(self._queue_prompt_reload)
+        self._prompt_reload_timer = QTimer(self)
+        self._prompt_reload_timer.setSingleShot(True)
+        self._prompt_reload_timer.setInterval(250)
+        self._prompt_reload_timer.timeout.connect(self._reload_prompts)
+        self._script_cache = ScriptCache(data_dir() / "script_cache")
+        self._script_pending = None
+        self._script_generation = 0
+        self._script_params = (self._scripting_humor, self._scripting_tone)
+        self._script_param_changes = 0
+        self._script_generations_avoided = 0
+        self._script_params_timer = QTimer(self)
+        self._script_params_timer.setSingleShot(True)
+        self._script_params_timer.setInterval(400)
+        self._script_params_timer.timeout.connect(self._apply_script_params)
+        self._script_token.connect(self._on_script_token)
+        self._script_finished.connect(self._finish_script)
+        self._tts = TtsRenderer(data_dir() / "tts_cache")
+        self._stopping = False
+        self._tts_on_air = ""
+        self._tts_air_timer = QTimer(self)
+        self._tts_air_timer.setSingleShot(True)
+        self._tts_air_timer.timeout.connect(self._publish_scheduler)
+        self._tts_rendered.connect(self._finish_tts)
+        # Mixer -> encoder handoff: one second of 48 kHz stereo, kept about
+        # a quarter full.
+        self._audio_buffer = PcmRingBuffer(48000)
+        self._mixer = Mixer(self._audio_buffer.sample_rate, block_frames=1024)
+        for name, kind, gain_db, pan in self._track_catalog:
+            if kind == "Music":
+                source = LoopSource(pad_loop(self._mixer.sample_rate))
+            else:
+                source = ClipSource()
+            self._mixer.add_track(
+                name, kind, source, gain_db, pan, normalize=kind != "Effects"
+            )
+        self._stinger = stinger(self._mixer.sample_rate)
+        self._track_muted: set[str] = set()
+        self._track_solo: set[str] = set()
+        self._encoders = EncoderLadder(
+            default_ladder(), on_switchover=self._encoder_switched.emit
+        )
+        self._encoder_switched.connect(self._finish_encoder_switch)
+        # Each rung is encoded once and fanned out to its own mount.
+        self._analytics = ListenerAnalytics(data_path("audience.sqlite3"))
+        self._stream_server = StreamServer(
+            *default_stream_address(),
+            on_session_start=self._analytics.session_started,
+            on_session_end=self._analytics.session_ended,
+        )
+        for mount, encoder in self._encoders.encoders.items():
+            stream_mount = self._stream_server.add_mount(
+                mount,
+                encoder.content_type,
+                encoder.profile.bitrate_kbps,
+                encoder.framing.samples_per_frame / encoder.profile.sample_rate,
+            )
+            encoder.on_frame = stream_mount.publish
+            encoder.on_header = stream_mount.set_headers
+        self._primary_mount = next(iter(self._encoders.encoders))
+        self._stream_started.connect(self._finish_stream_start)
+        # HLS and the archive are cut from the first AAC rung.
+        hls_encoder = next(
+            (
+                encoder
+                for encoder in self._encoders.encoders.values()
+                if encoder.profile.codec == "aac"
+            ),
+            self._encoders.encoders[self._primary_mount],
+        )
+        framing = hls_encoder.framing
+        self._hls = HlsSegmenter(
+            data_dir() / "hls",
+            framing.samples_per_frame / hls_encoder.profile.sample_rate,
+            extension=".aac" if framing.kind == "adts" else f".{framing.kind}",
+            content_type=framing.content_type,
+            retention_days=self.state.config.retention_days,
+        )
+        publish = hls_encoder.on_frame
+
+        def publish_and_segment(frame: bytes) -> None:
+            publish(frame)
+            self._hls.push(frame)
+
+        hls_encoder.on_frame = publish_and_segment
+        self._stream_server.add_route("/hls/", self._hls.http_get)
+        self._audio_pipeline = AudioPipeline(
+            self._audio_buffer,
+            source=self._mixer.mix_into,
+            sink=self._encoders.write,
+            block_frames=self._mixer.block_frames,
+        )
+        self._buffer_underruns = 0
+        self._library = MusicLibrary(music_dir(), data_path("music_library.sqlite3"))
+        self._library_pending = None
+        self._library_scanned.connect(self._finish_library_scan)
+        self._bed_loaded.connect(self._finish_bed)
+        self._bed_title = ""
+        self._recent_beds: deque[str] = deque(maxlen=5)
         self._audio_ducking = False
         self._audio_fallback = False
-        self._restart_in_progress = False
+        self._runtime = AsyncRuntime()
+        self._feed_fetcher = FeedFetcher(self._feed_sources, clock=self._scheduler.now)
+        self._ingestion_pending = None
+        self._ingestion_polled.connect(self._finish_ingestion)
+        self._dedup_index = NearDuplicateIndex()
+        self._event_store = EventStore(data_path("events.sqlite3"))
+        self._clusterer = EventClusterer(
+            first_event_number=self._event_store.next_event_number()
+        )
+        self._clusterer.restore(
+            self._event_store.open_events(time.time() - self._clusterer.resolve_after_seconds)
+        )
+        self._pending_items: list[FeedItem] = []
 
+    def start(self) -> None:
+        self._runtime.start()
+        self._runtime.submit(self._stream_server.start()).add_done_callback(
+            self._stream_started.emit
+        )
+        self._encoders.start()
+        self._audio_pipeline.start()
         self._init_state()
         self._init_timers()
 
+    def stop(self) -> None:
+        # Nothing that finishes on a worker after this may reach the
+        # backend: timers stop, emits from worker threads become no-ops and
+        # the internal slots are disconnected, which also drops deliveries
+        # already queued on the GUI thread.
+        self._stopping = True
+        self.blockSignals(True)
+        for timer in self.findChildren(QTimer):
+            timer.stop()
+        for watcher in self.findChildren(QFileSystemWatcher):
+            watcher.blockSignals(True)
+        for signal in (
+            self._ingestion_polled,
+            self._script_token,
+            self._script_finished,
+            self._tts_rendered,
+            self._library_scanned,
+            self._bed_loaded,
+            self._encoder_switched,
+            self._stream_started,
+        ):
+            signal.disconnect()
+        try:
+            self._runtime.submit(self._stream_server.stop()).result(timeout=2)
+        except Exception:
+            pass
+        self._runtime.stop()
+        self._audio_pipeline.stop()
+        self._encoders.close()
+        self._hls.close()
+        self._analytics.close()
+        self._tts.close()
+        self._library.close()
+        self._event_store.close()
+
     def _init_state(self) -> None:
+        self._reload_prompts()
         self._update_ingestion()
         self._update_memory()
         self._init_scheduler()
         self._update_scripting()
         self._update_audio()
+        self._rescan_library()
         self._update_streaming()
+        self._update_audience()
         self._update_metrics()
         self._update_component_health()
         self._log("System", "INFO", "Mock backend initialized.")
@@ -103,9 +309,11 @@ class MockBackend(QObject):
         self._memory_timer.timeout.connect(self._update_memory)
         self._memory_timer.start(7000)
 
-        self._scheduler_timer = QTimer(self)
-        self._scheduler_timer.timeout.connect(self._tick_scheduler)
-        self._scheduler_timer.start(1000)
+        self._boundary_timer = QTimer(self)
+        self._boundary_timer.setSingleShot(True)
+        self._boundary_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._boundary_timer.timeout.connect(self._on_segment_boundary)
+        self._arm_boundary_timer()
 
         self._scripting_timer = QTimer(self)
         self._scripting_timer.timeout.connect(self._update_scripting)
@@ -115,10 +323,18 @@ class MockBackend(QObject):
         self._audio_timer.timeout.connect(self._update_audio)
         self._audio_timer.start(1500)
 
+        self._library_timer = QTimer(self)
+        self._library_timer.timeout.connect(self._rescan_library)
+        self._library_timer.start(60000)
+
         self._streaming_timer = QTimer(self)
         self._streaming_timer.timeout.connect(self._update_streaming)
         self._streaming_timer.start(2500)
 
+        self._audience_timer = QTimer(self)
+        self._audience_timer.timeout.connect(self._update_audience)
+        self._audience_timer.start(60000)
+
         self._metrics_timer = QTimer(self)
         self._metrics_timer.timeout.connect(self._update_metrics)
         self._metrics_timer.start(5000)
@@ -146,155 +362,572 @@ class MockBackend(QObject):
         self.state.update_logs(logs)
 
     def _update_ingestion(self) -> None:
-        feeds: list[FeedStatus] = []
-        error_count = 0
-        for name in self._feed_names:
-            status = self._random.choices(
-                ["Healthy", "Lagging", "Error"], weights=[0.7, 0.2, 0.1]
-            )[0]
-            if status == "Error":
-                error_count += 1
-            feeds.append(
-                FeedStatus(
-                    name=name,
-                    status=status,
-                    last_fetch=self._now_short(),
-                    items=self._random.randint(12, 120),
-                )
+        if self._ingestion_pending is not None:
+            return
+        self._ingestion_pending = self._runtime.submit(self._feed_fetcher.poll())
+        self._ingestion_pending.add_done_callback(self._ingestion_polled.emit)
+
+    def _finish_ingestion(self, future) -> None:
+        self._ingestion_pending = None
+        try:
+            summary: PollSummary = future.result()
+        except Exception as exc:
+            self._log("Ingestion", "ERROR", f"Feed polling cycle failed: {exc}")
+            return
+        for name, message in summary.failures.items():
+            self._log("Ingestion", "WARN", f"{name} fetch failed: {message}")
+        duplicates = 0
+        for item in summary.items:
+            result = self._dedup_index.check(
+                f"{item.feed}:{item.guid}", item.title, item.summary
+            )
+            item.duplicate_of = result.duplicate_of
+            if result.duplicate_of is not None:
+                duplicates += 1
+        # Near-duplicates still reach the clusterer so they join the
+        # original's event, but they do not count as reports there.
+        self._pending_items.extend(summary.items)
+        self._publish_guardrails()
+        if duplicates:
+            self._log(
+                "Ingestion Guardrails",
+                "INFO",
+                f"Flagged {duplicates} near-duplicate items; not counted as reports.",
             )
+        error_count = sum(1 for feed in summary.feeds if feed.status == "Error")
         overall = "Degraded" if error_count else "Healthy"
         last_fetch = self._now()
-        self.state.update_ingestion(feeds, last_fetch, overall)
+        self.state.update_ingestion(summary.feeds, last_fetch, overall)
         self.state.update_component_summary(
             "Ingestion",
             overall,
             {
-                "Feeds Active": str(len(feeds)),
+                "Feeds Active": str(len(summary.feeds)),
                 "Errors": str(error_count),
+                "Not Modified": str(summary.not_modified),
+                "Backing Off": str(summary.skipped),
+                "Poll Time": f"{summary.elapsed_seconds:.2f}s",
                 "Last Fetch": last_fetch,
             },
             last_fetch,
         )
         self._log("Ingestion", "INFO", "Feed polling cycle completed.")
+        if summary.items:
+            # Cluster right away instead of waiting for the memory timer, so
+            # a story turning breaking reaches the scheduler within one poll.
+            self._update_memory()
 
     def _update_memory(self) -> None:
-        events: list[EventEntry] = []
-        statuses = []
-        for idx in range(1, 6):
-            status = self._random.choices(
-                ["Breaking", "Ongoing", "Resolved"], weights=[0.2, 0.5, 0.3]
-            )[0]
-            statuses.append(status)
-            title = self._random.choice(self._headline_pool)
-            events.append(
-                EventEntry(
-                    event_id=f"E{idx:03d}",
-                    title=title,
-                    status=status,
-                    timestamp=self._now_short(),
-                    detail=f"{title} Analysts are tracking updates and verifying sources.",
+        now = time.time()
+        items, self._pending_items = self._pending_items, []
+        changed = {cluster.event_id: cluster for cluster in self._clusterer.add_items(items)}
+        changed.update((cluster.event_id, cluster) for cluster in self._clusterer.decay())
+        previous = self._event_store.statuses(changed)
+        self._event_store.upsert_events(
+            [
+                StoredEvent(
+                    event_id=cluster.event_id,
+                    title=cluster.title,
+                    status=cluster.status,
+                    detail=cluster.detail,
+                    updated_at=cluster.updated_at,
+                    item_count=cluster.item_count,
+                    sources="\n".join(sorted(cluster.sources)),
                 )
-            )
-        timeline: list[TimelineEntry] = []
-        for step in range(6):
-            time_stamp = (datetime.now() - timedelta(minutes=step * 3)).strftime(
-                "%H:%M:%S"
-            )
-            timeline.append(
-                TimelineEntry(
-                    timestamp=time_stamp,
-                    description=self._random.choice(self._headline_pool),
+                for cluster in changed.values()
+            ],
+            self._clusterer.next_event_number,
+        )
+        timeline = []
+        for cluster in changed.values():
+            before = previous.get(cluster.event_id)
+            if before is None:
+                timeline.append((now, f"New event {cluster.event_id}: {cluster.title}"))
+            elif before != cluster.status:
+                timeline.append(
+                    (now, f"{cluster.event_id} {before} -> {cluster.status}: {cluster.title}")
                 )
-            )
-        if "Breaking" in statuses:
+        self._event_store.append_timeline(timeline)
+        for cluster in changed.values():
+            if cluster.status == "Breaking":
+                self._preempt_for_breaking(cluster)
+        self._event_store.resolve_stale(now - self._clusterer.resolve_after_seconds, now)
+        self._event_store.prune(now - self.state.config.retention_days * 86400)
+        self._publish_memory()
+        self._log(
+            "Memory",
+            "INFO",
+            f"Event store synchronized: {len(items)} items, {len(changed)} events changed.",
+        )
+
+    def _publish_memory(self) -> None:
+        counts = self._event_store.status_counts()
+        if counts.get("Breaking"):
             memory_status = "Breaking"
-        elif "Ongoing" in statuses:
+        elif counts.get("Ongoing"):
             memory_status = "Monitoring"
         else:
             memory_status = "Stable"
+        events = self._event_store.events_page(limit=50).events
+        timeline = [entry for _, entry in self._event_store.timeline_before(limit=50)]
         last_update = self._now()
         self.state.update_memory(events, timeline, memory_status)
         self.state.update_component_summary(
             "Memory",
             memory_status,
             {
-                "Active Events": str(len(events)),
-                "Timeline Entries": str(len(timeline)),
+                "Stored Events": str(sum(counts.values())),
+                "Active Events": str(counts.get("Breaking", 0) + counts.get("Ongoing", 0)),
+                "Timeline Entries": str(self._event_store.count_timeline()),
+                "Clustered Items": str(self._clusterer.items_processed),
                 "Last Sync": last_update,
             },
             last_update,
         )
-        self._log("Memory", "INFO", "Event store synchronized.")
 
     def _init_scheduler(self) -> None:
-        self._scheduler_rundown = [
-            self._create_segment(offset) for offset in range(3)
-        ]
-        self._scheduler_upcoming = [
-            self._create_segment(offset + 3) for offset in range(4)
+        self._replan()
+        self._publish_scheduler()
+
+    def _fill_rundown(self) -> None:
+        missing = 7 - len(self._scheduler)
+        if missing <= 0:
+            return
+        queued = self._scheduler.segments()
+        if not queued:
+            self._replan()
+            return
+        planned = self._planner.segments_after(queued[-1].segment_id, missing)
+        if planned is None:
+            self._replan(keep=len(queued))
+            return
+        self._scheduler.extend(self._segment_entry(segment) for segment in planned)
+
+    def _replan(
+        self, keep: int = 0, insert: list[SegmentTemplate] | None = None
+    ) -> list[SegmentEntry]:
+        queued = self._scheduler.segments()
+        keep = min(keep, len(queued))
+        # Breaking segments that were queued but have not aired yet survive
+        # the replan and stay ahead of anything else being inserted.
+        carried = [
+            self._breaking_pending.pop(segment.segment_id)
+            for segment in queued[keep:]
+            if segment.segment_id in self._breaking_pending
         ]
-        self.state.update_scheduler(
-            self._scheduler_rundown, self._scheduler_upcoming, False
+        wall_now = time.time()
+        now = self._scheduler.now()
+        start = queued[keep - 1].end_deadline if keep else now
+        wall_start = wall_now + (start - now)
+        boundary = next_hour(wall_now)
+        if keep and wall_start > boundary:
+            # A kept segment pushed past the hour (e.g. by a pause) is cut at
+            # the boundary so the top-of-hour anchor still airs on time.
+            start -= wall_start - boundary
+            wall_start = boundary
+            queued[keep - 1].end_deadline = start
+        planned_start = self._planner.replan(
+            wall_start, [cue[2] for cue in carried] + (insert or [])
         )
+        planned = self._planner.segments_from(planned_start, 7 - keep)
+        placed = [self._segment_entry(segment) for segment in planned]
+        self._scheduler.replace(placed, start + (planned_start - wall_start), keep)
+        for cue in carried:
+            self._track_breaking(placed, cue)
+        return placed
 
-    def _create_segment(self, offset_index: int) -> SegmentEntry:
-        title = self._random.choice(self._segment_titles)
-        duration = self._random.randint(90, 300)
-        start_time = (datetime.now() + timedelta(seconds=duration * offset_index)).strftime(
-            "%H:%M:%S"
-        )
-        return SegmentEntry(
-            title=title,
-            start_time=start_time,
-            duration_seconds=duration,
-            remaining_seconds=duration,
+    def _track_breaking(
+        self, placed: list[SegmentEntry], cue: tuple[str, float, SegmentTemplate]
+    ) -> bool:
+        for segment in placed:
+            if segment.title == cue[2].title and segment.segment_id not in self._breaking_pending:
+                self._breaking_pending[segment.segment_id] = cue
+                return True
+        return False
+
+    def _preempt_for_breaking(self, cluster) -> None:
+        if cluster.event_id in self._breaking_aired:
+            return
+        headline = cluster.title if len(cluster.title) <= 60 else f"{cluster.title[:57]}..."
+        template = SegmentTemplate(f"Breaking: {headline}", 60, 180, priority=10)
+        strict = self.state.config.policy_mode == "Strict"
+        placed = self._replan(keep=0 if strict else 1, insert=[template])
+        if not self._track_breaking(placed, (cluster.event_id, cluster.last_fetched_at, template)):
+            # Retried on the event's next update.
+            self._log(
+                "Scheduling",
+                "WARN",
+                f"Breaking preemption for {cluster.event_id} could not be placed: {headline}",
+            )
+            return
+        self._breaking_aired.add(cluster.event_id)
+        self._arm_boundary_timer()
+        self._publish_scheduler()
+        self._log(
+            "Scheduling",
+            "WARN",
+            f"Breaking preemption for {cluster.event_id} "
+            f"({'interrupting now' if strict else 'at next boundary'}): {headline}",
         )
 
-    def _tick_scheduler(self) -> None:
-        if not self._scheduler_rundown:
-            self._init_scheduler()
+    def _check_breaking_on_air(self) -> None:
+        current = self._scheduler.current()
+        # The head of the queue is either on air or starts within the
+        # sub-second gap left by a replan, so its start deadline is air time.
+        if current is None or current.segment_id not in self._breaking_pending:
+            return
+        event_id, fetched_at, _ = self._breaking_pending.pop(current.segment_id)
+        latency = current.start_deadline - fetched_at
+        if not fetched_at or not math.isfinite(latency) or latency < 0:
+            self._log(
+                "Scheduling",
+                "WARN",
+                f"Breaking {event_id} on air; latency sample {latency:.1f}s discarded.",
+            )
             return
-        if self.state.scheduler_paused:
-            self.state.update_scheduler(
-                self._scheduler_rundown, self._scheduler_upcoming, True
+        slo = self.state.config.breaking_slo_seconds
+        self._breaking_latencies.append(latency)
+        if latency > slo:
+            self._breaking_violations += 1
+        ordered = sorted(self._breaking_latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self.state.update_breaking_latency(
+            BreakingLatency(
+                last_seconds=latency,
+                p95_seconds=p95,
+                samples=len(ordered),
+                violations=self._breaking_violations,
             )
+        )
+        self._log(
+            "Scheduling",
+            "WARN" if latency > slo else "INFO",
+            f"Breaking {event_id} on air {latency:.1f}s after fetch (SLO {slo}s).",
+        )
+
+    @staticmethod
+    def _segment_entry(segment: PlannedSegment) -> SegmentEntry:
+        return SegmentEntry(
+            title=segment.title,
+            start_time="",
+            duration_seconds=segment.duration_seconds,
+            remaining_seconds=segment.duration_seconds,
+            segment_id=segment.segment_id,
+        )
+
+    def _arm_boundary_timer(self) -> None:
+        boundary = self._scheduler.next_boundary()
+        if boundary is None:
+            self._boundary_timer.stop()
             return
-        current = self._scheduler_rundown[0]
-        current.remaining_seconds = max(0, current.remaining_seconds - 1)
-        if current.remaining_seconds == 0:
-            finished = self._scheduler_rundown.pop(0)
-            if self._scheduler_upcoming:
-                self._scheduler_rundown.append(self._scheduler_upcoming.pop(0))
-            self._scheduler_upcoming.append(self._create_segment(len(self._scheduler_upcoming)))
+        delay_ms = max(0, math.ceil((boundary - self._scheduler.now()) * 1000))
+        self._boundary_timer.start(delay_ms)
+
+    def _on_segment_boundary(self) -> None:
+        for finished in self._scheduler.advance():
             self._log("Scheduling", "INFO", f"Segment completed: {finished.title}.")
+        self._fill_rundown()
+        self._publish_scheduler()
+        self._arm_boundary_timer()
+
+    def _publish_scheduler(self) -> None:
+        self._check_breaking_on_air()
+        self._scheduler.update_remaining()
+        segments = self._scheduler.segments()
+        self._schedule_tts(segments)
+        self._schedule_mix(segments)
+        rundown, upcoming = segments[:3], segments[3:]
         last_update = self._now()
-        self.state.update_scheduler(
-            self._scheduler_rundown, self._scheduler_upcoming, False
-        )
+        self.state.update_scheduler(rundown, upcoming, self._scheduler.paused)
+        if self._planner.revision != self._published_plan_revision:
+            self._publish_plan()
         self.state.update_component_summary(
             "Scheduling",
-            "Running",
+            "Paused" if self._scheduler.paused else "Running",
             {
-                "Rundown Segments": str(len(self._scheduler_rundown)),
-                "Upcoming Segments": str(len(self._scheduler_upcoming)),
-                "Last Tick": last_update,
+                "Rundown Segments": str(len(rundown)),
+                "Upcoming Segments": str(len(upcoming)),
+                "Breaking Latency": (
+                    f"{self.state.breaking_latency.last_seconds:.1f}s"
+                    if self.state.breaking_latency.samples
+                    else "n/a"
+                ),
+                "Breaking SLO": f"{self.state.config.breaking_slo_seconds}s",
+                "Last Update": last_update,
             },
             last_update,
         )
 
+    def _segment_script(self, segment: SegmentEntry) -> str:
+        if segment.title == "Music Bed" or not self._last_script:
+            return ""
+        return f"Anchor: Up next, {segment.title}.\n\n{self._last_script}"
+
+    def _mix_frame_at(self, deadline: float) -> int:
+        # The buffer's read position is the frame on air right now.
+        ahead = (deadline - self._scheduler.now()) * self._mixer.sample_rate
+        return self._audio_buffer.read_frames + int(ahead)
+
+    def _schedule_mix(self, segments: list[SegmentEntry]) -> None:
+        # Crossfade the music bed at every queued boundary: full level under
+        # music segments, tucked under speech. Rescheduled on every publish,
+        # so replans and inserts move the fades with them.
+        fade = int(1.5 * self._mixer.sample_rate)
+        now = self._scheduler.now()
+        self._mixer.schedule_fades(
+            "Ambient Bed",
+            [
+                (
+                    0.35 if self._segment_script(segment) else 1.0,
+                    self._mix_frame_at(segment.start_deadline),
+                    fade,
+                )
+                for segment in segments
+                if segment.start_deadline > now
+            ],
+            key="boundary",
+        )
+
+    def _play_segment(self, segment: SegmentEntry) -> None:
+        start = self._mix_frame_at(segment.start_deadline)
+        self._mixer.clear_clips("Anchor Voice")
+        self._mixer.clear_clips("Field Reporter")
+        clips = []
+        for role, path in self._tts.segment_audio(segment.segment_id):
+            try:
+                samples = read_wav(path, self._mixer.sample_rate)
+            except (OSError, EOFError, wave.Error):
+                continue
+            clips.append(("Anchor Voice" if role in ("", "Anchor") else "Field Reporter", samples))
+        if clips:
+            self._mixer.enqueue_sequence(
+                clips, start, gap_frames=int(0.35 * self._mixer.sample_rate)
+            )
+        if segment.title.startswith("Breaking:"):
+            self._mixer.enqueue_clip("Breaking SFX", self._stinger, start)
+        self._pick_bed(segment)
+
+    def _pick_bed(self, segment: SegmentEntry) -> None:
+        # Shortest indexed bed covering the segment, inside the loudness
+        # window for beds and not among the last few used; with an empty
+        # library the built-in pad keeps playing.
+        bed = self._library.pick_bed(
+            segment.duration_seconds, -30.0, -12.0, exclude=list(self._recent_beds)
+        )
+        if bed is None:
+            return
+        self._recent_beds.append(bed.path)
+        future = self._library.load(bed, self._mixer.sample_rate)
+        future.add_done_callback(
+            lambda future, title=bed.title, path=bed.path: self._bed_loaded.emit(
+                title, path, future
+            )
+        )
+
+    def _finish_bed(self, title: str, path: str, future) -> None:
+        try:
+            samples = future.result()
+        except Exception as exc:
+            self._log("Music Library", "WARN", f"Could not load bed {path}: {exc}")
+            return
+        if len(samples) < self._mixer.sample_rate:
+            return
+        self._mixer.replace_source("Ambient Bed", LoopSource(samples))
+        self._bed_title = title
+        self._log("Music Library", "INFO", f"Bed: {title}.")
+        self._publish_library()
+
+    def _rescan_library(self) -> None:
+        if self._library_pending is not None:
+            return
+        self._library_pending = self._library.rescan()
+        self._library_pending.add_done_callback(self._library_scanned.emit)
+        self._publish_library()
+
+    def _finish_library_scan(self, future) -> None:
+        self._library_pending = None
+        try:
+            report = future.result()
+        except Exception as exc:
+            self._log("Music Library", "ERROR", f"Library scan failed: {exc}")
+            return
+        if report.analysed or report.failed or report.removed:
+            self._log(
+                "Music Library",
+                "WARN" if report.failed else "INFO",
+                f"Library scan: {report.analysed} indexed, {report.failed} unreadable,"
+                f" {report.removed} removed, {report.unchanged} unchanged"
+                f" in {report.seconds:.1f}s.",
+            )
+        self._publish_library()
+
+    def _publish_library(self) -> None:
+        self.state.update_component_summary(
+            "Music Library",
+            "Scanning" if self._library.scanning else "Healthy",
+            {
+                **self._library.summary(),
+                "Current Bed": self._bed_title or "Built-in pad",
+            },
+            self._now(),
+        )
+
+    def _schedule_tts(self, segments: list[SegmentEntry]) -> None:
+        self._attach_tts(
+            self._tts.schedule(
+                (segment.segment_id, segment.start_deadline, self._segment_script(segment))
+                for segment in segments
+            )
+        )
+        for segment in segments:
+            segment.tts_status = self._tts.status(segment.segment_id)
+        # The head of the queue is on air or starts within a replan's
+        # sub-second gap. Its speech is held until every sentence is rendered,
+        # for at most a second past its start, and only then handed to the
+        # mixer; anything that has to air incomplete is flagged.
+        current = segments[0] if segments else None
+        if current is not None and current.segment_id != self._tts_on_air:
+            overdue = self._scheduler.now() - current.start_deadline
+            if self._tts.is_ready(current.segment_id) or overdue >= 1.0:
+                self._tts_on_air = current.segment_id
+                if not self._tts.on_air(current.segment_id):
+                    self._log(
+                        "TTS Engine",
+                        "WARN",
+                        f"{current.title} went to air before rendering finished "
+                        f"({current.tts_status}).",
+                    )
+                self._play_segment(current)
+            else:
+                self._tts_air_timer.start(max(0, math.ceil((1.0 - overdue) * 1000)))
+        self._publish_tts()
+
+    def _publish_tts(self) -> None:
+        self.state.update_component_summary(
+            "TTS Engine",
+            "Degraded" if self._tts.lag_seconds() > 0 else "Healthy",
+            self._tts.summary(),
+            self._now(),
+        )
+
+    def _attach_tts(self, submitted) -> None:
+        for key, future in submitted:
+            future.add_done_callback(lambda done, key=key: self._tts_done(key, done))
+
+    def _tts_done(self, key: str, future) -> None:
+        # Runs on a worker thread, possibly after the backend was deleted.
+        if not self._stopping:
+            self._tts_rendered.emit(key, future)
+
+    def _finish_tts(self, key: str, future) -> None:
+        error = self._tts.complete(key, future)
+        if error is not None:
+            self._log("TTS Engine", "ERROR", f"Sentence render failed: {error}")
+        self._publish_scheduler()
+
+    def _publish_plan(self) -> None:
+        plan = self._planner.plan()
+        self._published_plan_revision = self._planner.revision
+        for message in self._planner.take_relaxations():
+            self._log("Scheduling", "WARN", f"Rundown relaxed: {message}.")
+        self.state.update_scheduler_plan(
+            [
+                SegmentEntry(
+                    title=segment.title,
+                    start_time=datetime.fromtimestamp(segment.start).strftime("%a %H:%M:%S"),
+                    duration_seconds=segment.duration_seconds,
+                    remaining_seconds=segment.duration_seconds,
+                    segment_id=segment.segment_id,
+                )
+                for segment in plan
+            ]
+        )
+
+    def _script_headlines(self) -> list[str]:
+        headlines = [
+            event.title
+            for event in self._event_store.events_page(limit=6).events
+            if event.status != "Resolved"
+        ][:3]
+        if len(headlines) < 3:
+            headlines += self._random.sample(self._headline_pool, k=3 - len(headlines))
+        return headlines
+
     def _update_scripting(self) -> None:
-        segments = self._random.sample(self._headline_pool, k=3)
-        script_lines = [
-            f"Anchor: {segments[0]}",
-            f"Analyst: {segments[1]}",
-            f"Reporter: {segments[2]}",
-        ]
-        self._last_script = "\n\n".join(script_lines)
-        self._last_roles = [
-            ScriptRole("Anchor", self._random.randint(4, 7)),
-            ScriptRole("Analyst", self._random.randint(3, 6)),
-            ScriptRole("Reporter", self._random.randint(2, 5)),
-        ]
+        if self._script_pending is not None:
+            return
+        request = ScriptRequest(
+            headlines=self._script_headlines(),
+            humor=self._scripting_humor,
+            tone=self._scripting_tone,
+            policy_mode=self.state.config.policy_mode,
+        )
+        prompt = self._prompts.build(request)
+        request.headlines = prompt.headlines
+        request.messages = prompt.messages
+        self._script_generation += 1
+        generation = self._script_generation
+        self._script_params = (request.humor, request.tone)
+        key = script_cache_key(
+            request, self._prompts.version, self._script_generator.model.name
+        )
+        cached = self._script_cache.get(key)
+        if cached is not None:
+            self._accept_script(cached)
+            self._log("Scripting", "INFO", "Script served from cache.")
+            return
+        self.state.update_scripting(
+            "", self._last_roles, self._scripting_humor, self._scripting_tone, generating=True
+        )
+        self._script_pending = self._runtime.submit(
+            self._script_generator.generate(
+                request, lambda token: self._script_token.emit(generation, token)
+            )
+        )
+        self._script_pending.add_done_callback(
+            lambda future: self._script_finished.emit(generation, key, future)
+        )
+
+    def _on_script_token(self, generation: int, token: str) -> None:
+        if generation == self._script_generation and self._script_pending is not None:
+            self.state.append_script_token(token)
+
+    def _finish_script(self, generation: int, key: str, future) -> None:
+        if generation != self._script_generation:
+            return
+        self._script_pending = None
+        if future.cancelled():
+            self._log("Scripting", "WARN", "Script generation cancelled.")
+            self._publish_script()
+            return
+        try:
+            result: GenerationResult = future.result()
+        except Exception as exc:
+            self._log("Scripting", "ERROR", f"Script generation failed: {exc}")
+            self._publish_script()
+            return
+        self._script_cache.put(key, result.text)
+        self._accept_script(result.text)
+        self._log(
+            "Scripting",
+            "INFO",
+            f"New script generated: {result.tokens} tokens, "
+            f"TTFT {result.first_token_seconds * 1000:.0f} ms, "
+            f"{result.tokens_per_second:.1f} tok/s.",
+        )
+
+    def _accept_script(self, text: str) -> None:
+        self._last_script = text
+        roles: dict[str, int] = {}
+        for line in text.splitlines():
+            role, separator, _ = line.partition(":")
+            if separator and role.strip().isalpha():
+                roles[role.strip()] = roles.get(role.strip(), 0) + 1
+        self._last_roles = [ScriptRole(role, lines) for role, lines in roles.items()]
+        self._publish_script()
+        self._publish_scheduler()
+
+    def _publish_script(self) -> None:
         self.state.update_scripting(
             self._last_script, self._last_roles, self._scripting_humor, self._scripting_tone
         )
@@ -306,19 +939,78 @@ class MockBackend(QObject):
                 "Last Script": last_update,
                 "Roles": str(len(self._last_roles)),
                 "Tone": str(self._scripting_tone),
+                "Generations Avoided": str(self._script_generations_avoided),
+                **self._script_generator.summary(),
+                **self._script_cache.summary(),
             },
             last_update,
         )
-        self._log("Scripting", "INFO", "New script generated.")
+
+    def _queue_prompt_reload(self, _path: str) -> None:
+        # Editors often save in several writes; reload once they settle.
+        self._prompt_reload_timer.start()
+
+    def _reload_prompts(self) -> None:
+        # In-flight generations already carry their rendered messages, so the
+        # registry can be swapped while a script is streaming.
+        version = self._prompts.version
+        errors = self._prompts.load()
+        watched = set(self._prompt_watcher.files() + self._prompt_watcher.directories())
+        paths = [str(self._prompts.directory)] + [
+            str(path) for path in self._prompts.paths() if path.exists()
+        ]
+        missing = [path for path in paths if path not in watched]
+        if missing:
+            self._prompt_watcher.addPaths(missing)
+        for error in errors:
+            self._log("Prompt Templates", "ERROR", f"Template rejected: {error}")
+        if self._prompts.version != version and self._prompts.loads > 1:
+            self._log(
+                "Prompt Templates",
+                "INFO",
+                f"Prompt templates reloaded (version {self._prompts.version}).",
+            )
+        self._publish_prompts()
+
+    def _publish_prompts(self) -> None:
+        self.state.update_component_summary(
+            "Prompt Templates",
+            "Degraded" if self._prompts.load_errors else "Healthy",
+            self._prompts.summary(),
+            self._now(),
+        )
+
+    def cancel_script_generation(self) -> None:
+        if self._script_pending is not None:
+            self._script_pending.cancel()
 
     def _update_audio(self) -> None:
+        levels = self._mixer.levels_dbfs()
+        loudness = self._mixer.track_loudness()
         tracks: list[TrackEntry] = []
-        for name, kind in self._track_catalog:
-            base_level = self._random.randint(40, 90)
+        for name, kind, gain_db, pan in self._track_catalog:
             if kind == "Music" and self._audio_ducking:
-                base_level = int(base_level * 0.6)
-            tracks.append(TrackEntry(name=name, kind=kind, level=base_level))
-        self.state.update_audio(tracks, self._audio_ducking, self._audio_fallback)
+                gain_db -= 10.0
+            level = int(round((levels.get(name, -120.0) + 60.0) / 60.0 * 100))
+            short_term, true_peak, norm_gain_db = loudness.get(name, (-120.0, -120.0, 0.0))
+            tracks.append(
+                TrackEntry(
+                    name=name,
+                    kind=kind,
+                    level=max(0, min(100, level)),
+                    gain_db=gain_db,
+                    pan=pan,
+                    muted=name in self._track_muted,
+                    solo=name in self._track_solo,
+                    loudness_lufs=short_term,
+                    true_peak_dbtp=true_peak,
+                    norm_gain_db=norm_gain_db,
+                )
+            )
+        programme = self._mixer.bus_loudness()
+        self.state.update_audio(
+            tracks, self._audio_ducking, self._audio_fallback, programme
+        )
         last_update = self._now()
         self.state.update_component_summary(
             "Audio",
@@ -326,26 +1018,70 @@ class MockBackend(QObject):
             {
                 "Active Tracks": str(len(tracks)),
                 "Ducking": "Enabled" if self._audio_ducking else "Disabled",
+                **self._mixer.summary(),
+                **{f"Programme {key}": value for key, value in programme.items()},
                 "Last Mix": last_update,
             },
             last_update,
         )
+        self._publish_buffer()
+
+    def _publish_buffer(self) -> None:
+        underruns = self._audio_buffer.underruns
+        status = "Underrun" if underruns > self._buffer_underruns else "Healthy"
+        if underruns > self._buffer_underruns:
+            self._log(
+                "Buffer & Fallback",
+                "WARN",
+                f"Audio buffer underran {underruns - self._buffer_underruns} times.",
+            )
+        self._buffer_underruns = underruns
+        self.state.update_component_summary(
+            "Buffer & Fallback",
+            status,
+            {
+                "Fallback": "Enabled" if self._audio_fallback else "Idle",
+                **self._audio_pipeline.summary(),
+            },
+            self._now(),
+        )
 
     def _update_streaming(self) -> None:
-        if self._restart_in_progress:
-            return
-        status = self._random.choices(
-            ["Live", "Degraded", "Offline"], weights=[0.75, 0.2, 0.05]
-        )[0]
-        bitrate = self._random.randint(96, 256) if status != "Offline" else 0
-        listeners = self._random.randint(18, 140) if status != "Offline" else 0
+        ladder = self._encoders
+        ladder.maintain()
+        self._analytics.sample()
+        server = self._stream_server
+        status = ladder.status if server.listening else "Offline"
+        mounts = []
+        for path, encoder in ladder.encoders.items():
+            mount = server.mounts[path]
+            mounts.append(
+                MountStats(
+                    mount=path,
+                    profile=encoder.profile.name,
+                    status=encoder.status if server.listening else "Offline",
+                    bitrate_kbps=round(encoder.output_kbps()),
+                    listeners=len(mount.listeners),
+                    listener_peak=mount.listener_peak,
+                    encoder_cpu_percent=encoder.cpu_percent or 0.0,
+                    queue_ms=encoder.queue_seconds() * 1000,
+                    url=server.url(path),
+                )
+            )
+        bitrate = sum(mount.bitrate_kbps for mount in mounts)
+        listeners = server.listeners
         stats = StreamStats(
             status=status,
             bitrate_kbps=bitrate,
             listeners=listeners,
-            url="https://stream.ai-news-radio.example/live",
+            url=server.url(self._primary_mount),
+            hls_url=server.url("/hls/live.m3u8"),
+            profile=ladder.encoders[self._primary_mount].profile.name,
+            encoder_cpu_percent=sum(mount.encoder_cpu_percent for mount in mounts),
+            queue_ms=max((mount.queue_ms for mount in mounts), default=0.0),
+            switchover_ms=(ladder.last_switchover_seconds or 0.0) * 1000,
         )
-        self.state.update_streaming(stats)
+        self.state.update_streaming(stats, mounts)
         last_update = self._now()
         self.state.update_component_summary(
             "Streaming",
@@ -354,20 +1090,71 @@ class MockBackend(QObject):
                 "Bitrate": f"{bitrate} kbps",
                 "Listeners": str(listeners),
                 "Endpoint": "Primary",
+                **{
+                    mount.mount: f"{mount.bitrate_kbps} kbps, {mount.listeners} listeners"
+                    for mount in mounts
+                },
             },
             last_update,
         )
+        self.state.update_component_summary(
+            "Streaming Server",
+            "Healthy" if server.listening else "Offline",
+            {**server.summary(), **self._hls.summary()},
+            last_update,
+        )
+        self.state.update_component_summary(
+            "Encoder (FFmpeg)",
+            "Healthy" if status in {"Live", "Switching"} else "Degraded",
+            ladder.summary(),
+            last_update,
+        )
         self._log("Streaming", "INFO", f"Streaming heartbeat: {status}.")
 
+    def _update_audience(self) -> None:
+        analytics = self._analytics
+        now = time.time()
+        hourly = [
+            AudiencePoint(
+                start=rollup.start,
+                uniques=rollup.uniques,
+                sessions=rollup.sessions,
+                peak_concurrent=rollup.peak_concurrent,
+                avg_concurrent=rollup.avg_concurrent,
+                listen_hours=rollup.listen_seconds / 3600,
+            )
+            for rollup in analytics.hourly(now - 7 * 86400)
+        ]
+        today = analytics.daily(now - 86400)
+        histogram = today[-1].histogram if today else [0] * len(LISTEN_TIME_LABELS)
+        self.state.update_audience(
+            hourly, analytics.summary(), list(zip(LISTEN_TIME_LABELS, histogram))
+        )
+
     def _update_metrics(self) -> None:
         metrics = [
             MetricEntry("CPU Usage", self._random.uniform(22, 74), "%", "System"),
             MetricEntry("Memory Usage", self._random.uniform(40, 85), "%", "System"),
             MetricEntry("Ingestion Lag", self._random.uniform(0.2, 4.8), "min", "Ingestion"),
             MetricEntry("Script Queue", self._random.uniform(1, 6), "items", "Scripting"),
-            MetricEntry("Audio Buffer", self._random.uniform(30, 90), "%", "Audio"),
+            MetricEntry("Audio Buffer", self._audio_buffer.fill_ratio * 100, "%", "Audio"),
+            MetricEntry(
+                "Audio Buffer Worst Latency",
+                self._audio_buffer.worst_latency_seconds * 1000,
+                "ms",
+                "Audio",
+            ),
             MetricEntry("Outbound Latency", self._random.uniform(0.5, 2.5), "s", "Streaming"),
         ]
+        if self.state.breaking_latency.samples:
+            metrics.append(
+                MetricEntry(
+                    "Breaking Ingest-to-Air",
+                    self.state.breaking_latency.last_seconds,
+                    "s",
+                    "Scheduling",
+                )
+            )
         self.state.update_metrics(metrics)
         last_update = self._now()
         self.state.update_component_summary(
@@ -381,8 +1168,33 @@ class MockBackend(QObject):
             last_update,
         )
 
+    def _component_publishers(self) -> dict[str, Callable[[], None]]:
+        return {
+            "Ingestion Guardrails": self._publish_guardrails,
+            "Segment Planner": self._publish_planner,
+            "Prompt Templates": self._publish_prompts,
+            "TTS Engine": self._publish_tts,
+            "Music Library": self._publish_library,
+            "Buffer & Fallback": self._publish_buffer,
+            "Encoder (FFmpeg)": self._update_streaming,
+            "Streaming Server": self._update_streaming,
+            "Metrics": self._update_metrics,
+            "Policies": self._publish_policies,
+            "System Settings": self._publish_settings,
+        }
+
     def _update_component_health(self) -> None:
+        # Components backed by a service report that service's own status;
+        # streaming and metrics already refresh on faster timers. Only the
+        # components without a source yet are simulated.
+        publishers = self._component_publishers()
         for key in self._component_keys:
+            if key in {"Encoder (FFmpeg)", "Streaming Server", "Metrics"}:
+                continue
+            publisher = publishers.get(key)
+            if publisher is not None:
+                publisher()
+                continue
             status = self._random.choices(
                 ["Healthy", "Warning", "Degraded"], weights=[0.7, 0.2, 0.1]
             )[0]
@@ -391,29 +1203,83 @@ class MockBackend(QObject):
                 "Throughput": f"{self._random.randint(85, 110)}%",
                 "Queue Depth": str(self._random.randint(0, 12)),
             }
-            if key in {"System Settings", "Policies"}:
-                details.update({"Mode": self.state.config.policy_mode})
             if key == "Audit Trail":
                 details.update({"Entries": str(self._random.randint(120, 220))})
-            if key == "Streaming Server":
-                details.update({"Connections": str(self._random.randint(1, 4))})
-            if key == "Encoder (FFmpeg)":
-                details.update({"Profile": "AAC 128k"})
-            if key == "Buffer & Fallback":
-                details.update(
-                    {"Fallback": "Enabled" if self._audio_fallback else "Idle"}
-                )
             self.state.update_component_summary(key, status, details, self._now())
 
+    def _publish_guardrails(self) -> None:
+        self.state.update_component_summary(
+            "Ingestion Guardrails", "Healthy", self._dedup_index.summary(), self._now()
+        )
+
+    def _publish_planner(self) -> None:
+        summary = self._planner.summary()
+        self.state.update_component_summary(
+            "Segment Planner",
+            "Healthy" if summary["Planned Segments"] != "0" else "Degraded",
+            summary,
+            self._now(),
+        )
+
+    def _publish_policies(self) -> None:
+        self.state.update_component_summary(
+            "Policies",
+            "Healthy",
+            {
+                "Mode": self.state.config.policy_mode,
+                "Breaking SLO": f"{self.state.config.breaking_slo_seconds}s",
+            },
+            self._now(),
+        )
+
+    def _publish_settings(self) -> None:
+        config = self.state.config
+        self.state.update_component_summary(
+            "System Settings",
+            "Healthy",
+            {
+                "Timezone": config.timezone,
+                "Retention": f"{config.retention_days} days",
+                "Policy": config.policy_mode,
+                "Breaking SLO": f"{config.breaking_slo_seconds}s",
+            },
+            self._now(),
+        )
+
+    def query_events(
+        self,
+        status: str | None = None,
+        cursor: EventCursor | None = None,
+        limit: int = 50,
+    ) -> EventPage:
+        return self._event_store.events_page(status, cursor, limit)
+
+    def count_events(self, status: str | None = None) -> int:
+        return self._event_store.count_events(status)
+
+    def query_timeline(
+        self, before_id: int | None = None, limit: int = 200
+    ) -> list[tuple[int, TimelineEntry]]:
+        return self._event_store.timeline_before(before_id, limit)
+
+    def query_timeline_after(
+        self, after_id: int, limit: int = 200
+    ) -> list[tuple[int, TimelineEntry]]:
+        return self._event_store.timeline_after(after_id, limit)
+
     def force_ingestion_refresh(self) -> None:
         self._log("Ingestion", "WARN", "Manual refresh requested.")
         self._update_ingestion()
 
     def toggle_scheduler_pause(self) -> None:
-        paused = not self.state.scheduler_paused
-        self.state.update_scheduler(
-            self._scheduler_rundown, self._scheduler_upcoming, paused
-        )
+        if self._scheduler.paused:
+            self._scheduler.resume()
+            self._replan(keep=1)
+        else:
+            self._scheduler.pause()
+        paused = self._scheduler.paused
+        self._arm_boundary_timer()
+        self._publish_scheduler()
         self._log(
             "Scheduling",
             "WARN" if paused else "INFO",
@@ -421,35 +1287,73 @@ class MockBackend(QObject):
         )
 
     def skip_current_segment(self) -> None:
-        if not self._scheduler_rundown:
+        skipped = self._scheduler.current()
+        if skipped is None:
             return
-        skipped = self._scheduler_rundown.pop(0)
-        if self._scheduler_upcoming:
-            self._scheduler_rundown.append(self._scheduler_upcoming.pop(0))
-        self._scheduler_upcoming.append(self._create_segment(len(self._scheduler_upcoming)))
-        self.state.update_scheduler(
-            self._scheduler_rundown, self._scheduler_upcoming, self.state.scheduler_paused
-        )
+        self._replan()
+        self._arm_boundary_timer()
+        self._publish_scheduler()
         self._log("Scheduling", "WARN", f"Segment skipped: {skipped.title}.")
 
+    def insertable_segments(self) -> list[str]:
+        return self._planner.insertable_titles()
+
+    def insert_segment(self, title: str) -> None:
+        template = self._planner.template(title)
+        if template is None:
+            return
+        self._replan(keep=1, insert=[template])
+        self._arm_boundary_timer()
+        self._publish_scheduler()
+        self._log(
+            "Scheduling",
+            "INFO",
+            f"Segment inserted: {title} "
+            f"(replanned in {self._planner.last_replan_seconds * 1000:.2f} ms).",
+        )
+
     def regenerate_script(self) -> None:
         self._log("Scripting", "INFO", "Manual script regeneration.")
         self._update_scripting()
 
     def set_scripting_humor(self, value: int) -> None:
         self._scripting_humor = value
-        self.state.update_scripting(
-            self._last_script, self._last_roles, self._scripting_humor, self._scripting_tone
-        )
+        self._queue_script_params()
 
     def set_scripting_tone(self, value: int) -> None:
         self._scripting_tone = value
-        self.state.update_scripting(
-            self._last_script, self._last_roles, self._scripting_humor, self._scripting_tone
+        self._queue_script_params()
+
+    def _queue_script_params(self) -> None:
+        # A slider drag emits dozens of values; they are coalesced into one
+        # regeneration once the controls have been still for the interval.
+        self._script_param_changes += 1
+        self._script_params_timer.start()
+
+    def _apply_script_params(self) -> None:
+        changes, self._script_param_changes = self._script_param_changes, 0
+        params = (self._scripting_humor, self._scripting_tone)
+        if params == self._script_params:
+            self._script_generations_avoided += changes
+            self._publish_script()
+            return
+        self._script_generations_avoided += changes - 1
+        if self._script_pending is not None:
+            self._script_pending.cancel()
+            self._script_pending = None
+        self._log(
+            "Scripting",
+            "INFO",
+            f"Regenerating for humor {params[0]}, tone {params[1]} "
+            f"({changes} control changes coalesced).",
         )
+        self._update_scripting()
 
     def toggle_ducking(self) -> None:
         self._audio_ducking = not self._audio_ducking
+        for name, kind, gain_db, _ in self._track_catalog:
+            if kind == "Music":
+                self._mixer.set_gain(name, gain_db - (10.0 if self._audio_ducking else 0.0))
         self._log(
             "Audio",
             "INFO",
@@ -457,6 +1361,26 @@ class MockBackend(QObject):
         )
         self._update_audio()
 
+    def toggle_track_mute(self, name: str) -> None:
+        muted = name not in self._track_muted
+        if muted:
+            self._track_muted.add(name)
+        else:
+            self._track_muted.discard(name)
+        self._mixer.set_mute(name, muted)
+        self._log("Audio", "INFO", f"{name} {'muted' if muted else 'unmuted'}.")
+        self._update_audio()
+
+    def toggle_track_solo(self, name: str) -> None:
+        solo = name not in self._track_solo
+        if solo:
+            self._track_solo.add(name)
+        else:
+            self._track_solo.discard(name)
+        self._mixer.set_solo(name, solo)
+        self._log("Audio", "INFO", f"{name} solo {'on' if solo else 'off'}.")
+        self._update_audio()
+
     def toggle_fallback(self) -> None:
         self._audio_fallback = not self._audio_fallback
         self._log(
@@ -466,28 +1390,67 @@ class MockBackend(QObject):
         )
         self._update_audio()
 
-    def restart_encoder(self) -> None:
-        if self._restart_in_progress:
+    def restart_encoder(self, mount: str | None = None) -> None:
+        if not self._encoders.restart(mount or None):
+            self._log("Streaming", "WARN", "Encoder restart already in progress.")
             return
-        self._restart_in_progress = True
-        self._log("Streaming", "WARN", "Encoder restart initiated.")
-        self.state.update_streaming(
-            StreamStats(
-                status="Restarting",
-                bitrate_kbps=0,
-                listeners=self.state.streaming_stats.listeners,
-                url="https://stream.ai-news-radio.example/live",
-            )
+        self._log(
+            "Streaming", "INFO", f"Warming standby encoder for {mount or 'all mounts'}."
         )
-        QTimer.singleShot(2000, self._finish_restart)
+        self._update_streaming()
+
+    def stream_mounts(self) -> list[str]:
+        return list(self._encoders.encoders)
+
+    def encoder_profiles(self, mount: str) -> list[str]:
+        encoder = self._encoders.encoders.get(mount)
+        if encoder is None:
+            return []
+        # Only profiles a connected listener's decoder can follow.
+        return [
+            name
+            for name, profile in ENCODER_PROFILES.items()
+            if profile.codec == encoder.profile.codec
+        ]
+
+    def set_encoder_profile(self, mount: str, name: str) -> None:
+        encoder = self._encoders.encoders.get(mount)
+        profile = ENCODER_PROFILES.get(name)
+        if encoder is None or profile is None or profile == encoder.profile:
+            return
+        if not self._encoders.set_profile(mount, profile):
+            self._log("Streaming", "WARN", f"Cannot switch {mount} to {name} now.")
+            return
+        self._log("Streaming", "INFO", f"Warming standby encoder for {mount} at {name}.")
+        self._update_streaming()
+
+    def _finish_stream_start(self, future) -> None:
+        try:
+            future.result()
+        except Exception as exc:
+            self._log("Streaming", "ERROR", f"Stream server failed to start: {exc}")
+        else:
+            self._log(
+                "Streaming",
+                "INFO",
+                f"Stream server listening on {self._stream_server.url(self._primary_mount)}.",
+            )
+        self._update_streaming()
 
-    def _finish_restart(self) -> None:
-        self._restart_in_progress = False
-        self._log("Streaming", "INFO", "Encoder restart complete.")
+    def _finish_encoder_switch(self, mount: str, seconds: float) -> None:
+        profile = self._encoders.encoders[mount].profile
+        self._stream_server.mounts[mount].bitrate_kbps = profile.bitrate_kbps
+        self._log(
+            "Streaming",
+            "INFO",
+            f"Switched {mount} to standby encoder ({profile.name}) "
+            f"after {seconds * 1000:.0f} ms warm-up; no gap in output.",
+        )
         self._update_streaming()
 
     def force_stream_refresh(self) -> None:
         self._update_streaming()
+        self._update_audience()
 
     def clear_logs(self) -> None:
         self.state.update_logs([])
@@ -497,23 +1460,17 @@ class MockBackend(QObject):
 
     def apply_config(self, config: ConfigState) -> None:
         self.state.update_config(config)
+        self._hls.retention_days = config.retention_days
         self._log("Configuration", "INFO", "Configuration updated.")
-        self.state.update_component_summary(
-            "System Settings",
-            "Healthy",
-            {
-                "Timezone": config.timezone,
-                "Retention": f"{config.retention_days} days",
-                "Policy": config.policy_mode,
-            },
-            self._now(),
-        )
+        self._publish_settings()
+        self._publish_policies()
 
     def refresh_all(self) -> None:
         self._update_ingestion()
         self._update_memory()
         self._update_scripting()
         self._update_audio()
+        self._rescan_library()
         self._update_streaming()
         self._update_metrics()
         self._update_component_health()
@@ -521,6 +1478,11 @@ class MockBackend(QObject):
 
     def component_action(self, component_key: str, action: str) -> None:
         self._log(component_key, "INFO", f"{action} triggered.")
+        publisher = self._component_publishers().get(component_key)
+        if publisher is not None:
+            # A check on a real component re-reads its actual status.
+            publisher()
+            return
         self.state.update_component_summary(
             component_key,
             "Healthy",
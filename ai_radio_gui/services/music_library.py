@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai_radio_gui.services.loudness import LoudnessMeter
+
+AUDIO_EXTENSIONS = frozenset(
+    {".wav", ".wave", ".mp3", ".flac", ".ogg", ".oga", ".opus", ".m4a", ".aac"}
+)
+_WAV_EXTENSIONS = frozenset({".wav", ".wave"})
+_DECODE_RATE = 48000
+_BLOCK_SECONDS = 10.0
+_TEMPO_SECONDS = 120.0
+_TEMPO_HOP = 512
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    duration REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    loudness_lufs REAL,
+    true_peak_dbtp REAL,
+    tempo_bpm REAL,
+    error TEXT,
+    scanned_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tracks_duration
+    ON tracks (duration, loudness_lufs) WHERE error IS NULL;
+CREATE INDEX IF NOT EXISTS tracks_loudness
+    ON tracks (loudness_lufs, duration) WHERE error IS NULL;
+"""
+
+_COLUMN_NAMES = (
+    "path",
+    "size",
+    "mtime_ns",
+    "title",
+    "duration",
+    "sample_rate",
+    "channels",
+    "loudness_lufs",
+    "true_peak_dbtp",
+    "tempo_bpm",
+    "error",
+    "scanned_at",
+)
+_COLUMNS = ", ".join(_COLUMN_NAMES)
+_PLACEHOLDERS = ", ".join("?" * len(_COLUMN_NAMES))
+
+
+@dataclass
+class LibraryTrack:
+    path: str
+    size: int
+    mtime_ns: int
+    title: str
+    duration: float = 0.0
+    sample_rate: int = 0
+    channels: int = 0
+    loudness_lufs: float = -120.0
+    true_peak_dbtp: float = -120.0
+    tempo_bpm: float = 0.0
+    error: Optional[str] = None
+    scanned_at: float = 0.0
+
+    def row(self) -> tuple:
+        return (
+            self.path,
+            self.size,
+            self.mtime_ns,
+            self.title,
+            self.duration,
+            self.sample_rate,
+            self.channels,
+            self.loudness_lufs,
+            self.true_peak_dbtp,
+            self.tempo_bpm,
+            self.error,
+            self.scanned_at,
+        )
+
+
+@dataclass
+class ScanReport:
+    files: int
+    unchanged: int
+    analysed: int
+    failed: int
+    removed: int
+    seconds: float
+    cancelled: bool = False
+
+
+def _wav_blocks(path: str) -> Tuple[int, int, Iterator[np.ndarray]]:
+    handle = wave.open(path, "rb")
+    rate = handle.getframerate()
+    channels = handle.getnchannels()
+    width = handle.getsampwidth()
+    if width not in (1, 2, 3, 4):
+        handle.close()
+        raise wave.Error(f"unsupported sample width {width}")
+
+    def blocks() -> Iterator[np.ndarray]:
+        with handle:
+            frames = int(rate * _BLOCK_SECONDS)
+            while True:
+                data = handle.readframes(frames)
+                if not data:
+                    return
+                if width == 1:
+                    samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+                elif width == 3:
+                    raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+                    padded = np.zeros((len(raw), 4), dtype=np.uint8)
+                    padded[:, 1:] = raw
+                    samples = padded.view("<i4")[:, 0] / 2147483648.0
+                else:
+                    dtype = "<i2" if width == 2 else "<i4"
+                    samples = np.frombuffer(data, dtype=dtype) / float(2 ** (8 * width - 1))
+                yield samples.astype(np.float32).reshape(-1, channels)
+
+    return rate, channels, blocks()
+
+
+def _ffmpeg_blocks(engine: str, path: str) -> Tuple[int, int, Iterator[np.ndarray]]:
+    channels = 2
+
+    def blocks() -> Iterator[np.ndarray]:
+        process = subprocess.Popen(
+            [engine, "-v", "error", "-nostdin", "-i", path, "-f", "f32le",
+             "-ac", str(channels), "-ar", str(_DECODE_RATE), "-"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        chunk = int(_DECODE_RATE * _BLOCK_SECONDS) * channels * 4
+        try:
+            while True:
+                data = process.stdout.read(chunk)
+                if not data:
+                    break
+                usable = len(data) - len(data) % (channels * 4)
+                yield np.frombuffer(data[:usable], dtype="<f4").reshape(-1, channels)
+        finally:
+            process.stdout.close()
+            error = process.stderr.read().decode("utf-8", "replace").strip()
+            process.stderr.close()
+            if process.wait() != 0:
+                raise RuntimeError(error or f"ffmpeg exited with {process.returncode}")
+
+    return _DECODE_RATE, channels, blocks()
+
+
+def decode_blocks(path: str, engine: Optional[str]) -> Tuple[int, int, Iterator[np.ndarray]]:
+    # Returns (sample_rate, channels, blocks of float32 (frames, channels)).
+    # WAV is read directly; anything else goes through ffmpeg when installed.
+    if Path(path).suffix.lower() in _WAV_EXTENSIONS:
+        try:
+            return _wav_blocks(path)
+        except wave.Error:
+            # Float or extensible WAV that the wave module cannot parse.
+            if not engine:
+                raise
+    if not engine:
+        raise RuntimeError("ffmpeg is not installed")
+    return _ffmpeg_blocks(engine, path)
+
+
+def estimate_tempo(onsets: np.ndarray, frame_rate: float) -> float:
+    # Autocorrelation of the onset-strength envelope, weighted toward
+    # 120 BPM (log-normal prior, one octave wide) to settle half/double
+    # ambiguity. Returns 0 for material with no clear pulse, such as pads:
+    # without energy rises of about 1 dB per hop there is nothing to track.
+    if len(onsets) < frame_rate * 4 or np.percentile(onsets, 99) < 0.2:
+        return 0.0
+    onsets = onsets - onsets.mean()
+    size = 1 << int(math.ceil(math.log2(2 * len(onsets))))
+    spectrum = np.fft.rfft(onsets, size)
+    correlation = np.fft.irfft(spectrum * np.conj(spectrum), size)[: len(onsets)]
+    if correlation[0] <= 0:
+        return 0.0
+    lags = np.arange(int(frame_rate * 60 / 200), int(frame_rate * 60 / 60) + 1)
+    bpm = 60.0 * frame_rate / lags
+    weighted = correlation[lags] * np.exp(-0.5 * np.log2(bpm / 120.0) ** 2)
+    best = int(np.argmax(weighted))
+    if correlation[lags[best]] < 0.1 * correlation[0]:
+        return 0.0
+    lag = float(lags[best])
+    if 0 < best < len(lags) - 1:
+        left, centre, right = correlation[lags[best] - 1 : lags[best] + 2]
+        denominator = left - 2 * centre + right
+        if denominator:
+            lag += 0.5 * (left - right) / denominator
+    return 60.0 * frame_rate / lag
+
+
+def analyze_file(path: str, size: int, mtime_ns: int, engine: Optional[str]) -> LibraryTrack:
+    # Runs in a worker process. Failures are returned, not raised, so one
+    # unreadable file is recorded and skipped on later rescans until it
+    # changes.
+    track = LibraryTrack(path, size, mtime_ns, Path(path).stem, scanned_at=time.time())
+    try:
+        rate, channels, blocks = decode_blocks(path, engine)
+        meter = LoudnessMeter(rate, [channels])
+        frames = 0
+        envelope: List[np.ndarray] = []
+        carry = np.zeros(0, dtype=np.float32)
+        tempo_frames = int(rate * _TEMPO_SECONDS)
+        for block in blocks:
+            meter.process(block.T)
+            if frames < tempo_frames:
+                mono = np.concatenate([carry, block.mean(axis=1)])
+                usable = len(mono) - len(mono) % _TEMPO_HOP
+                hops = mono[:usable].reshape(-1, _TEMPO_HOP)
+                envelope.append(np.einsum("hf,hf->h", hops, hops))
+                carry = mono[usable:]
+            frames += len(block)
+        energy = np.concatenate(envelope) if envelope else np.zeros(0)
+        onsets = np.maximum(np.diff(np.log(energy + 1e-9)), 0.0)
+        track.duration = frames / rate
+        track.sample_rate = rate
+        track.channels = channels
+        track.loudness_lufs = float(meter.integrated()[0])
+        track.true_peak_dbtp = float(meter.true_peak_dbtp()[0])
+        track.tempo_bpm = round(float(estimate_tempo(onsets, rate / _TEMPO_HOP)), 1)
+        if not frames:
+            track.error = "no audio"
+    except Exception as exc:
+        track.error = str(exc) or type(exc).__name__
+    return track
+
+
+def load_audio(
+    path: str, sample_rate: int, engine: Optional[str], max_seconds: float = 120.0
+) -> np.ndarray:
+    rate, _, blocks = decode_blocks(path, engine)
+    limit = int(rate * max_seconds)
+    parts = []
+    frames = 0
+    for block in blocks:
+        parts.append(block[: limit - frames].mean(axis=1))
+        frames += len(parts[-1])
+        if frames >= limit:
+            break
+    samples = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    if rate != sample_rate and len(samples):
+        positions = np.arange(int(len(samples) * sample_rate / rate)) * (rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples.astype(np.float32)
+
+
+class MusicLibrary:
+    # The index is a SQLite table with (duration, loudness) indexes, so bed
+    # picks from the GUI thread are indexed range scans that never wait on a
+    # rescan (WAL lets the scan thread write alongside). Rescans walk the
+    # tree, diff (size, mtime) against the index and analyse only new or
+    # changed files, in worker processes, committing in batches.
+    def __init__(
+        self,
+        root: Path,
+        db_path: Path,
+        workers: Optional[int] = None,
+        engine: Optional[str] = None,
+        batch_size: int = 64,
+    ) -> None:
+        self.root = root
+        self.db_path = db_path
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.engine = engine if engine is not None else shutil.which("ffmpeg")
+        self.batch_size = batch_size
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db = self._connect()
+        self._db.executescript(_SCHEMA)
+        self._threads = ThreadPoolExecutor(max_workers=2, thread_name_prefix="music-library")
+        self._scan: Optional[Future] = None
+        self._stop = threading.Event()
+        self.scanned = 0
+        self.to_scan = 0
+        self.last_report: Optional[ScanReport] = None
+        self.queries = 0
+        self._query_seconds = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.db_path))
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    @property
+    def scanning(self) -> bool:
+        return self._scan is not None and not self._scan.done()
+
+    def rescan(self) -> Future:
+        if not self.scanning:
+            self._stop.clear()
+            self._scan = self._threads.submit(self._run_scan)
+        return self._scan
+
+    def _walk(self) -> Dict[str, Tuple[int, int]]:
+        found: Dict[str, Tuple[int, int]] = {}
+        pending = [str(self.root)]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS:
+                            stat = entry.stat()
+                            found[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        return found
+
+    def _run_scan(self) -> ScanReport:
+        started = time.perf_counter()
+        db = self._connect()
+        try:
+            known = {
+                path: (size, mtime_ns)
+                for path, size, mtime_ns in db.execute("SELECT path, size, mtime_ns FROM tracks")
+            }
+            found = self._walk()
+            removed = [path for path in known if path not in found]
+            changed = [
+                (path, size, mtime_ns)
+                for path, (size, mtime_ns) in found.items()
+                if known.get(path) != (size, mtime_ns)
+            ]
+            with db:
+                db.executemany("DELETE FROM tracks WHERE path = ?", [(path,) for path in removed])
+            self.scanned = 0
+            self.to_scan = len(changed)
+            failed = 0
+            cancelled = False
+            if changed:
+                # Biggest files first so one long track does not finish last
+                # on an otherwise idle pool.
+                changed.sort(key=lambda item: item[1], reverse=True)
+                paths, sizes, mtimes = zip(*changed)
+                executor = ProcessPoolExecutor(
+                    min(self.workers, len(changed)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                batch: List[tuple] = []
+                try:
+                    results = executor.map(
+                        analyze_file, paths, sizes, mtimes, repeat(self.engine), chunksize=2
+                    )
+                    for track in results:
+                        batch.append(track.row())
+                        failed += track.error is not None
+                        self.scanned += 1
+                        if len(batch) >= self.batch_size:
+                            self._store(db, batch)
+                        if self._stop.is_set():
+                            cancelled = True
+                            break
+                    self._store(db, batch)
+                finally:
+                    executor.shutdown(wait=not cancelled, cancel_futures=True)
+            report = ScanReport(
+                files=len(found),
+                unchanged=len(found) - len(changed),
+                analysed=self.scanned - failed,
+                failed=failed,
+                removed=len(removed),
+                seconds=time.perf_counter() - started,
+                cancelled=cancelled,
+            )
+            self.last_report = report
+            return report
+        finally:
+            db.close()
+
+    @staticmethod
+    def _store(db: sqlite3.Connection, batch: List[tuple]) -> None:
+        if not batch:
+            return
+        with db:
+            db.executemany(
+                f"INSERT OR REPLACE INTO tracks ({_COLUMNS}) VALUES ({_PLACEHOLDERS})",
+                batch,
+            )
+        batch.clear()
+
+    def find(
+        self,
+        min_duration: float = 0.0,
+        max_duration: float = math.inf,
+        min_lufs: float = -70.0,
+        max_lufs: float = 0.0,
+        exclude: Sequence[str] = (),
+        limit: int = 20,
+        longest_first: bool = False,
+    ) -> List[LibraryTrack]:
+        started = time.perf_counter()
+        query = (
+            f"SELECT {_COLUMNS} FROM tracks WHERE error IS NULL"
+            " AND duration >= ? AND duration <= ?"
+            " AND loudness_lufs >= ? AND loudness_lufs <= ?"
+        )
+        params: list = [min_duration, min(max_duration, 1e12), min_lufs, max_lufs]
+        if exclude:
+            query += f" AND path NOT IN ({','.join('?' * len(exclude))})"
+            params.extend(exclude)
+        query += f" ORDER BY duration {'DESC' if longest_first else 'ASC'} LIMIT ?"
+        params.append(limit)
+        tracks = [LibraryTrack(*row) for row in self._db.execute(query, params)]
+        self.queries += 1
+        self._query_seconds += time.perf_counter() - started
+        return tracks
+
+    def pick_bed(
+        self,
+        min_duration: float,
+        min_lufs: float,
+        max_lufs: float,
+        exclude: Sequence[str] = (),
+    ) -> Optional[LibraryTrack]:
+        # Shortest bed that covers the segment; failing that the longest one
+        # that fits the loudness window, which the mixer loops.
+        tracks = self.find(min_duration, math.inf, min_lufs, max_lufs, exclude, limit=1)
+        if not tracks:
+            tracks = self.find(
+                0.0, min_duration, min_lufs, max_lufs, exclude, limit=1, longest_first=True
+            )
+        return tracks[0] if tracks else None
+
+    def load(self, track: LibraryTrack, sample_rate: int) -> Future:
+        return self._threads.submit(load_audio, track.path, sample_rate, self.engine)
+
+    def counts(self) -> Tuple[int, int, float]:
+        tracks, failed, seconds = self._db.execute(
+            "SELECT COUNT(*) - COUNT(error), COUNT(error),"
+            " COALESCE(SUM(CASE WHEN error IS NULL THEN duration END), 0) FROM tracks"
+        ).fetchone()
+        return tracks, failed, seconds
+
+    def close(self) -> None:
+        self._stop.set()
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        self._db.close()
+
+    def summary(self) -> Dict[str, str]:
+        tracks, failed, seconds = self.counts()
+        report = self.last_report
+        average_us = self._query_seconds / self.queries * 1e6 if self.queries else 0.0
+        return {
+            "Library Root": str(self.root),
+            "Decoder": "wave + ffmpeg" if self.engine else "wave only",
+            "Indexed Tracks": f"{tracks} ({seconds / 3600:.1f} h)",
+            "Unreadable Files": str(failed),
+            "Scan": f"{self.scanned}/{self.to_scan} analysed" if self.scanning else "Idle",
+            "Last Scan": (
+                f"{report.files} files, {report.analysed} analysed, {report.failed} failed,"
+                f" {report.removed} removed in {report.seconds:.2f}s"
+                if report
+                else "n/a"
+            ),
+            "Avg Query": f"{average_us:.0f} us",
+        }
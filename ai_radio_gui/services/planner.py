@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class SegmentTemplate:
+    title: str
+    min_seconds: int
+    max_seconds: int
+    priority: int = 1
+    anchor_offset: Optional[int] = None
+
+
+@dataclass
+class PlannedSegment:
+    segment_id: str
+    title: str
+    start: float
+    duration_seconds: int
+    anchored: bool = False
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration_seconds
+
+
+def next_hour(timestamp: float) -> int:
+    offset = datetime.fromtimestamp(timestamp).astimezone().utcoffset()
+    local = int(timestamp) + int(offset.total_seconds() if offset else 0)
+    return int(timestamp) - local % 3600 + 3600
+
+
+class RundownPlanner:
+    def __init__(
+        self,
+        templates: Iterable[SegmentTemplate],
+        horizon_hours: int = 24,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.templates = list(templates)
+        self._anchors = sorted(
+            (t for t in self.templates if t.anchor_offset is not None),
+            key=lambda t: t.anchor_offset,
+        )
+        self._flexible = [t for t in self.templates if t.anchor_offset is None]
+        if not self._flexible:
+            raise ValueError("At least one segment template must be unanchored.")
+        self.horizon_hours = horizon_hours
+        self._clock = clock
+        self._credits = [0] * len(self._flexible)
+        self._last_pick = -1
+        self._plan: List[PlannedSegment] = []
+        self._planned_until = 0
+        self._next_number = 1
+        self.revision = 0
+        self.replans = 0
+        self.relaxations = 0
+        self._relaxed: List[str] = []
+        self.last_replan_seconds = 0.0
+
+    def template(self, title: str) -> Optional[SegmentTemplate]:
+        for template in self.templates:
+            if template.title == title:
+                return template
+        return None
+
+    def insertable_titles(self) -> List[str]:
+        return [template.title for template in self._flexible]
+
+    def plan(self) -> List[PlannedSegment]:
+        self._extend()
+        return list(self._plan)
+
+    def segments_from(self, start: float, count: int) -> List[PlannedSegment]:
+        self._extend()
+        return list(islice((s for s in self._plan if s.start >= start), count))
+
+    def segments_after(self, segment_id: str, count: int) -> Optional[List[PlannedSegment]]:
+        self._extend()
+        for index, segment in enumerate(self._plan):
+            if segment.segment_id == segment_id:
+                return self._plan[index + 1 : index + 1 + count]
+        return None
+
+    def replan(self, start: float, insert: Sequence[SegmentTemplate] = ()) -> int:
+        started = time.perf_counter()
+        self._extend()
+        start = int(math.ceil(start - 1e-3))
+        end = next_hour(start)
+        head = [s for s in self._plan if s.end <= start]
+        window, carried = self._plan_window(start, end, insert)
+        if carried:
+            # Inserts that did not fit before the hour air right after its
+            # anchors, so that window is replanned too.
+            following = next_hour(end)
+            window += self._plan_window(end, following, carried, carry=False)[0]
+            end = following
+        tail = [s for s in self._plan if s.start >= end]
+        self._plan = head + window + tail
+        self._planned_until = max(self._planned_until, end)
+        self.revision += 1
+        self.replans += 1
+        self.last_replan_seconds = time.perf_counter() - started
+        return start
+
+    def _extend(self) -> None:
+        now = self._clock()
+        changed = False
+        if not self._plan or self._planned_until <= now:
+            start = int(math.ceil(now))
+            self._planned_until = next_hour(start)
+            self._plan = self._plan_window(start, self._planned_until, ())[0]
+            changed = True
+        limit = now + self.horizon_hours * 3600
+        while self._planned_until < limit:
+            end = next_hour(self._planned_until)
+            self._plan.extend(self._plan_window(self._planned_until, end, ())[0])
+            self._planned_until = end
+            changed = True
+        expired = 0
+        while expired < len(self._plan) and self._plan[expired].end <= now:
+            expired += 1
+        if expired:
+            del self._plan[:expired]
+            changed = True
+        if changed:
+            self.revision += 1
+
+    def _plan_window(
+        self,
+        start: int,
+        end: int,
+        insert: Sequence[SegmentTemplate],
+        carry: bool = True,
+    ) -> Tuple[List[PlannedSegment], List[SegmentTemplate]]:
+        # Returns the window's segments and, with carry, the inserts that
+        # could not be placed at full minimum length before its end.
+        hour = end - 3600
+        stops: List[Tuple[int, Optional[SegmentTemplate]]] = [
+            (hour + anchor.anchor_offset, anchor)
+            for anchor in self._anchors
+            if start <= hour + anchor.anchor_offset < end
+        ]
+        stops.append((end, None))
+        segments: List[PlannedSegment] = []
+        cursor = start
+        leading = list(insert)
+        for at, anchor in stops:
+            if at > cursor:
+                carried: List[SegmentTemplate] = []
+                inserts = [t for t in leading if t.anchor_offset is None]
+                if carry and inserts and sum(t.min_seconds for t in leading) > at - cursor:
+                    # Never cut an insert short to squeeze it in before an
+                    # anchor; it follows the anchor instead.
+                    leading = [t for t in leading if t.anchor_offset is not None]
+                    carried = inserts
+                for template, duration in self._pack(at - cursor, leading):
+                    segments.append(self._segment(template, cursor, duration))
+                    cursor += duration
+                leading = carried
+                cursor = at
+            if anchor is not None:
+                leading.insert(0, anchor)
+        return segments, [t for t in leading if t.anchor_offset is None]
+
+    def _segment(
+        self, template: SegmentTemplate, start: int, duration: int
+    ) -> PlannedSegment:
+        segment = PlannedSegment(
+            segment_id=f"S{self._next_number:06d}",
+            title=template.title,
+            start=float(start),
+            duration_seconds=duration,
+            anchored=template.anchor_offset is not None,
+        )
+        self._next_number += 1
+        return segment
+
+    def _pack(
+        self, gap: int, leading: List[SegmentTemplate]
+    ) -> List[Tuple[SegmentTemplate, int]]:
+        chosen = list(leading)
+        low = sum(t.min_seconds for t in chosen)
+        high = sum(t.max_seconds for t in chosen)
+        while high < gap:
+            template = self._next_flexible()
+            if low + template.min_seconds > gap:
+                template = self._fitting(gap - low, gap - high) or template
+            chosen.append(template)
+            low += template.min_seconds
+            high += template.max_seconds
+        chosen = self._relax(chosen, gap)
+        return list(zip(chosen, self._durations(chosen, gap)))
+
+    def _relax(self, chosen: List[SegmentTemplate], gap: int) -> List[SegmentTemplate]:
+        # When the minimums overrun the gap, drop the lowest-priority
+        # templates (the latest first) until the rest fit, so a high-priority
+        # insert such as Breaking keeps its slot.
+        low = sum(t.min_seconds for t in chosen)
+        if low <= gap:
+            return chosen
+        self.relaxations += 1
+        dropped = set()
+        order = sorted(range(len(chosen)), key=lambda i: (chosen[i].priority, -i))
+        for index in order[:-1]:
+            if low <= gap:
+                break
+            dropped.add(index)
+            low -= chosen[index].min_seconds
+        kept = [t for i, t in enumerate(chosen) if i not in dropped]
+        notes = [f"dropped {chosen[i].title}" for i in sorted(dropped)]
+        if low > gap:
+            notes.append(f"cut {kept[0].title} to {gap}s")
+        self._relaxed.append(f"{gap}s gap: " + ", ".join(notes))
+        return kept
+
+    def take_relaxations(self) -> List[str]:
+        relaxed, self._relaxed = self._relaxed, []
+        return relaxed
+
+    def _next_flexible(self) -> SegmentTemplate:
+        # Smooth weighted round-robin: higher priority airs more often, but
+        # templates stay interleaved instead of running in blocks.
+        total = 0
+        best = -1
+        for index, template in enumerate(self._flexible):
+            self._credits[index] += template.priority
+            total += template.priority
+            if index == self._last_pick and len(self._flexible) > 1:
+                continue
+            if best < 0 or self._credits[index] > self._credits[best]:
+                best = index
+        self._credits[best] -= total
+        self._last_pick = best
+        return self._flexible[best]
+
+    def _fitting(self, room: int, need: int) -> Optional[SegmentTemplate]:
+        candidates = [t for t in self._flexible if t.min_seconds <= room]
+        if not candidates:
+            return None
+        closing = [t for t in candidates if t.max_seconds >= need]
+        if closing:
+            return max(closing, key=lambda t: t.priority)
+        return max(candidates, key=lambda t: t.max_seconds)
+
+    def _durations(self, chosen: List[SegmentTemplate], gap: int) -> List[int]:
+        low = sum(t.min_seconds for t in chosen)
+        if low > gap:
+            # Only a single template longer than the gap is left after _relax.
+            return [gap]
+        durations = [t.min_seconds for t in chosen]
+        capacity = [t.max_seconds - t.min_seconds for t in chosen]
+        total = sum(capacity)
+        slack = gap - low
+        if slack and total:
+            shares = [slack * cap / total for cap in capacity]
+            extra = [int(share) for share in shares]
+            order = sorted(
+                range(len(chosen)), key=lambda i: shares[i] - extra[i], reverse=True
+            )
+            for index in order[: slack - sum(extra)]:
+                extra[index] += 1
+            durations = [d + e for d, e in zip(durations, extra)]
+        return durations
+
+    def summary(self) -> Dict[str, str]:
+        now = self._clock()
+        self._extend()
+        anchor = next((s for s in self._plan if s.anchored and s.start >= now), None)
+        return {
+            "Planned Hours": f"{max(0.0, self._planned_until - now) / 3600:.1f}",
+            "Planned Segments": str(len(self._plan)),
+            "Replans": str(self.replans),
+            "Last Replan": f"{self.last_replan_seconds * 1000:.2f} ms",
+            "Relaxed Fits": str(self.relaxations),
+            "Next Anchor": (
+                datetime.fromtimestamp(anchor.start).strftime("%H:%M:%S") if anchor else "-"
+            ),
+        }
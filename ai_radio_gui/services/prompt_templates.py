@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import string
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from ai_radio_gui.services.script_generator import ScriptRequest
+
+# Approximates BPE token boundaries (words and single punctuation marks), which
+# is close enough for budget checks without shipping a tokenizer.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+TEMPLATE_VARIABLES: Dict[str, FrozenSet[str]] = {
+    "system": frozenset({"humor", "tone", "policy_mode"}),
+    "user": frozenset({"headlines", "count"}),
+    "headline": frozenset({"headline", "index"}),
+}
+
+# Variables a template must use; without them the prompt silently loses the
+# headlines.
+TEMPLATE_REQUIRED: Dict[str, FrozenSet[str]] = {
+    "system": frozenset(),
+    "user": frozenset({"headlines"}),
+    "headline": frozenset({"headline"}),
+}
+
+DEFAULT_TEMPLATES: Dict[str, str] = {
+    "system": (
+        "You write short radio news scripts as alternating lines prefixed with "
+        "'Anchor:', 'Analyst:' or 'Reporter:'. "
+        "Humor {humor}/100, tone {tone}/100 (0 sombre, 100 upbeat), "
+        "editorial policy {policy_mode}.\n"
+    ),
+    "user": "Headlines:\n{headlines}",
+    "headline": "- {headline}\n",
+}
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    name: str
+    source: str
+    # (literal, field, literal token count); field is None for a trailing literal.
+    parts: Tuple[Tuple[str, Optional[str], int], ...]
+    fields: FrozenSet[str]
+    literal_tokens: int
+
+    def render(self, values: Mapping[str, str]) -> str:
+        return "".join(
+            literal + (values[name] if name is not None else "")
+            for literal, name, _ in self.parts
+        )
+
+
+def compile_template(name: str, source: str) -> CompiledTemplate:
+    allowed = TEMPLATE_VARIABLES.get(name)
+    if allowed is None:
+        raise ValueError(f"Unknown prompt template '{name}'.")
+    try:
+        parsed = list(string.Formatter().parse(source))
+    except ValueError as exc:
+        raise ValueError(f"Template '{name}': {exc}.") from exc
+    parts = []
+    fields = set()
+    for literal, field_name, format_spec, conversion in parsed:
+        if field_name is not None:
+            if format_spec or conversion:
+                raise ValueError(
+                    f"Template '{name}': formatting on '{{{field_name}}}' is not supported."
+                )
+            if field_name not in allowed:
+                raise ValueError(
+                    f"Template '{name}': unknown variable '{{{field_name}}}'; "
+                    f"expected one of {', '.join(sorted(allowed))}."
+                )
+            fields.add(field_name)
+        parts.append((literal, field_name, count_tokens(literal)))
+    missing = TEMPLATE_REQUIRED[name] - fields
+    if missing:
+        raise ValueError(
+            f"Template '{name}': missing required variable "
+            + ", ".join(f"'{{{field}}}'" for field in sorted(missing))
+            + "."
+        )
+    return CompiledTemplate(
+        name=name,
+        source=source,
+        parts=tuple(parts),
+        fields=frozenset(fields),
+        literal_tokens=sum(part[2] for part in parts),
+    )
+
+
+@dataclass
+class PromptBuild:
+    messages: List[Dict[str, str]]
+    headlines: List[str]
+    tokens: int
+    dropped: int
+
+
+class PromptRegistry:
+    def __init__(
+        self,
+        directory: Path,
+        max_prompt_tokens: int = 1024,
+        token_cache_size: int = 4096,
+    ) -> None:
+        self.directory = directory
+        self.max_prompt_tokens = max_prompt_tokens
+        self.token_cache_size = token_cache_size
+        self._templates: Dict[str, CompiledTemplate] = {
+            name: compile_template(name, source) for name, source in DEFAULT_TEMPLATES.items()
+        }
+        self._token_counts: OrderedDict[str, int] = OrderedDict()
+        self.version = self._version()
+        self.loads = 0
+        self.load_errors: List[str] = []
+        self.builds = 0
+        self.token_hits = 0
+        self.token_misses = 0
+        self.last_tokens = 0
+        self.last_dropped = 0
+        self._build_seconds = 0.0
+
+    def paths(self) -> List[Path]:
+        return [self.directory / f"{name}.txt" for name in TEMPLATE_VARIABLES]
+
+    def load(self) -> List[str]:
+        # Compile everything first and swap the table in one assignment, so a
+        # script request never sees a half-reloaded set. A template that fails
+        # validation keeps its previous compiled version.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        templates = dict(self._templates)
+        errors = []
+        for name, path in zip(TEMPLATE_VARIABLES, self.paths()):
+            try:
+                source = path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                source = DEFAULT_TEMPLATES[name]
+                try:
+                    path.write_text(source, encoding="utf-8")
+                except OSError:
+                    pass
+            except OSError as exc:
+                errors.append(f"{path.name}: {exc}")
+                continue
+            if source == templates[name].source:
+                continue
+            try:
+                templates[name] = compile_template(name, source)
+            except ValueError as exc:
+                errors.append(str(exc))
+        self._templates = templates
+        self.version = self._version()
+        self.loads += 1
+        self.load_errors = errors
+        return errors
+
+    def _version(self) -> str:
+        digest = hashlib.sha256()
+        for name in TEMPLATE_VARIABLES:
+            digest.update(self._templates[name].source.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()[:12]
+
+    def _count(self, text: str) -> int:
+        count = self._token_counts.get(text)
+        if count is not None:
+            self._token_counts.move_to_end(text)
+            self.token_hits += 1
+            return count
+        self.token_misses += 1
+        count = count_tokens(text)
+        self._token_counts[text] = count
+        if len(self._token_counts) > self.token_cache_size:
+            self._token_counts.popitem(last=False)
+        return count
+
+    def _tokens(self, template: CompiledTemplate, values: Mapping[str, str]) -> int:
+        return template.literal_tokens + sum(
+            self._count(values[name]) for _, name, _ in template.parts if name is not None
+        )
+
+    def build(self, request: ScriptRequest) -> PromptBuild:
+        started = time.perf_counter()
+        templates = self._templates
+        system_values = {
+            "humor": str(request.humor),
+            "tone": str(request.tone),
+            "policy_mode": request.policy_mode,
+        }
+        system = templates["system"]
+        user = templates["user"]
+        headline = templates["headline"]
+        tokens = self._tokens(system, system_values) + self._tokens(
+            user, {"headlines": "", "count": str(len(request.headlines))}
+        )
+        lines = []
+        kept = []
+        for index, text in enumerate(request.headlines, start=1):
+            values = {"headline": text, "index": str(index)}
+            cost = self._tokens(headline, values)
+            if kept and tokens + cost > self.max_prompt_tokens:
+                break
+            tokens += cost
+            lines.append(headline.render(values))
+            kept.append(text)
+        messages = [
+            {"role": "system", "content": system.render(system_values).strip()},
+            {
+                "role": "user",
+                "content": user.render(
+                    {"headlines": "".join(lines), "count": str(len(kept))}
+                ).strip(),
+            },
+        ]
+        self.builds += 1
+        self.last_tokens = tokens
+        self.last_dropped = len(request.headlines) - len(kept)
+        self._build_seconds += time.perf_counter() - started
+        return PromptBuild(messages, kept, tokens, self.last_dropped)
+
+    def summary(self) -> Dict[str, str]:
+        lookups = self.token_hits + self.token_misses
+        average_us = self._build_seconds / self.builds * 1e6 if self.builds else 0.0
+        return {
+            "Templates": str(len(self._templates)),
+            "Version": self.version,
+            "Reloads": str(max(0, self.loads - 1)),
+            "Load Errors": "; ".join(self.load_errors) or "None",
+            "Prompt Tokens": f"{self.last_tokens} / {self.max_prompt_tokens}",
+            "Headlines Dropped": str(self.last_dropped),
+            "Token Cache Hit Rate": f"{self.token_hits / lookups:.1%}" if lookups else "n/a",
+            "Avg Build": f"{average_us:.0f} us",
+        }
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+class PcmRingBuffer:
+    # Single producer, single consumer. Each side only advances its own
+    # monotonically increasing frame counter, and only after the samples are
+    # copied, so neither side needs a lock.
+    def __init__(
+        self,
+        capacity_frames: int,
+        channels: int = 2,
+        sample_rate: int = 48000,
+        dtype=np.float32,
+    ) -> None:
+        self.capacity = capacity_frames
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self._data = np.zeros((capacity_frames, channels), dtype=dtype)
+        self._written = 0
+        self._read = 0
+        self.overruns = 0
+        self.overrun_frames = 0
+        self.underruns = 0
+        self.underrun_frames = 0
+        self.max_fill = 0
+
+    def new_block(self, frames: int) -> np.ndarray:
+        return np.zeros((frames, self.channels), dtype=self._data.dtype)
+
+    @property
+    def read_frames(self) -> int:
+        return self._read
+
+    @property
+    def fill_frames(self) -> int:
+        return self._written - self._read
+
+    @property
+    def free_frames(self) -> int:
+        return self.capacity - self.fill_frames
+
+    @property
+    def fill_ratio(self) -> float:
+        return self.fill_frames / self.capacity
+
+    @property
+    def latency_seconds(self) -> float:
+        return self.fill_frames / self.sample_rate
+
+    @property
+    def worst_latency_seconds(self) -> float:
+        return self.max_fill / self.sample_rate
+
+    def write(self, block: np.ndarray) -> int:
+        written = self._written
+        free = self.capacity - (written - self._read)
+        frames = len(block)
+        if frames > free:
+            self.overruns += 1
+            self.overrun_frames += frames - free
+            frames = free
+        if frames:
+            start = written % self.capacity
+            first = min(frames, self.capacity - start)
+            self._data[start : start + first] = block[:first]
+            if frames > first:
+                self._data[: frames - first] = block[first:frames]
+            self._written = written + frames
+        fill = self._written - self._read
+        if fill > self.max_fill:
+            self.max_fill = fill
+        return frames
+
+    def read_into(self, out: np.ndarray) -> int:
+        read = self._read
+        frames = min(len(out), self._written - read)
+        if frames:
+            start = read % self.capacity
+            first = min(frames, self.capacity - start)
+            out[:first] = self._data[start : start + first]
+            if frames > first:
+                out[first:frames] = self._data[: frames - first]
+            self._read = read + frames
+        if frames < len(out):
+            out[frames:] = 0
+            self.underruns += 1
+            self.underrun_frames += len(out) - frames
+        return frames
+
+
+class AudioPipeline:
+    # The producer keeps the buffer topped up to target_seconds; the consumer
+    # drains one block per block period on a monotonic schedule, standing in
+    # for the real-time pull of an audio device or encoder.
+    def __init__(
+        self,
+        buffer: PcmRingBuffer,
+        source: Callable[[np.ndarray], None],
+        sink: Callable[[np.ndarray], None],
+        block_frames: int = 1024,
+        target_seconds: float = 0.25,
+    ) -> None:
+        self.buffer = buffer
+        self.source = source
+        self.sink = sink
+        self.block_frames = block_frames
+        self.target_frames = min(
+            buffer.capacity, int(target_seconds * buffer.sample_rate)
+        )
+        self.period = block_frames / buffer.sample_rate
+        self.blocks_in = 0
+        self.blocks_out = 0
+        self.late_wakeups = 0
+        self._stop = threading.Event()
+        self._primed = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._produce, name="pcm-producer", daemon=True),
+            threading.Thread(target=self._consume, name="pcm-consumer", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        self._primed.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _produce(self) -> None:
+        block = self.buffer.new_block(self.block_frames)
+        buffer = self.buffer
+        while not self._stop.is_set():
+            if buffer.fill_frames < self.target_frames and buffer.free_frames >= self.block_frames:
+                self.source(block)
+                buffer.write(block)
+                self.blocks_in += 1
+                continue
+            self._primed.set()
+            self._stop.wait(self.period / 2)
+
+    def _consume(self) -> None:
+        block = self.buffer.new_block(self.block_frames)
+        self._primed.wait()
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            self.buffer.read_into(block)
+            self.sink(block)
+            self.blocks_out += 1
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            elif delay < -8 * self.period:
+                # Far behind (suspended process, debugger): resync rather
+                # than bursting the backlog.
+                self.late_wakeups += 1
+                deadline = time.monotonic()
+
+    def summary(self) -> Dict[str, str]:
+        buffer = self.buffer
+        return {
+            "Buffer Fill": f"{buffer.fill_ratio:.0%}",
+            "Buffer Latency": f"{buffer.latency_seconds * 1000:.0f} ms",
+            "Worst Latency": f"{buffer.worst_latency_seconds * 1000:.0f} ms",
+            "Underruns": f"{buffer.underruns} ({buffer.underrun_frames} frames)",
+            "Overruns": f"{buffer.overruns} ({buffer.overrun_frames} frames)",
+            "Blocks Mixed": str(self.blocks_in),
+            "Blocks Encoded": str(self.blocks_out),
+            "Late Wakeups": str(self.late_wakeups),
+        }
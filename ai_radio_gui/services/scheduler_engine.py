@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Iterable, List, Optional
+
+from ai_radio_gui.models.state import SegmentEntry
+
+
+class SchedulerEngine:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._queue: Deque[SegmentEntry] = deque()
+        self._paused_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    def now(self) -> float:
+        return self._clock()
+
+    def segments(self) -> List[SegmentEntry]:
+        return list(self._queue)
+
+    def current(self) -> Optional[SegmentEntry]:
+        return self._queue[0] if self._queue else None
+
+    def extend(self, segments: Iterable[SegmentEntry]) -> None:
+        now = self._clock()
+        for segment in segments:
+            start = self._queue[-1].end_deadline if self._queue else now
+            self._place(segment, start, now)
+            self._queue.append(segment)
+
+    def _place(self, segment: SegmentEntry, start: float, now: float) -> None:
+        segment.start_deadline = start
+        segment.end_deadline = start + segment.duration_seconds
+        segment.remaining_seconds = segment.duration_seconds
+        wall_start = datetime.now() + timedelta(seconds=start - now)
+        segment.start_time = wall_start.strftime("%H:%M:%S")
+
+    def replace(
+        self, segments: Iterable[SegmentEntry], start: float, keep: int = 0
+    ) -> None:
+        while len(self._queue) > keep:
+            self._queue.pop()
+        now = self._clock()
+        for segment in segments:
+            self._place(segment, start, now)
+            start = segment.end_deadline
+            self._queue.append(segment)
+
+    def next_boundary(self) -> Optional[float]:
+        if self.paused or not self._queue:
+            return None
+        return self._queue[0].end_deadline
+
+    def advance(self) -> List[SegmentEntry]:
+        if self.paused:
+            return []
+        now = self._clock()
+        finished: List[SegmentEntry] = []
+        while self._queue and self._queue[0].end_deadline <= now:
+            segment = self._queue.popleft()
+            segment.remaining_seconds = 0
+            finished.append(segment)
+        return finished
+
+    def remaining_seconds(self, segment: SegmentEntry) -> int:
+        now = self._paused_at if self._paused_at is not None else self._clock()
+        if now <= segment.start_deadline:
+            return segment.duration_seconds
+        return max(0, math.ceil(segment.end_deadline - now))
+
+    def update_remaining(self) -> None:
+        current = self.current()
+        if current is not None:
+            current.remaining_seconds = self.remaining_seconds(current)
+
+    def pause(self) -> None:
+        if self._paused_at is None:
+            self._paused_at = self._clock()
+
+    def resume(self) -> None:
+        if self._paused_at is None:
+            return
+        now = self._clock()
+        shift = now - self._paused_at
+        self._paused_at = None
+        for segment in self._queue:
+            segment.start_deadline += shift
+            segment.end_deadline += shift
+        wall_now = datetime.now()
+        for segment in self._queue:
+            wall_start = wall_now + timedelta(seconds=segment.start_deadline - now)
+            segment.start_time = wall_start.strftime("%H:%M:%S")
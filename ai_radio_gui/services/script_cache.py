@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from ai_radio_gui.services.script_generator import ScriptRequest
+
+
+def script_cache_key(request: ScriptRequest, template_version: str, model: str) -> str:
+    payload = json.dumps(
+        [
+            template_version,
+            model,
+            request.headlines,
+            request.humor,
+            request.tone,
+            request.policy_mode,
+        ],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ScriptCache:
+    def __init__(
+        self,
+        directory: Path,
+        max_memory_bytes: int = 2 * 1024 * 1024,
+        max_disk_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_bytes = 0
+        # Disk entries in least-recently-used order, seeded from file mtimes.
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".txt"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        text = self._memory.get(key)
+        if text is not None:
+            self._memory.move_to_end(key)
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.hits += 1
+            return text
+        if key in self._disk:
+            try:
+                text = self._path(key).read_text(encoding="utf-8")
+            except OSError:
+                self._forget_disk(key)
+            else:
+                self._disk.move_to_end(key)
+                try:
+                    os.utime(self._path(key))
+                except OSError:
+                    pass
+                self._remember(key, text)
+                self.hits += 1
+                self.disk_hits += 1
+                return text
+        self.misses += 1
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        data = text.encode("utf-8")
+        path = self._path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._forget_disk(key, unlink=False)
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            oldest = next(iter(self._disk))
+            self._forget_disk(oldest)
+            self.evictions += 1
+
+    def _remember(self, key: str, text: str) -> None:
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key).encode("utf-8"))
+        self._memory[key] = text
+        self._memory_bytes += len(text.encode("utf-8"))
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.encode("utf-8"))
+
+    def _forget_disk(self, key: str, unlink: bool = True) -> None:
+        size = self._disk.pop(key, None)
+        if size is None:
+            return
+        self._disk_bytes -= size
+        if unlink:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> Dict[str, str]:
+        return {
+            "Cache Hit Rate": f"{self.hit_rate:.1%}",
+            "Cache Hits": f"{self.hits} ({self.disk_hits} from disk)",
+            "Cache Misses": str(self.misses),
+            "Cache Entries": f"{len(self._memory)} memory / {len(self._disk)} disk",
+            "Cache Size": f"{self._disk_bytes / 1024:.0f} KiB",
+            "Cache Evictions": str(self.evictions),
+        }
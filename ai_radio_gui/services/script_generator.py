@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Protocol
+
+from ai_radio_gui.services.http_client import HttpClient, HttpError
+
+_TOKEN_RE = re.compile(r"\s*\S+")
+
+
+@dataclass
+class ScriptRequest:
+    headlines: List[str]
+    humor: int
+    tone: int
+    policy_mode: str
+    messages: List[Dict[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class GenerationResult:
+    text: str
+    tokens: int
+    first_token_seconds: float
+    tokens_per_second: float
+
+
+class ScriptModel(Protocol):
+    name: str
+
+    def stream(self, request: ScriptRequest) -> AsyncIterator[str]:
+        ...
+
+
+class OpenAIStreamingModel:
+    def __init__(
+        self,
+        url: str,
+        model: str,
+        api_key: Optional[str] = None,
+        client: Optional[HttpClient] = None,
+        max_tokens: int = 400,
+    ) -> None:
+        self.name = model
+        self.url = url
+        self.api_key = api_key
+        self.max_tokens = max_tokens
+        self._client = client or HttpClient(max_connections_per_host=2)
+
+    async def stream(self, request: ScriptRequest) -> AsyncIterator[str]:
+        body = json.dumps(
+            {
+                "model": self.name,
+                "messages": request.messages,
+                "max_tokens": self.max_tokens,
+                "stream": True,
+            }
+        ).encode()
+        headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        async with self._client.stream("POST", self.url, headers, body) as response:
+            if response.response.status != 200:
+                await response.read()
+                raise HttpError(
+                    f"HTTP {response.response.status} {response.response.reason}".strip()
+                )
+            buffer = b""
+            async for chunk in response.iter_chunks():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        return
+                    choices = json.loads(data).get("choices") or [{}]
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
+
+
+class LocalScriptModel:
+    # In-process stand-in used when no model server is configured; it paces
+    # tokens like a small local model so the streaming path is exercised.
+    name = "local-template"
+
+    def __init__(self, tokens_per_second: float = 40.0, first_token_delay: float = 0.25) -> None:
+        self.tokens_per_second = tokens_per_second
+        self.first_token_delay = first_token_delay
+
+    def _script(self, request: ScriptRequest) -> str:
+        headlines = request.headlines or ["No major stories right now."]
+        if request.tone >= 65:
+            opener = "Good news first:"
+        elif request.tone <= 35:
+            opener = "We begin with a serious story:"
+        else:
+            opener = "Here is what we are following:"
+        roles = ["Anchor", "Analyst", "Reporter"]
+        lines = [f"Anchor: {opener} {headlines[0]}"]
+        for index, headline in enumerate(headlines[1:], start=1):
+            lines.append(f"{roles[index % len(roles)]}: {headline}")
+        if request.humor >= 60:
+            lines.append("Analyst: And yes, the coffee machine is still on strike.")
+        if request.policy_mode == "Strict":
+            lines.append("Anchor: All reports are attributed to their original sources.")
+        lines.append("Anchor: Stay with us for more updates.")
+        return "\n\n".join(lines)
+
+    async def stream(self, request: ScriptRequest) -> AsyncIterator[str]:
+        await asyncio.sleep(self.first_token_delay)
+        interval = 1.0 / self.tokens_per_second
+        for token in _TOKEN_RE.findall(self._script(request)):
+            yield token
+            await asyncio.sleep(interval)
+
+
+def default_script_model() -> ScriptModel:
+    url = os.environ.get("AI_RADIO_LLM_URL")
+    if not url:
+        return LocalScriptModel()
+    return OpenAIStreamingModel(
+        url,
+        os.environ.get("AI_RADIO_LLM_MODEL", "gpt-4o-mini"),
+        api_key=os.environ.get("AI_RADIO_LLM_API_KEY"),
+    )
+
+
+class ScriptGenerator:
+    def __init__(self, model: Optional[ScriptModel] = None, timeout_seconds: float = 60) -> None:
+        self.model = model or default_script_model()
+        self.timeout_seconds = timeout_seconds
+        self.generations = 0
+        self.cancelled = 0
+        self.last_result: Optional[GenerationResult] = None
+
+    async def generate(
+        self, request: ScriptRequest, on_token: Callable[[str], None]
+    ) -> GenerationResult:
+        started = time.perf_counter()
+        first_token = 0.0
+        parts: List[str] = []
+
+        async def consume() -> None:
+            nonlocal first_token
+            async for token in self.model.stream(request):
+                if not parts:
+                    first_token = time.perf_counter()
+                parts.append(token)
+                on_token(token)
+
+        try:
+            await asyncio.wait_for(consume(), self.timeout_seconds)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finished = time.perf_counter()
+        first_token = first_token or finished
+        streaming = finished - first_token
+        result = GenerationResult(
+            text="".join(parts),
+            tokens=len(parts),
+            first_token_seconds=first_token - started,
+            tokens_per_second=(len(parts) - 1) / streaming if streaming > 0 else 0.0,
+        )
+        self.generations += 1
+        self.last_result = result
+        return result
+
+    def summary(self) -> Dict[str, str]:
+        result = self.last_result
+        return {
+            "Model": self.model.name,
+            "Generations": str(self.generations),
+            "Cancelled": str(self.cancelled),
+            "Time to First Token": (
+                f"{result.first_token_seconds * 1000:.0f} ms" if result else "n/a"
+            ),
+            "Tokens/s": f"{result.tokens_per_second:.1f}" if result else "n/a",
+        }
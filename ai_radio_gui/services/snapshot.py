@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import astuple
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QTimer
+
+from ai_radio_gui.models.state import (
+    AppState,
+    EventEntry,
+    FeedStatus,
+    LogEntry,
+    MetricEntry,
+    MountStats,
+    ScriptRole,
+    SegmentEntry,
+    StreamStats,
+    TimelineEntry,
+    TrackEntry,
+)
+from ai_radio_gui.utils.paths import data_path
+
+SNAPSHOT_MAGIC = b"AIRS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_LOG_TAIL = 200
+_HEADER = struct.Struct("<4sHI")
+
+
+def default_snapshot_path() -> Path:
+    return data_path("state.snapshot")
+
+
+def _rows(entries) -> list[tuple]:
+    return [astuple(entry) for entry in entries]
+
+
+def encode_snapshot(state: AppState) -> bytes:
+    payload = {
+        "ingestion": (
+            _rows(state.ingestion_feeds),
+            state.ingestion_last_fetch,
+            state.ingestion_status,
+        ),
+        "memory": (
+            _rows(state.memory_events),
+            _rows(state.memory_timeline),
+            state.memory_status,
+        ),
+        "scheduler": (
+            _rows(state.scheduler_rundown),
+            _rows(state.scheduler_upcoming),
+            state.scheduler_paused,
+        ),
+        "scripting": (
+            state.scripting_last_script,
+            _rows(state.scripting_roles),
+            state.scripting_humor,
+            state.scripting_tone,
+        ),
+        "audio": (_rows(state.audio_tracks), state.audio_ducking, state.audio_fallback),
+        "streaming": astuple(state.streaming_stats),
+        "mounts": _rows(state.stream_mounts),
+        "logs": _rows(state.logs[-SNAPSHOT_LOG_TAIL:]),
+        "metrics": _rows(state.metrics),
+        "components": (
+            dict(state.component_status),
+            {key: dict(value) for key, value in state.component_details.items()},
+            dict(state.component_last_update),
+        ),
+    }
+    body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 1)
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(body)) + body
+
+
+def decode_snapshot(state: AppState, data: bytes) -> None:
+    magic, version, checksum = _HEADER.unpack_from(data)
+    body = data[_HEADER.size :]
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("Unsupported snapshot format.")
+    if zlib.crc32(body) != checksum:
+        raise ValueError("Snapshot checksum mismatch.")
+    payload = json.loads(zlib.decompress(body))
+
+    # Build every value before touching the state, so a malformed snapshot
+    # leaves it untouched rather than half restored.
+    feeds, last_fetch, ingestion_status = payload["ingestion"]
+    feeds = [FeedStatus(*row) for row in feeds]
+    events, timeline, memory_status = payload["memory"]
+    events = [EventEntry(*row) for row in events]
+    timeline = [TimelineEntry(*row) for row in timeline]
+    rundown, upcoming, paused = payload["scheduler"]
+    # Monotonic deadlines are meaningless in a new process; keep the rest.
+    rundown = [SegmentEntry(*row[:5]) for row in rundown]
+    upcoming = [SegmentEntry(*row[:5]) for row in upcoming]
+    script_text, roles, humor, tone = payload["scripting"]
+    roles = [ScriptRole(*row) for row in roles]
+    tracks, ducking, fallback = payload["audio"]
+    tracks = [TrackEntry(*row) for row in tracks]
+    streaming = StreamStats(*payload["streaming"])
+    mounts = [MountStats(*row) for row in payload["mounts"]]
+    logs = [LogEntry(*row) for row in payload["logs"]]
+    metrics = [MetricEntry(*row) for row in payload["metrics"]]
+    statuses, details, last_updates = payload["components"]
+    components = [
+        (key, status, dict(details.get(key, {})), last_updates.get(key, "n/a"))
+        for key, status in statuses.items()
+    ]
+
+    state.update_ingestion(feeds, last_fetch, ingestion_status)
+    state.update_memory(events, timeline, memory_status)
+    state.update_scheduler(rundown, upcoming, paused)
+    state.update_scripting(script_text, roles, humor, tone)
+    state.update_audio(tracks, ducking, fallback)
+    state.update_streaming(streaming, mounts)
+    state.update_logs(logs)
+    state.update_metrics(metrics)
+    for key, status, component_details, last_update in components:
+        state.update_component_summary(key, status, component_details, last_update)
+
+
+def save_snapshot(state: AppState, path: Path) -> None:
+    write_snapshot(encode_snapshot(state), path)
+
+
+def write_snapshot(data: bytes, path: Path) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(state: AppState, path: Path) -> bool:
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return False
+    try:
+        decode_snapshot(state, data)
+    except (ValueError, TypeError, KeyError, AttributeError, struct.error, zlib.error):
+        return False
+    return True
+
+
+class SnapshotWriter(QObject):
+    # The state is encoded on the GUI thread, where it is consistent; the
+    # write and fsync run on a worker so a slow disk never stalls the UI.
+    def __init__(
+        self, state: AppState, path: Path, interval_ms: int = 15000, parent=None
+    ) -> None:
+        super().__init__(parent)
+        self.state = state
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot")
+        self._pending: Future | None = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.save)
+        self._timer.start(interval_ms)
+
+    def save(self) -> None:
+        # Skip a tick while the previous write is still in flight.
+        if self._pending is not None and not self._pending.done():
+            return
+        self._pending = self._executor.submit(self._write, encode_snapshot(self.state))
+
+    def close(self) -> None:
+        # Final snapshot on exit; queued behind any write in flight.
+        self._timer.stop()
+        self._executor.submit(self._write, encode_snapshot(self.state))
+        self._executor.shutdown(wait=True)
+
+    def _write(self, data: bytes) -> None:
+        try:
+            write_snapshot(data, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import ipaddress
+import socket
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+_MAX_REQUEST_BYTES = 8192
+
+# (path below the prefix, query string) -> (body, content type, Cache-Control)
+RouteHandler = Callable[[str, str], Optional[Tuple[bytes, str, str]]]
+# (session key, client id) on join; session key on leave.
+SessionStarted = Callable[[int, str], None]
+SessionEnded = Callable[[int], None]
+
+
+def default_stream_address() -> Tuple[str, int]:
+    return (
+        os.environ.get("AI_RADIO_STREAM_HOST", "127.0.0.1"),
+        int(os.environ.get("AI_RADIO_STREAM_PORT", "8000")),
+    )
+
+
+class FrameRing:
+    # Encoded frames shared by every listener of a mount. One producer (the
+    # encoder's reader thread) fills a slot before advancing head; readers on
+    # the event loop only take frames in [tail, head), and tail stays one
+    # slot clear of the slot being overwritten, so no lock is needed.
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._slots: List[bytes] = [b""] * capacity
+        self.head = 0
+        self.bytes = 0
+
+    @property
+    def tail(self) -> int:
+        return max(0, self.head - self.capacity + 1)
+
+    def append(self, frame: bytes) -> None:
+        index = self.head % self.capacity
+        self.bytes += len(frame) - len(self._slots[index])
+        self._slots[index] = frame
+        self.head += 1
+
+    def frames(self, start: int, end: int) -> List[bytes]:
+        first, last = start % self.capacity, end % self.capacity
+        if end - start <= 0:
+            return []
+        if first < last:
+            return self._slots[first:last]
+        return self._slots[first:] + self._slots[:last]
+
+
+class Mount:
+    def __init__(
+        self,
+        path: str,
+        content_type: str,
+        bitrate_kbps: int,
+        frame_seconds: float = 1024 / 48000,
+        ring_seconds: float = 30.0,
+        burst_seconds: float = 2.0,
+    ) -> None:
+        self.path = path
+        self.content_type = content_type
+        self.bitrate_kbps = bitrate_kbps
+        self.ring = FrameRing(math.ceil(ring_seconds / frame_seconds))
+        self.burst_frames = math.ceil(burst_seconds / frame_seconds)
+        self.listeners: Set[ListenerProtocol] = set()
+        self.listener_peak = 0
+        self.connects = 0
+        self.evicted = 0
+        self.bytes_sent = 0
+        # Stream headers (Ogg) and the ring position they apply from; set
+        # from the encoder thread as one tuple.
+        self._headers: Tuple[int, bytes] = (0, b"")
+        self._burst: Tuple[int, int, bytes] = (-1, -1, b"")
+
+    def publish(self, frame: bytes) -> None:
+        self.ring.append(frame)
+
+    def set_headers(self, headers: bytes) -> None:
+        self._headers = (self.ring.head, headers)
+
+    def burst(self) -> Tuple[int, bytes]:
+        # Listeners connecting within the same flush share one payload. A
+        # late joiner gets the current headers first and no frames from
+        # before them.
+        head = self.ring.head
+        since, headers = self._headers
+        if self._burst[:2] != (head, since):
+            start = max(self.ring.tail, head - self.burst_frames, since)
+            payload = headers + b"".join(self.ring.frames(start, head))
+            self._burst = (head, since, payload)
+        return head, self._burst[2]
+
+
+class ListenerProtocol(asyncio.Protocol):
+    def __init__(self, server: "StreamServer") -> None:
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self.mount: Optional[Mount] = None
+        self.cursor = 0
+        self.paused_since: Optional[float] = None
+        self._request = bytearray()
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+        # A small kernel send buffer keeps per-listener memory bounded and
+        # lets a stalled client reach pause_writing quickly.
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.server.send_buffer_bytes)
+        transport.set_write_buffer_limits(high=self.server.high_water_bytes)
+
+    def data_received(self, data: bytes) -> None:
+        if self.mount is not None or self._request is None:
+            return
+        self._request += data
+        end = self._request.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self._request) > _MAX_REQUEST_BYTES:
+                self.server.respond(self, "431 Request Header Fields Too Large")
+            return
+        head = bytes(self._request[:end]).decode("latin-1")
+        self._request = None
+        self.server.handle_request(self, head)
+
+    def eof_received(self) -> bool:
+        # Players half-close after sending the request; keep streaming.
+        return True
+
+    def pause_writing(self) -> None:
+        self.paused_since = self.server.loop.time()
+
+    def resume_writing(self) -> None:
+        self.paused_since = None
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.mount is not None:
+            self.mount.listeners.discard(self)
+            self.mount = None
+            self.server.end_session(self)
+
+
+class StreamServer:
+    # Icecast-style HTTP server: each mount is encoded once and fanned out to
+    # its listeners. A listener is a cursor into the mount's FrameRing; every
+    # flush_interval the frames between a cursor and head are joined once
+    # and the same payload is written to every listener at that cursor.
+    # Transport flow control gives per-client backpressure: a listener whose
+    # socket backs up is skipped (its cursor stays put) until it drains, and
+    # is evicted once it has stalled for evict_after_seconds or fallen out
+    # of the ring.
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        station_name: str = "AI News Radio",
+        flush_interval: float = 0.1,
+        high_water_bytes: int = 64 * 1024,
+        send_buffer_bytes: int = 64 * 1024,
+        evict_after_seconds: float = 10.0,
+        max_listeners: int = 10000,
+        on_session_start: Optional[SessionStarted] = None,
+        on_session_end: Optional[SessionEnded] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.station_name = station_name
+        self.flush_interval = flush_interval
+        self.high_water_bytes = high_water_bytes
+        self.send_buffer_bytes = send_buffer_bytes
+        self.evict_after_seconds = evict_after_seconds
+        self.max_listeners = max_listeners
+        self.on_session_start = on_session_start
+        self.on_session_end = on_session_end
+        self.mounts: Dict[str, Mount] = {}
+        self.routes: Dict[str, RouteHandler] = {}
+        self.route_requests = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.rejected = 0
+        self.last_flush_seconds = 0.0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def add_mount(
+        self, path: str, content_type: str, bitrate_kbps: int, frame_seconds: float = 1024 / 48000
+    ) -> Mount:
+        mount = Mount(path, content_type, bitrate_kbps, frame_seconds)
+        self.mounts[path] = mount
+        return mount
+
+    def add_route(self, prefix: str, handler: RouteHandler) -> None:
+        # Handlers may touch the disk, so they run in the loop's executor.
+        self.routes[prefix] = handler
+
+    def url(self, path: str) -> str:
+        return f"http://{self.host}:{self.port}{path}"
+
+    @property
+    def listening(self) -> bool:
+        return self._server is not None
+
+    @property
+    def listeners(self) -> int:
+        return sum(len(mount.listeners) for mount in self.mounts.values())
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._server = await self.loop.create_server(
+            lambda: ListenerProtocol(self),
+            self.host,
+            self.port,
+            reuse_address=True,
+            backlog=1024,
+        )
+        self._flusher = self.loop.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for mount in self.mounts.values():
+            for listener in list(mount.listeners):
+                listener.mount = None
+                self.end_session(listener)
+                listener.transport.abort()
+            mount.listeners.clear()
+
+    def handle_request(self, listener: ListenerProtocol, head: str) -> None:
+        request_line = head.split("\r\n", 1)[0].split()
+        if len(request_line) < 2:
+            self.respond(listener, "400 Bad Request")
+            return
+        method = request_line[0]
+        path, _, query = request_line[1].partition("?")
+        if method not in {"GET", "HEAD"}:
+            self.respond(listener, "405 Method Not Allowed")
+            return
+        for prefix, handler in self.routes.items():
+            if path.startswith(prefix):
+                self.route_requests += 1
+                self.loop.create_task(
+                    self._serve_route(listener, handler, path[len(prefix) :], query, method)
+                )
+                return
+        if path == "/status-json.xsl":
+            self.respond(listener, "200 OK", json.dumps(self.icestats()).encode(), "application/json")
+            return
+        mount = self.mounts.get(path)
+        if mount is None:
+            self.respond(listener, "404 Not Found")
+            return
+        if self.listeners >= self.max_listeners:
+            self.rejected += 1
+            self.respond(listener, "503 Service Unavailable")
+            return
+        headers = (
+            "HTTP/1.0 200 OK\r\n"
+            f"Content-Type: {mount.content_type}\r\n"
+            f"icy-name: {self.station_name}\r\n"
+            f"icy-br: {mount.bitrate_kbps}\r\n"
+            "icy-pub: 0\r\n"
+            "Cache-Control: no-cache, no-store\r\n"
+            "Connection: close\r\n"
+            "Server: ai-radio-stream\r\n\r\n"
+        ).encode("latin-1")
+        if method == "HEAD":
+            listener.transport.write(headers)
+            listener.transport.close()
+            return
+        head_frame, burst = mount.burst()
+        listener.transport.writelines([headers, burst])
+        listener.cursor = head_frame
+        listener.mount = mount
+        mount.listeners.add(listener)
+        mount.connects += 1
+        mount.bytes_sent += len(burst)
+        mount.listener_peak = max(mount.listener_peak, len(mount.listeners))
+        if self.on_session_start is not None:
+            self.on_session_start(id(listener), self.client_id(listener, head))
+
+    @staticmethod
+    def client_id(listener: ListenerProtocol, head: str) -> str:
+        # Address plus User-Agent, as Icecast-style stats count listeners.
+        # X-Forwarded-For is only trusted from a reverse proxy on this host.
+        peer = listener.transport.get_extra_info("peername")
+        address = peer[0] if peer else ""
+        headers = {}
+        for line in head.split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        forwarded = headers.get("x-forwarded-for", "").split(",")[0].strip()
+        try:
+            if forwarded and ipaddress.ip_address(address).is_loopback:
+                address = forwarded
+        except ValueError:
+            pass
+        return f"{address}|{headers.get('user-agent', '')}"
+
+    def end_session(self, listener: ListenerProtocol) -> None:
+        if self.on_session_end is not None:
+            self.on_session_end(id(listener))
+
+    async def _serve_route(
+        self,
+        listener: ListenerProtocol,
+        handler: RouteHandler,
+        path: str,
+        query: str,
+        method: str,
+    ) -> None:
+        result = await self.loop.run_in_executor(None, handler, path, query)
+        if listener.transport.is_closing():
+            return
+        if result is None:
+            self.respond(listener, "404 Not Found")
+            return
+        body, content_type, cache_control = result
+        self.respond(
+            listener,
+            "200 OK",
+            body,
+            content_type,
+            cache_control=cache_control,
+            include_body=method != "HEAD",
+        )
+
+    @staticmethod
+    def respond(
+        listener: ListenerProtocol,
+        status: str,
+        body: bytes = b"",
+        content_type: str = "text/plain",
+        cache_control: str = "no-cache",
+        include_body: bool = True,
+    ) -> None:
+        body = body or status.encode("latin-1")
+        listener.transport.write(
+            (
+                f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nCache-Control: {cache_control}\r\n"
+                "Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n"
+            ).encode("latin-1")
+            + (body if include_body else b"")
+        )
+        listener.transport.close()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            started = self.loop.time()
+            for mount in self.mounts.values():
+                self._flush(mount)
+            self.last_flush_seconds = self.loop.time() - started
+
+    def _flush(self, mount: Mount) -> None:
+        ring = mount.ring
+        head, tail = ring.head, ring.tail
+        now = self.loop.time()
+        payloads: Dict[int, bytes] = {}
+        for listener in list(mount.listeners):
+            if listener.cursor < tail or (
+                listener.paused_since is not None
+                and now - listener.paused_since > self.evict_after_seconds
+            ):
+                mount.listeners.discard(listener)
+                mount.evicted += 1
+                listener.transport.abort()
+                continue
+            if (
+                listener.paused_since is not None
+                or listener.cursor == head
+                or listener.transport.is_closing()
+            ):
+                continue
+            payload = payloads.get(listener.cursor)
+            if payload is None:
+                payload = payloads[listener.cursor] = b"".join(ring.frames(listener.cursor, head))
+            listener.transport.write(payload)
+            listener.cursor = head
+            mount.bytes_sent += len(payload)
+
+    def icestats(self) -> Dict[str, object]:
+        return {
+            "icestats": {
+                "server_id": "ai-radio-stream",
+                "source": [
+                    {
+                        "listenurl": self.url(mount.path),
+                        "server_name": self.station_name,
+                        "server_type": mount.content_type,
+                        "bitrate": mount.bitrate_kbps,
+                        "listeners": len(mount.listeners),
+                        "listener_peak": mount.listener_peak,
+                    }
+                    for mount in self.mounts.values()
+                ],
+            }
+        }
+
+    def summary(self) -> Dict[str, str]:
+        mounts = list(self.mounts.values())
+        return {
+            "Address": f"{self.host}:{self.port}" if self.listening else "Not listening",
+            "Mounts": ", ".join(mount.path for mount in mounts) or "None",
+            "Listeners": str(self.listeners),
+            "Listener Peak": str(sum(mount.listener_peak for mount in mounts)),
+            "Connects": str(sum(mount.connects for mount in mounts)),
+            "Evicted": str(sum(mount.evicted for mount in mounts)),
+            "Rejected": str(self.rejected),
+            "HTTP Requests": str(self.route_requests),
+            "Sent": f"{sum(mount.bytes_sent for mount in mounts) / 1e6:.1f} MB",
+            "Frame Ring": f"{sum(mount.ring.bytes for mount in mounts) / 1024:.0f} KiB",
+            "Flush Time": f"{self.last_flush_seconds * 1000:.1f} ms",
+        }
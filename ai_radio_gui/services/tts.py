@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+DEFAULT_VOICES: Dict[str, str] = {
+    "Anchor": "en-us",
+    "Analyst": "en-gb",
+    "Reporter": "en-us+f3",
+}
+
+
+def tts_key(text: str, voice: str) -> str:
+    return hashlib.sha256(f"{voice}\0{text}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Utterance:
+    role: str
+    voice: str
+    text: str
+    key: str
+
+
+def split_utterances(
+    script: str, voices: Dict[str, str], default_voice: str
+) -> List[Utterance]:
+    utterances = []
+    for line in script.splitlines():
+        line = line.strip()
+        role, separator, body = line.partition(":")
+        if separator and role.strip().isalpha():
+            role = role.strip()
+        else:
+            role, body = "", line
+        voice = voices.get(role, default_voice)
+        for sentence in _SENTENCE_RE.split(body.strip()):
+            sentence = sentence.strip()
+            if sentence:
+                utterances.append(Utterance(role, voice, sentence, tts_key(sentence, voice)))
+    return utterances
+
+
+def _placeholder_speech(text: str, voice: str, sample_rate: int) -> np.ndarray:
+    # Speech-shaped stand-in used when espeak-ng is not installed: a voiced
+    # harmonic stack with syllable envelopes, paced at about 150 words/min.
+    rng = np.random.default_rng(int(tts_key(text, voice)[:16], 16))
+    seconds = 0.3 + len(text.split()) / 2.5
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    base = 95.0 + int(hashlib.md5(voice.encode()).hexdigest(), 16) % 120
+    pitch = base * (1.0 + 0.08 * np.sin(2 * np.pi * 0.4 * t + rng.uniform(0, np.pi)))
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 9))
+    syllables = np.clip(np.sin(np.pi * rng.uniform(3.5, 4.5) * t), 0.0, None) ** 2
+    samples = 0.25 * voiced * syllables
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def render_sentence(
+    engine: Optional[str], text: str, voice: str, path: str, sample_rate: int
+) -> Tuple[float, float]:
+    started = time.perf_counter()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if engine:
+        # Text goes in on stdin so a sentence starting with "-" is never
+        # parsed as an option.
+        result = subprocess.run(
+            [engine, "-v", voice, "--stdout", "--stdin"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            check=True,
+            timeout=60,
+        )
+        with open(tmp_path, "wb") as handle:
+            handle.write(result.stdout)
+    else:
+        samples = _placeholder_speech(text, voice, sample_rate)
+        with wave.open(tmp_path, "wb") as handle:
+            handle.setnchannels(1)
+            handle.setsampwidth(2)
+            handle.setframerate(sample_rate)
+            handle.writeframes(samples.tobytes())
+    with wave.open(tmp_path, "rb") as handle:
+        audio_seconds = handle.getnframes() / handle.getframerate()
+    os.replace(tmp_path, path)
+    return audio_seconds, time.perf_counter() - started
+
+
+def read_wav(path: Path, sample_rate: int) -> np.ndarray:
+    with wave.open(str(path), "rb") as handle:
+        rate = handle.getframerate()
+        channels = handle.getnchannels()
+        data = np.frombuffer(handle.readframes(handle.getnframes()), dtype="<i2")
+    samples = data.reshape(-1, channels).mean(axis=1) / 32768.0
+    if rate != sample_rate and len(samples):
+        positions = np.arange(int(len(samples) * sample_rate / rate)) * (rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples.astype(np.float32)
+
+
+@dataclass
+class SegmentRender:
+    segment_id: str
+    deadline: float
+    keys: List[str]
+    ready_at: Optional[float] = None
+    aired_unrendered: bool = False
+    roles: List[str] = field(default_factory=list)
+
+
+class TtsRenderer:
+    # Sentences are rendered in worker processes, soonest air time first, and
+    # stored as WAV files named by a hash of text and voice so repeated lines
+    # and unchanged scripts never render twice.
+    def __init__(
+        self,
+        directory: Path,
+        voices: Optional[Dict[str, str]] = None,
+        default_voice: str = "en-us",
+        workers: Optional[int] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        sample_rate: int = 22050,
+        engine: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.voices = dict(DEFAULT_VOICES if voices is None else voices)
+        self.default_voice = default_voice
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.max_inflight = self.workers * 2
+        self.max_disk_bytes = max_disk_bytes
+        self.sample_rate = sample_rate
+        self.engine = engine if engine is not None else shutil.which("espeak-ng")
+        self._clock = clock
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._rendered: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._queue: Dict[str, Tuple[float, Utterance]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._segments: Dict[str, SegmentRender] = {}
+        self.rendered = 0
+        self.failures = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.aired_unrendered = 0
+        self._audio_seconds = 0.0
+        self._render_seconds = 0.0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".wav"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._rendered[key] = size
+            self._disk_bytes += size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.wav"
+
+    def segment_audio(self, segment_id: str) -> List[Tuple[str, Path]]:
+        render = self._segments.get(segment_id)
+        if render is None:
+            return []
+        return [
+            (role, self._path(key))
+            for role, key in zip(render.roles, render.keys)
+            if key in self._rendered
+        ]
+
+    def schedule(self, jobs: Iterable[Tuple[str, float, str]]) -> List[Tuple[str, Future]]:
+        now = self._clock()
+        queue: Dict[str, Tuple[float, Utterance]] = {}
+        segments: Dict[str, SegmentRender] = {}
+        for segment_id, deadline, script in jobs:
+            utterances = split_utterances(script, self.voices, self.default_voice)
+            keys = [utterance.key for utterance in utterances]
+            render = SegmentRender(
+                segment_id, deadline, keys, roles=[utterance.role for utterance in utterances]
+            )
+            previous = self._segments.get(segment_id)
+            if previous is not None and previous.keys == keys:
+                render.ready_at = previous.ready_at
+                render.aired_unrendered = previous.aired_unrendered
+            else:
+                for key in keys:
+                    if key in self._rendered or key in self._inflight or key in queue:
+                        self.cache_hits += 1
+                    else:
+                        self.cache_misses += 1
+            for utterance in utterances:
+                if utterance.key in self._rendered:
+                    self._rendered.move_to_end(utterance.key)
+                    continue
+                queued = queue.get(utterance.key)
+                if queued is None or deadline < queued[0]:
+                    queue[utterance.key] = (deadline, utterance)
+            segments[segment_id] = render
+            self._mark_ready(render, now)
+        # Work for segments that were replanned away is dropped if it has not
+        # reached a worker yet.
+        for key, future in list(self._inflight.items()):
+            if key not in queue and future.cancel():
+                del self._inflight[key]
+        for key in self._inflight:
+            queue.pop(key, None)
+        self._queue = queue
+        self._segments = segments
+        return self.pump()
+
+    def pump(self) -> List[Tuple[str, Future]]:
+        free = self.max_inflight - len(self._inflight)
+        if free <= 0 or not self._queue:
+            return []
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        submitted = []
+        for key, (_, utterance) in sorted(self._queue.items(), key=lambda item: item[1][0])[:free]:
+            try:
+                future = self._executor.submit(
+                    render_sentence,
+                    self.engine,
+                    utterance.text,
+                    utterance.voice,
+                    str(self._path(key)),
+                    self.sample_rate,
+                )
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool on the next pump.
+                self._shutdown_pool()
+                break
+            del self._queue[key]
+            self._inflight[key] = future
+            submitted.append((key, future))
+        return submitted
+
+    def complete(self, key: str, future: Future) -> Optional[str]:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if future.cancelled():
+            return None
+        try:
+            audio_seconds, render_seconds = future.result()
+        except BrokenProcessPool as exc:
+            self.failures += 1
+            self.close()
+            return str(exc)
+        except Exception as exc:
+            self.failures += 1
+            return str(exc) or type(exc).__name__
+        try:
+            size = self._path(key).stat().st_size
+        except OSError as exc:
+            self.failures += 1
+            return str(exc)
+        if key in self._rendered:
+            self._disk_bytes -= self._rendered.pop(key)
+        self._rendered[key] = size
+        self._disk_bytes += size
+        self.rendered += 1
+        self._audio_seconds += audio_seconds
+        self._render_seconds += render_seconds
+        self._evict()
+        now = self._clock()
+        for render in self._segments.values():
+            self._mark_ready(render, now)
+        return None
+
+    def _evict(self) -> None:
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        needed = {key for render in self._segments.values() for key in render.keys}
+        for key in list(self._rendered):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            if key in needed:
+                continue
+            self._disk_bytes -= self._rendered.pop(key)
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def _mark_ready(self, render: SegmentRender, now: float) -> None:
+        if render.ready_at is None and all(key in self._rendered for key in render.keys):
+            render.ready_at = now
+
+    def is_ready(self, segment_id: str) -> bool:
+        render = self._segments.get(segment_id)
+        return render is not None and render.ready_at is not None
+
+    def on_air(self, segment_id: str) -> bool:
+        render = self._segments.get(segment_id)
+        if render is None or render.ready_at is not None:
+            return True
+        if not render.aired_unrendered:
+            render.aired_unrendered = True
+            self.aired_unrendered += 1
+        return False
+
+    def status(self, segment_id: str) -> str:
+        render = self._segments.get(segment_id)
+        if render is None:
+            return ""
+        if not render.keys:
+            return "No speech"
+        if render.ready_at is not None:
+            return "Ready"
+        done = sum(key in self._rendered for key in render.keys)
+        late = self._clock() - render.deadline
+        if late > 0:
+            return f"Late {late:.0f}s ({done}/{len(render.keys)})"
+        return f"Rendering {done}/{len(render.keys)}"
+
+    def lag_seconds(self) -> float:
+        now = self._clock()
+        lags = [
+            now - render.deadline
+            for render in self._segments.values()
+            if render.ready_at is None and render.keys
+        ]
+        return max(0.0, max(lags, default=0.0))
+
+    def close(self) -> None:
+        # Queued renders are dropped; a render already running is left to
+        # finish in its worker, which exits once the pool shuts down.
+        for future in self._inflight.values():
+            future.cancel()
+        self._inflight.clear()
+        self._queue.clear()
+        self._shutdown_pool()
+
+    def _shutdown_pool(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def summary(self) -> Dict[str, str]:
+        ready = sum(render.ready_at is not None for render in self._segments.values())
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "Engine": "espeak-ng" if self.engine else "placeholder synth",
+            "Workers": str(self.workers),
+            "Segments Ready": f"{ready}/{len(self._segments)}",
+            "Render Lag": f"{self.lag_seconds():.1f}s",
+            "Aired Unrendered": str(self.aired_unrendered),
+            "In Flight": f"{len(self._inflight)} ({len(self._queue)} queued)",
+            "Sentences Rendered": str(self.rendered),
+            "Render Failures": str(self.failures),
+            "Real-time Factor": (
+                f"{self._render_seconds / self._audio_seconds:.3f}"
+                if self._audio_seconds
+                else "n/a"
+            ),
+            "TTS Cache Hit Rate": f"{self.cache_hits / lookups:.1%}" if lookups else "n/a",
+            "TTS Cache Size": f"{self._disk_bytes / (1024 * 1024):.1f} MiB",
+        }
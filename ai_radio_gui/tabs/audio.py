@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from PyQt6.QtWidgets import (
+    QComboBox,
     QHBoxLayout,
     QLabel,
     QPushButton,
@@ -22,12 +23,14 @@ class AudioTab(BaseTab):
         status_group, status_layout = self._create_section("Mixer Status")
         self.ducking_label = QLabel("Ducking: Disabled")
         self.fallback_label = QLabel("Fallback: Normal")
+        self.loudness_label = QLabel("Programme: -")
         status_layout.addWidget(self.ducking_label)
         status_layout.addWidget(self.fallback_label)
+        status_layout.addWidget(self.loudness_label)
 
         tracks_group, tracks_layout = self._create_section("Active Tracks")
         self.track_table, self.track_model = self._create_table(
-            ["Track", "Type", "Level"]
+            ["Track", "Type", "Level", "Loudness", "Peak", "Gain", "Norm", "Pan", "State"]
         )
         tracks_layout.addWidget(self.track_table)
 
@@ -44,6 +47,18 @@ class AudioTab(BaseTab):
         controls_row = QHBoxLayout()
         controls_row.addWidget(toggle_ducking)
         controls_row.addWidget(trigger_fallback)
+        self.track_combo = QComboBox()
+        mute_button = QPushButton("Mute")
+        mute_button.clicked.connect(
+            lambda: self.backend.toggle_track_mute(self.track_combo.currentText())
+        )
+        solo_button = QPushButton("Solo")
+        solo_button.clicked.connect(
+            lambda: self.backend.toggle_track_solo(self.track_combo.currentText())
+        )
+        controls_row.addWidget(self.track_combo)
+        controls_row.addWidget(mute_button)
+        controls_row.addWidget(solo_button)
         controls_row.addStretch()
         controls_layout.addLayout(controls_row)
 
@@ -63,13 +78,36 @@ class AudioTab(BaseTab):
         self.fallback_label.setText(
             f"Fallback: {'Emergency' if self.state.audio_fallback else 'Normal'}"
         )
+        loudness = self.state.audio_loudness
+        self.loudness_label.setText(
+            "Programme: "
+            + (
+                " | ".join(f"{key} {value}" for key, value in loudness.items())
+                if loudness
+                else "-"
+            )
+        )
         self._populate_table(
             self.track_model,
             [
-                [track.name, track.kind, f"{track.level}%"]
+                [
+                    track.name,
+                    track.kind,
+                    f"{track.level}%",
+                    f"{track.loudness_lufs:.1f} LUFS" if track.loudness_lufs > -120 else "-",
+                    f"{track.true_peak_dbtp:+.1f} dBTP" if track.true_peak_dbtp > -120 else "-",
+                    f"{track.gain_db:+.1f} dB",
+                    f"{track.norm_gain_db:+.1f} dB",
+                    f"{track.pan:+.2f}",
+                    "Muted" if track.muted else "Solo" if track.solo else "",
+                ]
                 for track in self.state.audio_tracks
             ],
         )
+        names = [track.name for track in self.state.audio_tracks]
+        if names != [self.track_combo.itemText(i) for i in range(self.track_combo.count())]:
+            self.track_combo.clear()
+            self.track_combo.addItems(names)
         self._refresh_levels()
 
     def _refresh_levels(self) -> None:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Iterable, List, Tuple
 
+from PyQt6.QtCore import QAbstractItemModel
 from PyQt6.QtGui import QStandardItem, QStandardItemModel
 from PyQt6.QtWidgets import (
     QAbstractItemView,
@@ -36,6 +37,9 @@ class BaseTab(QWidget):
     def _create_table(self, columns: List[str]) -> Tuple[QTableView, QStandardItemModel]:
         model = QStandardItemModel(0, len(columns))
         model.setHorizontalHeaderLabels(columns)
+        return self._create_view(model), model
+
+    def _create_view(self, model: QAbstractItemModel) -> QTableView:
         view = QTableView()
         view.setModel(model)
         view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -43,7 +47,7 @@ class BaseTab(QWidget):
         view.horizontalHeader().setStretchLastSection(True)
         view.verticalHeader().setVisible(False)
         view.setAlternatingRowColors(True)
-        return view, model
+        return view
 
     def _populate_table(self, model: QStandardItemModel, rows: Iterable[List[str]]) -> None:
         model.removeRows(0, model.rowCount())
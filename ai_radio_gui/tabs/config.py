@@ -28,11 +28,15 @@ class ConfigTab(BaseTab):
         self.auto_update_checkbox = QCheckBox("Enable automatic updates")
         self.policy_mode_field = QComboBox()
         self.policy_mode_field.addItems(["Balanced", "Strict", "Creative"])
+        self.breaking_slo_field = QSpinBox()
+        self.breaking_slo_field.setRange(10, 3600)
+        self.breaking_slo_field.setSuffix(" s")
         form.addRow("System Name", self.system_name_field)
         form.addRow("Timezone", self.timezone_field)
         form.addRow("Retention (days)", self.retention_field)
         form.addRow("Auto Updates", self.auto_update_checkbox)
         form.addRow("Policy Mode", self.policy_mode_field)
+        form.addRow("Breaking Ingest-to-Air SLO", self.breaking_slo_field)
         settings_layout.addLayout(form)
 
         controls_group, controls_layout = self._create_section("Controls")
@@ -56,6 +60,7 @@ class ConfigTab(BaseTab):
         index = self.policy_mode_field.findText(config.policy_mode)
         if index >= 0:
             self.policy_mode_field.setCurrentIndex(index)
+        self.breaking_slo_field.setValue(config.breaking_slo_seconds)
 
     def _save_settings(self) -> None:
         config = ConfigState(
@@ -64,5 +69,6 @@ class ConfigTab(BaseTab):
             retention_days=self.retention_field.value(),
             auto_update=self.auto_update_checkbox.isChecked(),
             policy_mode=self.policy_mode_field.currentText(),
+            breaking_slo_seconds=self.breaking_slo_field.value(),
         )
         self.backend.apply_config(config)
@@ -1,10 +1,185 @@
 from __future__ import annotations
 
-from PyQt6.QtWidgets import QHBoxLayout, QLabel, QTextEdit
+from typing import Any, List, Tuple
 
-from ai_radio_gui.models.state import AppState, EventEntry
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableView,
+    QTextEdit,
+)
+
+from ai_radio_gui.models.state import AppState, EventEntry, TimelineEntry
 from ai_radio_gui.tabs.base import BaseTab
 
+EVENT_PAGE_SIZE = 50
+TIMELINE_PAGE_SIZE = 200
+TIMELINE_MAX_ROWS = 2000
+
+
+class TimelineModel(QAbstractTableModel):
+    # Newest-first window over the stored timeline. Older pages arrive through
+    # fetchMore; past max_rows the far end is evicted and reloaded on demand.
+    _COLUMNS = ["Timestamp", "Entry"]
+    window_shifting = pyqtSignal()
+    window_shifted = pyqtSignal()
+
+    def __init__(
+        self,
+        backend,
+        page_size: int = TIMELINE_PAGE_SIZE,
+        max_rows: int = TIMELINE_MAX_ROWS,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.backend = backend
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self._rows: List[Tuple[int, TimelineEntry]] = []
+        self._has_older = True
+        self._has_newer = False
+        self._shifting = False
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        entry = self._rows[index.row()][1]
+        return entry.timestamp if index.column() == 0 else entry.description
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._COLUMNS[section]
+        return None
+
+    @property
+    def has_newer(self) -> bool:
+        return self._has_newer
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        # The view may ask mid-shift, while its scroll bar is out of date.
+        return not parent.isValid() and self._has_older and not self._shifting
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid() or not self._has_older or self._shifting:
+            return
+        oldest = self._rows[-1][0] if self._rows else None
+        rows = self.backend.query_timeline(oldest, self.page_size + 1)
+        self._has_older = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self._shifting = True
+        self.window_shifting.emit()
+        if rows:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+        overflow = len(self._rows) - self.max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            del self._rows[:overflow]
+            self.endRemoveRows()
+            self._has_newer = True
+        self._shifting = False
+        self.window_shifted.emit()
+
+    def fetch_newer(self) -> int:
+        if not self._rows:
+            self._has_older = True
+            self.fetchMore()
+            return len(self._rows)
+        rows = self.backend.query_timeline_after(self._rows[0][0], self.page_size + 1)
+        more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self._shifting = True
+        self.window_shifting.emit()
+        if rows:
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self._rows[:0] = reversed(rows)
+            self.endInsertRows()
+        overflow = len(self._rows) - self.max_rows
+        if overflow > 0:
+            start = len(self._rows) - overflow
+            self.beginRemoveRows(QModelIndex(), start, len(self._rows) - 1)
+            del self._rows[start:]
+            self.endRemoveRows()
+            self._has_older = True
+        self._has_newer = more
+        self._shifting = False
+        self.window_shifted.emit()
+        return len(rows)
+
+    def refresh(self) -> int:
+        if self._has_newer:
+            return 0
+        return self.fetch_newer()
+
+
+def _follow_prepends(view: QTableView, model: TimelineModel) -> None:
+    # Keeps the rows on screen still when the window shifts at the top:
+    # paging in newer rows or evicting the newest ones. Only live rows
+    # arriving while the view sits on the live head may scroll it, so the
+    # newest entry stays visible. The view moves the scroll bar itself
+    # while rows change, so the offset is taken before the shift and
+    # restored once it is done.
+    scroll_bar = view.verticalScrollBar()
+    paging = False
+    offset: int | None = None
+
+    def on_shifting() -> None:
+        nonlocal offset
+        offset = scroll_bar.value()
+
+    def on_rows_inserted(_parent: QModelIndex, first: int, last: int) -> None:
+        nonlocal offset
+        if offset is not None and first == 0 and (paging or offset > 0):
+            offset += last - first + 1
+
+    def on_rows_removed(_parent: QModelIndex, first: int, last: int) -> None:
+        nonlocal offset
+        if offset is not None and first == 0:
+            offset = max(0, offset - (last - first + 1))
+
+    def on_shifted() -> None:
+        nonlocal offset
+        if offset is not None:
+            value, offset = offset, None
+            scroll_bar.setValue(value)
+
+    def on_scrolled(value: int) -> None:
+        nonlocal paging
+        if (
+            paging
+            or offset is not None
+            or value != scroll_bar.minimum()
+            or not model.has_newer
+        ):
+            return
+        paging = True
+        try:
+            model.fetch_newer()
+        finally:
+            paging = False
+
+    model.window_shifting.connect(on_shifting)
+    model.rowsInserted.connect(on_rows_inserted)
+    model.rowsRemoved.connect(on_rows_removed)
+    model.window_shifted.connect(on_shifted)
+    scroll_bar.valueChanged.connect(on_scrolled)
+
 
 class MemoryTab(BaseTab):
     def __init__(self, state: AppState, backend, title: str = "Event Store") -> None:
@@ -12,12 +187,30 @@ class MemoryTab(BaseTab):
         self.state = state
         self.backend = backend
         self._events: list[EventEntry] = []
+        self._page_cursors: list = [None]
+        self._next_cursor = None
 
         status_group, status_layout = self._create_section("Memory Status")
         self.status_label = QLabel("Status: Idle")
         status_layout.addWidget(self.status_label)
 
         events_group, events_layout = self._create_section("Event Store")
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(QLabel("Status"))
+        self.status_filter = QComboBox()
+        self.status_filter.addItems(["All Statuses", "Breaking", "Ongoing", "Resolved"])
+        self.status_filter.currentTextChanged.connect(self._reset_event_pages)
+        filter_row.addWidget(self.status_filter)
+        filter_row.addStretch()
+        self.page_label = QLabel("")
+        filter_row.addWidget(self.page_label)
+        self.newer_button = QPushButton("Newer")
+        self.newer_button.clicked.connect(self._newer_events)
+        self.older_button = QPushButton("Older")
+        self.older_button.clicked.connect(self._older_events)
+        filter_row.addWidget(self.newer_button)
+        filter_row.addWidget(self.older_button)
+        events_layout.addLayout(filter_row)
         events_row = QHBoxLayout()
         self.event_table, self.event_model = self._create_table(
             ["ID", "Title", "Status", "Timestamp"]
@@ -30,9 +223,9 @@ class MemoryTab(BaseTab):
         events_layout.addLayout(events_row)
 
         timeline_group, timeline_layout = self._create_section("Timeline Viewer")
-        self.timeline_table, self.timeline_model = self._create_table(
-            ["Timestamp", "Entry"]
-        )
+        self.timeline_model = TimelineModel(self.backend, parent=self)
+        self.timeline_table = self._create_view(self.timeline_model)
+        _follow_prepends(self.timeline_table, self.timeline_model)
         timeline_layout.addWidget(self.timeline_table)
 
         self._layout.addWidget(status_group)
@@ -46,9 +239,35 @@ class MemoryTab(BaseTab):
         self.state.memory_updated.connect(self._refresh)
         self._refresh()
 
+    def _status_filter(self) -> str | None:
+        text = self.status_filter.currentText()
+        return None if text == "All Statuses" else text
+
     def _refresh(self) -> None:
         self.status_label.setText(f"Status: {self.state.memory_status}")
-        self._events = list(self.state.memory_events)
+        if len(self._page_cursors) == 1:
+            self._load_event_page()
+        self.timeline_model.refresh()
+
+    def _reset_event_pages(self) -> None:
+        self._page_cursors = [None]
+        self._load_event_page()
+
+    def _newer_events(self) -> None:
+        if len(self._page_cursors) > 1:
+            self._page_cursors.pop()
+            self._load_event_page()
+
+    def _older_events(self) -> None:
+        if self._next_cursor is not None:
+            self._page_cursors.append(self._next_cursor)
+            self._load_event_page()
+
+    def _load_event_page(self) -> None:
+        status = self._status_filter()
+        page = self.backend.query_events(status, self._page_cursors[-1], EVENT_PAGE_SIZE)
+        self._events = page.events
+        self._next_cursor = page.next_cursor
         self._populate_table(
             self.event_model,
             [
@@ -56,13 +275,16 @@ class MemoryTab(BaseTab):
                 for event in self._events
             ],
         )
-        self._populate_table(
-            self.timeline_model,
-            [
-                [entry.timestamp, entry.description]
-                for entry in self.state.memory_timeline
-            ],
-        )
+        first = (len(self._page_cursors) - 1) * EVENT_PAGE_SIZE
+        total = self.backend.count_events(status)
+        if self._events:
+            self.page_label.setText(
+                f"Events {first + 1:,}-{first + len(self._events):,} of {total:,}"
+            )
+        else:
+            self.page_label.setText(f"Events 0 of {total:,}")
+        self.newer_button.setEnabled(len(self._page_cursors) > 1)
+        self.older_button.setEnabled(self._next_cursor is not None)
         if not self._events:
             self.event_detail.setText("No events available.")
 
@@ -91,9 +313,9 @@ class TimelineTab(BaseTab):
         status_layout.addWidget(self.status_label)
 
         timeline_group, timeline_layout = self._create_section("Timeline Entries")
-        self.timeline_table, self.timeline_model = self._create_table(
-            ["Timestamp", "Entry"]
-        )
+        self.timeline_model = TimelineModel(self.backend, parent=self)
+        self.timeline_table = self._create_view(self.timeline_model)
+        _follow_prepends(self.timeline_table, self.timeline_model)
         timeline_layout.addWidget(self.timeline_table)
 
         self._layout.addWidget(status_group)
@@ -105,10 +327,4 @@ class TimelineTab(BaseTab):
 
     def _refresh(self) -> None:
         self.status_label.setText(f"Status: {self.state.memory_status}")
-        self._populate_table(
-            self.timeline_model,
-            [
-                [entry.timestamp, entry.description]
-                for entry in self.state.memory_timeline
-            ],
-        )
+        self.timeline_model.refresh()
@@ -1,11 +1,142 @@
 from __future__ import annotations
 
-from PyQt6.QtWidgets import QHBoxLayout, QLabel, QPushButton
+import math
+import time
+from typing import Any, List, Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QPushButton
 
 from ai_radio_gui.models.state import AppState, SegmentEntry
 from ai_radio_gui.tabs.base import BaseTab
 
 
+def _format_time(seconds: int) -> str:
+    minutes, secs = divmod(max(seconds, 0), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+class SegmentTableModel(QAbstractTableModel):
+    # Rows are keyed by segment_id, so a scheduler update becomes row
+    # removals/inserts at the ends plus dataChanged for the cells that moved.
+    def __init__(self, columns: List[str], parent=None) -> None:
+        super().__init__(parent)
+        self._columns = columns
+        self._segments: List[SegmentEntry] = []
+        self._cells: List[List[str]] = []
+        self._paused = False
+        self._remaining_column = (
+            columns.index("Remaining") if "Remaining" in columns else None
+        )
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._cells)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self._cells[index.row()][index.column()]
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._columns[section]
+        return None
+
+    def _remaining(self, segment: SegmentEntry, now: float) -> int:
+        if self._paused or not segment.end_deadline:
+            return segment.remaining_seconds
+        if now <= segment.start_deadline:
+            return segment.duration_seconds
+        return max(0, math.ceil(segment.end_deadline - now))
+
+    def _row_cells(self, segment: SegmentEntry, now: float) -> List[str]:
+        values = {
+            "Segment": segment.title,
+            "Start": segment.start_time,
+            "Duration": _format_time(segment.duration_seconds),
+            "Voice": segment.tts_status,
+        }
+        if self._remaining_column is not None:
+            values["Remaining"] = _format_time(self._remaining(segment, now))
+        return [values[column] for column in self._columns]
+
+    def _set_row(self, row: int, segment: SegmentEntry, now: float) -> None:
+        cells = self._row_cells(segment, now)
+        self._segments[row] = segment
+        for column, value in enumerate(cells):
+            if self._cells[row][column] != value:
+                self._cells[row][column] = value
+                index = self.index(row, column)
+                self.dataChanged.emit(index, index)
+
+    def set_segments(self, segments: List[SegmentEntry], paused: bool = False) -> None:
+        now = time.monotonic()
+        self._paused = paused
+        old_ids = [segment.segment_id for segment in self._segments]
+        new_ids = [segment.segment_id for segment in segments]
+        start = old_ids.index(new_ids[0]) if new_ids and new_ids[0] in old_ids else 0
+        overlap = 0
+        while (
+            start + overlap < len(old_ids)
+            and overlap < len(new_ids)
+            and old_ids[start + overlap] == new_ids[overlap]
+        ):
+            overlap += 1
+        if not overlap:
+            self.beginResetModel()
+            self._segments = list(segments)
+            self._cells = [self._row_cells(segment, now) for segment in segments]
+            self.endResetModel()
+            return
+        if start:
+            self.beginRemoveRows(QModelIndex(), 0, start - 1)
+            del self._segments[:start]
+            del self._cells[:start]
+            self.endRemoveRows()
+        if len(self._segments) > overlap:
+            self.beginRemoveRows(QModelIndex(), overlap, len(self._segments) - 1)
+            del self._segments[overlap:]
+            del self._cells[overlap:]
+            self.endRemoveRows()
+        for row in range(overlap):
+            self._set_row(row, segments[row], now)
+        if len(segments) > overlap:
+            self.beginInsertRows(QModelIndex(), overlap, len(segments) - 1)
+            self._segments.extend(segments[overlap:])
+            self._cells.extend(self._row_cells(segment, now) for segment in segments[overlap:])
+            self.endInsertRows()
+
+    def tick(self) -> None:
+        if self._remaining_column is None or self._paused:
+            return
+        now = time.monotonic()
+        column = self._remaining_column
+        for row, segment in enumerate(self._segments):
+            if segment.start_deadline > now:
+                break
+            value = _format_time(self._remaining(segment, now))
+            if self._cells[row][column] != value:
+                self._cells[row][column] = value
+                index = self.index(row, column)
+                self.dataChanged.emit(index, index)
+
+    def next_change(self) -> Optional[float]:
+        if self._paused or not self._segments or not self._segments[0].end_deadline:
+            return None
+        left = self._segments[0].end_deadline - time.monotonic()
+        if left <= 0:
+            return None
+        return left % 1.0 or 1.0
+
+
 class SchedulerTab(BaseTab):
     def __init__(self, state: AppState, backend, title: str = "Scheduler") -> None:
         super().__init__(title)
@@ -15,19 +146,25 @@ class SchedulerTab(BaseTab):
         status_group, status_layout = self._create_section("Scheduler Status")
         self.status_label = QLabel("Status: Running")
         status_layout.addWidget(self.status_label)
+        self.latency_label = QLabel("Breaking ingest-to-air: no breaking segments aired yet")
+        status_layout.addWidget(self.latency_label)
 
+        segment_columns = ["Segment", "Start", "Duration", "Remaining", "Voice"]
         rundown_group, rundown_layout = self._create_section("Current Rundown")
-        self.rundown_table, self.rundown_model = self._create_table(
-            ["Segment", "Start", "Duration", "Remaining"]
-        )
+        self.rundown_model = SegmentTableModel(segment_columns, parent=self)
+        self.rundown_table = self._create_view(self.rundown_model)
         rundown_layout.addWidget(self.rundown_table)
 
         upcoming_group, upcoming_layout = self._create_section("Upcoming Segments")
-        self.upcoming_table, self.upcoming_model = self._create_table(
-            ["Segment", "Start", "Duration", "Remaining"]
-        )
+        self.upcoming_model = SegmentTableModel(segment_columns, parent=self)
+        self.upcoming_table = self._create_view(self.upcoming_model)
         upcoming_layout.addWidget(self.upcoming_table)
 
+        plan_group, plan_layout = self._create_section("Planned Rundown (24h)")
+        self.plan_model = SegmentTableModel(["Start", "Segment", "Duration"], parent=self)
+        self.plan_table = self._create_view(self.plan_model)
+        plan_layout.addWidget(self.plan_table)
+
         controls_group, controls_layout = self._create_section("Controls")
         self.pause_button = QPushButton("Pause Scheduling")
         self.pause_button.clicked.connect(self.backend.toggle_scheduler_pause)
@@ -36,41 +173,69 @@ class SchedulerTab(BaseTab):
         controls_row = QHBoxLayout()
         controls_row.addWidget(self.pause_button)
         controls_row.addWidget(skip_button)
+        self.insert_combo = QComboBox()
+        self.insert_combo.addItems(self.backend.insertable_segments())
+        insert_button = QPushButton("Insert Next")
+        insert_button.clicked.connect(
+            lambda: self.backend.insert_segment(self.insert_combo.currentText())
+        )
+        controls_row.addWidget(self.insert_combo)
+        controls_row.addWidget(insert_button)
         controls_row.addStretch()
         controls_layout.addLayout(controls_row)
 
         self._layout.addWidget(status_group)
         self._layout.addWidget(rundown_group)
         self._layout.addWidget(upcoming_group)
+        self._layout.addWidget(plan_group)
         self._layout.addWidget(controls_group)
         self._layout.addStretch()
 
+        self._countdown_timer = QTimer(self)
+        self._countdown_timer.setSingleShot(True)
+        self._countdown_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._countdown_timer.timeout.connect(self._tick)
+
         self.state.scheduler_updated.connect(self._refresh)
+        self.state.scheduler_plan_updated.connect(self._refresh_plan)
+        self.state.config_updated.connect(self._refresh_latency)
         self._refresh()
+        self._refresh_plan()
 
     def _refresh(self) -> None:
-        status_text = "Paused" if self.state.scheduler_paused else "Running"
-        self.status_label.setText(f"Status: {status_text}")
-        self.pause_button.setText(
-            "Resume Scheduling" if self.state.scheduler_paused else "Pause Scheduling"
-        )
-        self._populate_table(
-            self.rundown_model, [self._segment_row(seg) for seg in self.state.scheduler_rundown]
-        )
-        self._populate_table(
-            self.upcoming_model,
-            [self._segment_row(seg) for seg in self.state.scheduler_upcoming],
+        paused = self.state.scheduler_paused
+        self.status_label.setText(f"Status: {'Paused' if paused else 'Running'}")
+        self.pause_button.setText("Resume Scheduling" if paused else "Pause Scheduling")
+        self.rundown_model.set_segments(self.state.scheduler_rundown, paused)
+        self.upcoming_model.set_segments(self.state.scheduler_upcoming, paused)
+        self._refresh_latency()
+        self._arm_countdown()
+
+    def _refresh_latency(self) -> None:
+        latency = self.state.breaking_latency
+        slo = self.state.config.breaking_slo_seconds
+        if not latency.samples:
+            self.latency_label.setText(
+                f"Breaking ingest-to-air: no breaking segments aired yet (SLO {slo}s)"
+            )
+            return
+        verdict = "over SLO" if latency.last_seconds > slo else "within SLO"
+        self.latency_label.setText(
+            f"Breaking ingest-to-air: last {latency.last_seconds:.1f}s ({verdict}), "
+            f"p95 {latency.p95_seconds:.1f}s over {latency.samples} "
+            f"(SLO {slo}s, {latency.violations} breaches)"
         )
 
-    def _segment_row(self, segment: SegmentEntry) -> list[str]:
-        return [
-            segment.title,
-            segment.start_time,
-            self._format_time(segment.duration_seconds),
-            self._format_time(segment.remaining_seconds),
-        ]
-
-    @staticmethod
-    def _format_time(seconds: int) -> str:
-        minutes, secs = divmod(max(seconds, 0), 60)
-        return f"{minutes:02d}:{secs:02d}"
+    def _refresh_plan(self) -> None:
+        self.plan_model.set_segments(self.state.scheduler_plan)
+
+    def _tick(self) -> None:
+        self.rundown_model.tick()
+        self._arm_countdown()
+
+    def _arm_countdown(self) -> None:
+        delay = self.rundown_model.next_change()
+        if delay is None:
+            self._countdown_timer.stop()
+            return
+        self._countdown_timer.start(math.ceil(delay * 1000))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextCursor
 from PyQt6.QtWidgets import QLabel, QPushButton, QSlider, QTextEdit
 
 from ai_radio_gui.models.state import AppState
@@ -17,6 +18,7 @@ class ScriptingTab(BaseTab):
         self.script_view = QTextEdit()
         self.script_view.setReadOnly(True)
         script_layout.addWidget(self.script_view)
+        self._shown_script = ""
 
         roles_group, roles_layout = self._create_section("Role Breakdown")
         self.roles_table, self.roles_model = self._create_table(["Role", "Lines"])
@@ -33,12 +35,15 @@ class ScriptingTab(BaseTab):
         self.tone_slider.valueChanged.connect(self._tone_changed)
         regen_button = QPushButton("Regenerate Script")
         regen_button.clicked.connect(self.backend.regenerate_script)
+        self.cancel_button = QPushButton("Cancel Generation")
+        self.cancel_button.clicked.connect(self.backend.cancel_script_generation)
 
         controls_layout.addWidget(self.humor_label)
         controls_layout.addWidget(self.humor_slider)
         controls_layout.addWidget(self.tone_label)
         controls_layout.addWidget(self.tone_slider)
         controls_layout.addWidget(regen_button)
+        controls_layout.addWidget(self.cancel_button)
 
         self._layout.addWidget(script_group)
         self._layout.addWidget(roles_group)
@@ -46,10 +51,14 @@ class ScriptingTab(BaseTab):
         self._layout.addStretch()
 
         self.state.scripting_updated.connect(self._refresh)
+        self.state.scripting_token.connect(self._append_token)
         self._refresh()
 
     def _refresh(self) -> None:
-        self.script_view.setText(self.state.scripting_last_script)
+        if self.state.scripting_last_script != self._shown_script:
+            self._shown_script = self.state.scripting_last_script
+            self.script_view.setPlainText(self._shown_script)
+        self.cancel_button.setEnabled(self.state.scripting_generating)
         self._populate_table(
             self.roles_model,
             [[role.role, str(role.lines)] for role in self.state.scripting_roles],
@@ -59,6 +68,12 @@ class ScriptingTab(BaseTab):
         self.humor_label.setText(f"Humor: {self.state.scripting_humor}")
         self.tone_label.setText(f"Tone: {self.state.scripting_tone}")
 
+    def _append_token(self, token: str) -> None:
+        cursor = self.script_view.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(token)
+        self._shown_script = self.state.scripting_last_script
+
     def _set_slider(self, slider: QSlider, value: int) -> None:
         slider.blockSignals(True)
         slider.setValue(value)
@@ -1,10 +1,112 @@
 from __future__ import annotations
 
-from PyQt6.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QPushButton
+from datetime import datetime
+from typing import List
 
-from ai_radio_gui.models.state import AppState
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPen
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QWidget,
+)
+
+from ai_radio_gui.models.state import AppState, AudiencePoint
 from ai_radio_gui.tabs.base import BaseTab
 
+_UNIQUES_COLOR = QColor(52, 120, 246)
+_PEAK_COLOR = QColor(230, 126, 34)
+
+
+class AudienceChart(QWidget):
+    # Hourly unique listeners (filled) and peak concurrency (line) over the
+    # rollup window, with a tick at each midnight.
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.points: List[AudiencePoint] = []
+        self.setMinimumHeight(180)
+
+    def set_points(self, points: List[AudiencePoint]) -> None:
+        self.points = points
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        metrics = painter.fontMetrics()
+        area = QRectF(self.rect()).adjusted(
+            metrics.horizontalAdvance("00000") + 8, 8, -8, -metrics.height() - 8
+        )
+        painter.setPen(QPen(self.palette().mid().color()))
+        painter.drawRect(area)
+        if not self.points:
+            painter.drawText(area, Qt.AlignmentFlag.AlignCenter, "No listener data yet")
+            return
+        start = self.points[0].start
+        span = max(3600.0, self.points[-1].start + 3600 - start)
+        top = max(
+            1.0, max(max(point.uniques, point.peak_concurrent) for point in self.points)
+        )
+
+        def position(timestamp: float, value: float) -> QPointF:
+            return QPointF(
+                area.left() + (timestamp - start) / span * area.width(),
+                area.bottom() - value / top * area.height(),
+            )
+
+        text_pen = QPen(self.palette().text().color())
+        painter.setPen(text_pen)
+        painter.drawText(
+            QRectF(0, area.top() - 4, area.left() - 4, metrics.height()),
+            Qt.AlignmentFlag.AlignRight,
+            f"{top:.0f}",
+        )
+        painter.drawText(
+            QRectF(0, area.bottom() - metrics.height(), area.left() - 4, metrics.height()),
+            Qt.AlignmentFlag.AlignRight,
+            "0",
+        )
+        midnight = start - start % 86400 + 86400
+        while midnight < start + span:
+            x = position(midnight, 0).x()
+            painter.setPen(QPen(self.palette().mid().color(), 1, Qt.PenStyle.DotLine))
+            painter.drawLine(QPointF(x, area.top()), QPointF(x, area.bottom()))
+            painter.setPen(text_pen)
+            label = datetime.fromtimestamp(midnight).strftime("%a %d")
+            if x + metrics.horizontalAdvance(label) + 2 <= self.width():
+                painter.drawText(QPointF(x + 2, area.bottom() + metrics.ascent() + 4), label)
+            midnight += 86400
+
+        uniques = QPainterPath(position(start, 0))
+        for point in self.points:
+            uniques.lineTo(position(point.start, point.uniques))
+            uniques.lineTo(position(point.start + 3600, point.uniques))
+        uniques.lineTo(position(self.points[-1].start + 3600, 0))
+        uniques.closeSubpath()
+        fill = QColor(_UNIQUES_COLOR)
+        fill.setAlpha(90)
+        painter.setPen(QPen(_UNIQUES_COLOR, 1))
+        painter.setBrush(fill)
+        painter.drawPath(uniques)
+
+        peaks = QPainterPath(position(start + 1800, self.points[0].peak_concurrent))
+        for point in self.points[1:]:
+            peaks.lineTo(position(point.start + 1800, point.peak_concurrent))
+        painter.setPen(QPen(_PEAK_COLOR, 2))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(peaks)
+
+        x = area.left() + 8
+        legend = (("Unique listeners / hour", _UNIQUES_COLOR), ("Peak concurrent", _PEAK_COLOR))
+        for label, color in legend:
+            painter.fillRect(QRectF(x, area.top() + 6, 10, 10), color)
+            painter.setPen(text_pen)
+            painter.drawText(QPointF(x + 14, area.top() + 6 + metrics.ascent() - 2), label)
+            x += metrics.horizontalAdvance(label) + 32
+
 
 class StreamingTab(BaseTab):
     def __init__(self, state: AppState, backend, title: str = "Streaming") -> None:
@@ -14,39 +116,128 @@ class StreamingTab(BaseTab):
 
         status_group, status_layout = self._create_section("Encoder Status")
         self.status_label = QLabel("Status: Offline")
-        self.bitrate_label = QLabel("Bitrate: 0 kbps")
-        self.listeners_label = QLabel("Listeners: 0")
+        self.encoder_label = QLabel("Encoder CPU: 0.0% | Queue: 0 ms")
+        self.switchover_label = QLabel("Last Switchover: n/a")
         status_layout.addWidget(self.status_label)
-        status_layout.addWidget(self.bitrate_label)
-        status_layout.addWidget(self.listeners_label)
+        status_layout.addWidget(self.encoder_label)
+        status_layout.addWidget(self.switchover_label)
+
+        mounts_group, mounts_layout = self._create_section("Mount Points")
+        self.mount_table, self.mount_model = self._create_table(
+            ["Mount", "Profile", "Status", "Bitrate", "Listeners", "Peak", "CPU", "Queue"]
+        )
+        mounts_layout.addWidget(self.mount_table)
+
+        audience_group, audience_layout = self._create_section("Audience (7 Days)")
+        self.audience_label = QLabel("Listening Now: 0")
+        self.audience_chart = AudienceChart()
+        self.listen_time_label = QLabel("Listen Time Today: n/a")
+        audience_layout.addWidget(self.audience_label)
+        audience_layout.addWidget(self.audience_chart)
+        audience_layout.addWidget(self.listen_time_label)
 
         url_group, url_layout = self._create_section("Stream URL")
         self.url_field = QLineEdit()
         self.url_field.setReadOnly(True)
+        self.hls_field = QLineEdit()
+        self.hls_field.setReadOnly(True)
         url_layout.addWidget(self.url_field)
+        url_layout.addWidget(self.hls_field)
 
         controls_group, controls_layout = self._create_section("Controls")
+        self.mount_combo = QComboBox()
+        self.mount_combo.addItems(self.backend.stream_mounts())
+        self.mount_combo.currentTextChanged.connect(self._select_mount)
+        self.profile_combo = QComboBox()
+        self.profile_combo.currentTextChanged.connect(
+            lambda name: self.backend.set_encoder_profile(self.mount_combo.currentText(), name)
+        )
         restart_button = QPushButton("Restart Encoder")
-        restart_button.clicked.connect(self.backend.restart_encoder)
+        restart_button.clicked.connect(
+            lambda: self.backend.restart_encoder(self.mount_combo.currentText())
+        )
         refresh_button = QPushButton("Refresh Stats")
         refresh_button.clicked.connect(self.backend.force_stream_refresh)
         controls_row = QHBoxLayout()
+        controls_row.addWidget(QLabel("Mount"))
+        controls_row.addWidget(self.mount_combo)
+        controls_row.addWidget(QLabel("Profile"))
+        controls_row.addWidget(self.profile_combo)
         controls_row.addWidget(restart_button)
         controls_row.addWidget(refresh_button)
         controls_row.addStretch()
         controls_layout.addLayout(controls_row)
 
         self._layout.addWidget(status_group)
+        self._layout.addWidget(mounts_group)
+        self._layout.addWidget(audience_group)
         self._layout.addWidget(url_group)
         self._layout.addWidget(controls_group)
         self._layout.addStretch()
 
         self.state.streaming_updated.connect(self._refresh)
+        self.state.audience_updated.connect(self._refresh_audience)
+        self._select_mount(self.mount_combo.currentText())
         self._refresh()
+        self._refresh_audience()
+
+    def _select_mount(self, mount: str) -> None:
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self.backend.encoder_profiles(mount))
+        self.profile_combo.blockSignals(False)
+        self._sync_profile()
+
+    def _sync_profile(self) -> None:
+        mount = self.mount_combo.currentText()
+        for stats in self.state.stream_mounts:
+            if stats.mount == mount and stats.profile != self.profile_combo.currentText():
+                self.profile_combo.blockSignals(True)
+                self.profile_combo.setCurrentText(stats.profile)
+                self.profile_combo.blockSignals(False)
 
     def _refresh(self) -> None:
         stats = self.state.streaming_stats
-        self.status_label.setText(f"Status: {stats.status}")
-        self.bitrate_label.setText(f"Bitrate: {stats.bitrate_kbps} kbps")
-        self.listeners_label.setText(f"Listeners: {stats.listeners}")
+        self.status_label.setText(
+            f"Status: {stats.status} | {stats.bitrate_kbps} kbps total | "
+            f"{stats.listeners} listeners"
+        )
+        self.encoder_label.setText(
+            f"Encoder CPU: {stats.encoder_cpu_percent:.1f}% | Queue: {stats.queue_ms:.0f} ms"
+        )
+        self.switchover_label.setText(
+            f"Last Switchover: {stats.switchover_ms:.0f} ms"
+            if stats.switchover_ms
+            else "Last Switchover: n/a"
+        )
+        self._populate_table(
+            self.mount_model,
+            [
+                [
+                    mount.mount,
+                    mount.profile,
+                    mount.status,
+                    f"{mount.bitrate_kbps} kbps",
+                    str(mount.listeners),
+                    str(mount.listener_peak),
+                    f"{mount.encoder_cpu_percent:.1f}%",
+                    f"{mount.queue_ms:.0f} ms",
+                ]
+                for mount in self.state.stream_mounts
+            ],
+        )
         self.url_field.setText(stats.url)
+        self.hls_field.setText(stats.hls_url)
+        self._sync_profile()
+
+    def _refresh_audience(self) -> None:
+        summary = self.state.audience_summary
+        self.audience_label.setText(
+            " | ".join(f"{key}: {value}" for key, value in summary.items())
+            or "Listening Now: 0"
+        )
+        self.audience_chart.set_points(self.state.audience_hourly)
+        self.listen_time_label.setText(
+            "Listen Time Today: "
+            + "  ".join(f"{label} {count}" for label, count in self.state.audience_listen_times)
+        )
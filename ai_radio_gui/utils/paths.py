@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+DATA_DIR_ENV = "AI_RADIO_DATA_DIR"
+MUSIC_DIR_ENV = "AI_RADIO_MUSIC_DIR"
+
+
+def data_dir() -> Path:
+    root = os.environ.get(DATA_DIR_ENV)
+    path = Path(root) if root else Path.home() / ".ai_news_radio"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def data_path(*parts: str) -> Path:
+    path = data_dir().joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def music_dir() -> Path:
+    root = os.environ.get(MUSIC_DIR_ENV)
+    path = Path(root) if root else data_dir() / "music"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
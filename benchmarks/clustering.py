@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from ai_radio_gui.services.clustering import EventClusterer
+from ai_radio_gui.services.feed_parser import FeedItem
+
+
+def synthetic_items(count: int, topics: int, seed: int = 31) -> list:
+    # Each item draws most of its words from one of `topics` stories plus
+    # some noise, like several outlets covering the same event.
+    rng = random.Random(seed)
+    vocabulary = [f"word{index}" for index in range(5000)]
+    stories = [rng.sample(vocabulary, 8) for _ in range(topics)]
+    items = []
+    for index in range(count):
+        story = rng.choice(stories)
+        title = " ".join(rng.sample(story, 6) + rng.sample(vocabulary, 3))
+        summary = " ".join(rng.sample(story, 5))
+        items.append(FeedItem(f"Feed {index % 7}", title, title, "", summary, None, 0.0))
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental clustering throughput.")
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=200)
+    args = parser.parse_args()
+    items = synthetic_items(args.items, args.topics)
+    clusterer = EventClusterer()
+    started = time.perf_counter()
+    slowest = 0.0
+    for offset in range(0, len(items), args.batch):
+        batch_started = time.perf_counter()
+        clusterer.add_items(items[offset : offset + args.batch])
+        slowest = max(slowest, time.perf_counter() - batch_started)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{len(items)} items in {elapsed:.2f} s = {len(items) / elapsed * 3600:,.0f} items/hour "
+        f"capacity ({len(items) / elapsed:,.0f}/s); {len(clusterer)} events, "
+        f"slowest batch of {args.batch} {slowest * 1000:.1f} ms"
+    )
+    print(f"target: 100,000 items/hour = {100000 / 3600:.1f} items/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from ai_radio_gui.services.feed_fetcher import FeedFetcher, FeedSource
+from benchmarks.feed_stub import FeedStub
+
+
+async def run(feeds: int, concurrency: int, delay: float) -> None:
+    stub = FeedStub(delay=delay, failing={"/feed-7.xml"})
+    port = await stub.start()
+    sources = [
+        FeedSource(f"Feed {index}", f"http://127.0.0.1:{port}/feed-{index}.xml")
+        for index in range(feeds)
+    ]
+    fetcher = FeedFetcher(sources, max_concurrency=concurrency)
+    for label in ("cold poll", "conditional poll"):
+        started = time.perf_counter()
+        summary = await fetcher.poll()
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:16s} {elapsed:6.2f} s  fetched={summary.fetched} "
+            f"not_modified={summary.not_modified} skipped={summary.skipped} "
+            f"failed={len(summary.failures)} items={len(summary.items)} "
+            f"requests={stub.requests} connections={stub.connections}"
+        )
+    await fetcher.client.close()
+    await asyncio.sleep(0.1)
+    stub.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Poll hundreds of feeds from a local stub.")
+    parser.add_argument("--feeds", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=0.01, help="stub latency per request")
+    args = parser.parse_args()
+    asyncio.run(run(args.feeds, args.concurrency, args.delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+from typing import Dict, Set
+
+
+def rss_body(name: str, items: int, newest: float = 1700000000.0) -> bytes:
+    entries = "".join(
+        f"<item><title>{name} story {index}</title><guid>{name}-{index}</guid>"
+        f"<link>http://stub.local/{name}/{index}</link>"
+        f"<description>Body of story {index} from {name}.</description>"
+        f"<pubDate>{email.utils.formatdate(newest - index * 60)}</pubDate></item>"
+        for index in range(items)
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>'
+        f"{entries}</channel></rss>"
+    ).encode()
+
+
+class FeedStub:
+    # Keep-alive HTTP/1.1 server for local ingestion benchmarks: every path
+    # is an RSS feed, sent chunked, with a per-path ETag for conditional GET.
+    def __init__(self, items: int = 30, delay: float = 0.0, failing: Set[str] = frozenset()):
+        self.items = items
+        self.delay = delay
+        self.failing = set(failing)
+        self.requests = 0
+        self.connections = 0
+        self._bodies: Dict[str, bytes] = {}
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.requests += 1
+                lines = head.decode("latin-1").split("\r\n")
+                path = lines[0].split()[1]
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (line.partition(":") for line in lines[1:])
+                }
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                etag = f'"{path}"'
+                if path in self.failing:
+                    writer.write(b"HTTP/1.1 500 Stub Failure\r\nContent-Length: 0\r\n\r\n")
+                elif headers.get("if-none-match") == etag:
+                    writer.write(f"HTTP/1.1 304 Not Modified\r\nETag: {etag}\r\n\r\n".encode())
+                else:
+                    body = self._bodies.get(path)
+                    if body is None:
+                        body = self._bodies[path] = rss_body(path.strip("/"), self.items)
+                    writer.write(
+                        f"HTTP/1.1 200 OK\r\nETag: {etag}\r\n"
+                        "Transfer-Encoding: chunked\r\n\r\n".encode()
+                    )
+                    for offset in range(0, len(body), 8192):
+                        chunk = body[offset : offset + 8192]
+                        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    writer.write(b"0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        writer.close()
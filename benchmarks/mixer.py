@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from ai_radio_gui.services.mixer import LoopSource, Mixer
+
+
+def tone(frequency: float, sample_rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (0.25 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def real_time_factor(
+    tracks: int, blocks: int, sample_rate: int, block_frames: int, ramps: bool
+) -> float:
+    # Seconds of CPU per second of audio; below 1.0 keeps up with real time.
+    mixer = Mixer(sample_rate, block_frames)
+    for index in range(tracks):
+        mixer.add_track(
+            f"Track {index}",
+            "Voice",
+            LoopSource(tone(100 + index * 37, sample_rate)),
+            pan=(index % 5 - 2) / 2,
+        )
+    out = np.zeros((block_frames, 2), dtype=np.float32)
+    mixer.mix_into(out)
+    started = time.perf_counter()
+    for block in range(blocks):
+        if ramps and block % 2 == 0:
+            # A gain change on every other track each other block, so
+            # half the blocks mix through per-sample ramps.
+            for index in range(0, tracks, 2):
+                mixer.set_gain(f"Track {index}", -float(block % 7))
+        mixer.mix_into(out)
+    return (time.perf_counter() - started) / (blocks * block_frames / sample_rate)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mixer real-time factor by track count.")
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--block-frames", type=int, default=1024)
+    args = parser.parse_args()
+    print("tracks  RTF steady  RTF with gain ramps")
+    for tracks in (4, 8, 16, 32, 64):
+        steady = real_time_factor(tracks, args.blocks, args.sample_rate, args.block_frames, False)
+        ramped = real_time_factor(tracks, args.blocks, args.sample_rate, args.block_frames, True)
+        print(f"{tracks:6d}  {steady:10.4f}  {ramped:19.4f}")
+
+
+if __name__ == "__main__":
+    main()
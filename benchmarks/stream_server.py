@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import select
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from ai_radio_gui.services.stream_server import StreamServer
+
+# Run as: python -m benchmarks.stream_server. The server runs in a child
+# process so its RSS and CPU are measured apart from the client swarm.
+
+
+def rss_mib(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as handle:
+        for line in handle:
+            if line.startswith("VmRSS"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as handle:
+        fields = handle.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def serve(port: int, max_listeners: int) -> None:
+    async def main() -> None:
+        server = StreamServer(port=port, max_listeners=max_listeners)
+        mount = server.add_mount("/live", "audio/aac", 128)
+        await server.start()
+
+        def produce() -> None:
+            # 128 kbps AAC-sized frames at the real frame rate.
+            frame_seconds = 1024 / 48000
+            count = 0
+            origin = time.monotonic()
+            while True:
+                mount.publish(os.urandom(4) + bytes(380))
+                count += 1
+                delay = origin + count * frame_seconds - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+        threading.Thread(target=produce, daemon=True).start()
+        while True:
+            await asyncio.sleep(1)
+            print(json.dumps(server.summary()), flush=True)
+
+    asyncio.run(main())
+
+
+async def listener(port: int, stats: dict, slow: bool) -> None:
+    if slow:
+        # A client that never reads, with a tiny receive buffer.
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.connect(("127.0.0.1", port))
+        sock.setblocking(False)
+        reader, writer = await asyncio.open_connection(sock=sock)
+    else:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /live HTTP/1.0\r\nIcy-MetaData: 0\r\n\r\n")
+    if slow:
+        await asyncio.sleep(3600)
+        return
+    first = True
+    while True:
+        data = await reader.read(65536)
+        if not data:
+            stats["closed"] += 1
+            return
+        if first:
+            stats["burst"].append(len(data))
+            first = False
+        stats["bytes"] += len(data)
+
+
+def latest_summary(process: subprocess.Popen) -> dict:
+    line = process.stdout.readline()
+    while select.select([process.stdout], [], [], 0)[0]:
+        line = process.stdout.readline()
+    return json.loads(line)
+
+
+async def swarm(port: int, process: subprocess.Popen, steps: list, slow: int) -> None:
+    stats = {"bytes": 0, "closed": 0, "burst": []}
+    tasks = [asyncio.ensure_future(listener(port, stats, True)) for _ in range(slow)]
+    for target in steps:
+        while len(tasks) - slow < target:
+            tasks.append(asyncio.ensure_future(listener(port, stats, False)))
+            if len(tasks) % 200 == 0:
+                await asyncio.sleep(0.05)
+        await asyncio.sleep(3)
+        cpu_before = cpu_seconds(process.pid)
+        bytes_before = stats["bytes"]
+        started = time.monotonic()
+        await asyncio.sleep(5)
+        elapsed = time.monotonic() - started
+        summary = latest_summary(process)
+        cpu = (cpu_seconds(process.pid) - cpu_before) / elapsed * 100
+        kbps = (stats["bytes"] - bytes_before) * 8 / 1000 / elapsed / max(target, 1)
+        print(
+            f"listeners={target:5d} server_rss={rss_mib(process.pid):6.1f} MiB "
+            f"server_cpu={cpu:5.1f}% per_listener={kbps:6.1f} kbps "
+            f"flush={summary['Flush Time']} evicted={summary['Evicted']}",
+            flush=True,
+        )
+    bursts = sorted(stats["burst"])
+    print(f"median burst-on-connect {bursts[len(bursts) // 2]} bytes, closed {stats['closed']}")
+    for task in tasks:
+        task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local client swarm against StreamServer.")
+    parser.add_argument("--port", type=int, default=18123)
+    parser.add_argument("--steps", default="0,500,1000,2000,4000")
+    parser.add_argument("--slow", type=int, default=20, help="clients that never read")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    steps = [int(step) for step in args.steps.split(",")]
+    if args.serve:
+        serve(args.port, max(steps) + args.slow + 100)
+        return
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.stream_server",
+            "--serve",
+            "--port",
+            str(args.port),
+            "--steps",
+            args.steps,
+            "--slow",
+            str(args.slow),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    time.sleep(1.5)
+    try:
+        asyncio.run(swarm(args.port, process, steps, args.slow))
+    finally:
+        process.kill()
+
+
+if __name__ == "__main__":
+    main()
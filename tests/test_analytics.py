@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ai_radio_gui.services.analytics import ListenerAnalytics
+
+DAY = 1_700_006_400
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_gap_across_hours_keeps_every_hours_listener_seconds(tmp_path: Path) -> None:
+    clock = FakeClock(DAY + 1800)
+    analytics = ListenerAnalytics(tmp_path / "audience.db", clock=clock)
+    analytics.session_started(1, "listener")
+    clock.now = DAY + 3 * 3600 + 1800
+    analytics.sample()
+    hours = analytics.hourly(DAY)
+    day = analytics.daily(DAY)[0]
+    analytics.close()
+    assert [hour.start for hour in hours] == [DAY + index * 3600 for index in range(4)]
+    assert [hour.listen_seconds for hour in hours] == [1800.0, 3600.0, 3600.0, 1800.0]
+    assert [hour.peak_concurrent for hour in hours] == [1, 1, 1, 1]
+    assert day.listen_seconds == 3 * 3600.0
+
+
+def test_restored_hour_keeps_its_average_concurrency(tmp_path: Path) -> None:
+    clock = FakeClock(DAY + 60)
+    analytics = ListenerAnalytics(tmp_path / "audience.db", clock=clock)
+    analytics.session_started(1, "listener")
+    clock.now += 600
+    analytics.session_ended(1)
+    analytics.close()
+    analytics = ListenerAnalytics(tmp_path / "audience.db", clock=clock)
+    clock.now += 600
+    analytics.sample()
+    hour = analytics.hourly(DAY)[-1]
+    analytics.close()
+    assert hour.listen_seconds == 600.0
+    assert hour.avg_concurrent == 0.5
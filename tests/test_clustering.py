@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from ai_radio_gui.services.clustering import EventClusterer
+from ai_radio_gui.services.dedup import NearDuplicateIndex
+from ai_radio_gui.services.event_store import StoredEvent
+from ai_radio_gui.services.feed_parser import FeedItem
+
+WALL_NOW = 1_700_000_000.0
+
+
+def _item(feed: str, guid: str, title: str, summary: str, fetched_at: float) -> FeedItem:
+    return FeedItem(feed, guid, title, "", summary, None, fetched_at)
+
+
+def test_restored_event_joins_new_item_on_fetcher_clock() -> None:
+    # Stored events carry wall-clock times; fetch times come from the
+    # fetcher's monotonic clock and must not be mixed with them.
+    clusterer = EventClusterer(first_event_number=8, clock=lambda: WALL_NOW)
+    clusterer.restore(
+        [
+            StoredEvent(
+                event_id="E000007",
+                title="Earthquake strikes northern Chile coast",
+                status="Ongoing",
+                detail="Magnitude 7 quake hits Chile\n\nReports: 2 from BBC, NPR.",
+                updated_at=WALL_NOW - 600,
+                item_count=2,
+                sources="BBC\nNPR",
+            )
+        ]
+    )
+    changed = clusterer.add_items(
+        [
+            _item(
+                "Guardian",
+                "g1",
+                "Chile earthquake strikes northern coast",
+                "Quake in northern Chile",
+                fetched_at=512.5,
+            )
+        ]
+    )
+
+    assert len(clusterer) == 1
+    assert [cluster.event_id for cluster in changed] == ["E000007"]
+    cluster = changed[0]
+    assert cluster.item_count == 3
+    assert cluster.sources == {"BBC", "NPR", "Guardian"}
+    assert cluster.first_fetched_at == 512.5
+    assert cluster.last_fetched_at == 512.5
+    assert clusterer.next_event_number == 8
+
+
+def test_syndicated_copies_do_not_corroborate_breaking() -> None:
+    # One wire story carried by three outlets is one report, not three.
+    index = NearDuplicateIndex(clock=lambda: WALL_NOW)
+    clusterer = EventClusterer(clock=lambda: WALL_NOW)
+    title = "Central bank raises interest rates by half a point"
+    summary = "The central bank raised its benchmark rate by 50 basis points on Tuesday."
+    items = [
+        _item(feed, f"{feed}-1", title, summary, fetched_at=100.0 + number)
+        for number, feed in enumerate(["Global Wire", "Markets Daily", "City Ledger"])
+    ]
+    for item in items:
+        item.duplicate_of = index.check(f"{item.feed}:{item.guid}", title, summary).duplicate_of
+
+    changed = clusterer.add_items(items)
+
+    assert [item.duplicate_of for item in items] == [
+        None,
+        "Global Wire:Global Wire-1",
+        "Global Wire:Global Wire-1",
+    ]
+    assert len(changed) == 1
+    cluster = changed[0]
+    assert cluster.status == "Ongoing"
+    assert cluster.item_count == 1
+    assert cluster.sources == {"Global Wire"}
+    assert cluster.last_fetched_at == 100.0
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+
+from ai_radio_gui.services.feed_fetcher import FeedFetcher, FeedSource
+from ai_radio_gui.services.http_client import HttpClient
+from benchmarks.feed_stub import FeedStub
+
+
+def test_feeds_queued_for_a_connection_do_not_time_out() -> None:
+    async def run() -> None:
+        stub = FeedStub(items=3, delay=0.2)
+        port = await stub.start()
+        client = HttpClient(max_connections_per_host=1)
+        sources = [
+            FeedSource(f"Feed {index}", f"http://127.0.0.1:{port}/feed{index}")
+            for index in range(4)
+        ]
+        fetcher = FeedFetcher(sources, client=client, timeout_seconds=0.5)
+        try:
+            summary = await fetcher.poll()
+        finally:
+            await client.close()
+            stub.close()
+        assert summary.failures == {}
+        assert summary.fetched == 4
+
+    asyncio.run(run())
+
+
+def test_slow_response_still_times_out() -> None:
+    async def run() -> None:
+        stub = FeedStub(items=3, delay=0.5)
+        port = await stub.start()
+        client = HttpClient()
+        fetcher = FeedFetcher(
+            [FeedSource("Slow", f"http://127.0.0.1:{port}/slow")],
+            client=client,
+            timeout_seconds=0.1,
+        )
+        try:
+            summary = await fetcher.poll()
+        finally:
+            await client.close()
+            stub.close()
+        assert summary.failures == {"Slow": "Timed out."}
+
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from ai_radio_gui.services.hls import HlsSegment, HlsSegmenter
+
+
+def _segments(count: int) -> list[HlsSegment]:
+    return [
+        HlsSegment(
+            sequence=number,
+            start=1_700_000_000.0 + 6 * number,
+            duration=6.0,
+            path=f"archive/2023/11/14/22/{number:09d}.aac",
+            data=b"x" * 100,
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def _indexed(segmenter: HlsSegmenter) -> list[int]:
+    db = sqlite3.connect(str(segmenter.db_path))
+    try:
+        return [row[0] for row in db.execute("SELECT sequence FROM segments ORDER BY sequence")]
+    finally:
+        db.close()
+
+
+def _segmenter(root: Path) -> HlsSegmenter:
+    segmenter = HlsSegmenter(root, 1024 / 48000)
+    segmenter.close()
+    segmenter._db = segmenter._connect()
+    return segmenter
+
+
+def test_failed_file_write_indexes_the_rest(tmp_path: Path) -> None:
+    segmenter = _segmenter(tmp_path)
+    batch = _segments(3)
+    # A directory in the way makes the second file write fail.
+    (tmp_path / batch[1].path).mkdir(parents=True)
+
+    segmenter._write_batch(batch)
+
+    assert _indexed(segmenter) == [1, 3]
+    assert segmenter.segments_written == 2
+    assert segmenter.bytes_written == 200
+    assert segmenter.errors == 1
+    assert [segment.sequence for segment in segmenter._live] == [1, 3]
+    assert len(segmenter.archive_segments(batch[0].start, 60)) == 2
+
+
+def test_failed_insert_counts_nothing_and_leaves_no_files(tmp_path: Path) -> None:
+    segmenter = _segmenter(tmp_path)
+    batch = _segments(2)
+    segmenter._db.close()
+
+    segmenter._write_batch(batch)
+
+    assert segmenter.segments_written == 0
+    assert segmenter.bytes_written == 0
+    assert segmenter.errors == 1
+    assert not list(segmenter._live)
+    assert not any((tmp_path / segment.path).exists() for segment in batch)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ai_radio_gui.services.loudness import LoudnessMeter
+
+
+def test_full_scale_sine_reads_minus_three_lufs_in_any_block_size() -> None:
+    rate = 48000
+    time = np.arange(rate * 3) / rate
+    sine = np.sin(2 * np.pi * 997 * time)[None, :]
+    meter = LoudnessMeter(rate, [1])
+    offset = 0
+    for size in (1, 2, 255, 256, 257, 1024, 4000):
+        meter.process(sine[:, offset : offset + size])
+        offset += size
+    meter.process(sine[:, offset:])
+    assert abs(meter.integrated()[0] + 3.01) < 0.05
+    assert abs(meter.true_peak_dbtp()[0]) < 0.1
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from ai_radio_gui.services.planner import RundownPlanner, SegmentTemplate, next_hour
+
+TEMPLATES = [
+    SegmentTemplate("Top of Hour Headlines", 180, 300, priority=10, anchor_offset=0),
+    SegmentTemplate("Market Snapshot", 120, 240, priority=5),
+    SegmentTemplate("Weather Update", 60, 120, priority=6),
+    SegmentTemplate("Music Bed", 30, 600, priority=1),
+]
+
+
+def test_breaking_near_the_hour_follows_the_anchor_uncut() -> None:
+    hour = next_hour(1_700_000_000)
+    now = float(hour - 10)
+    planner = RundownPlanner(TEMPLATES, horizon_hours=2, clock=lambda: now)
+    breaking = SegmentTemplate("Breaking: Quake", 60, 180, priority=10)
+
+    start = planner.replan(now, [breaking])
+
+    plan = planner.segments_from(start, 4)
+    titles = [segment.title for segment in plan]
+    assert titles.index("Top of Hour Headlines") < titles.index("Breaking: Quake")
+    anchor = plan[titles.index("Top of Hour Headlines")]
+    assert anchor.start == hour
+    placed = plan[titles.index("Breaking: Quake")]
+    assert placed.start == anchor.end
+    assert placed.duration_seconds >= breaking.min_seconds
+    # Segments still tile the timeline without gaps or overlaps.
+    full = planner.plan()
+    assert all(a.end == b.start for a, b in zip(full, full[1:]))
+    assert [s.title for s in full].count("Breaking: Quake") == 1
+
+
+def test_breaking_with_room_airs_before_the_hour() -> None:
+    hour = next_hour(1_700_000_000)
+    now = float(hour - 1200)
+    planner = RundownPlanner(TEMPLATES, horizon_hours=2, clock=lambda: now)
+    breaking = SegmentTemplate("Breaking: Quake", 60, 180, priority=10)
+
+    start = planner.replan(now, [breaking])
+
+    first = planner.segments_from(start, 1)[0]
+    assert first.title == "Breaking: Quake"
+    assert first.start == now
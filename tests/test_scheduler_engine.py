@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import random
+
+from ai_radio_gui.models.state import SegmentEntry
+from ai_radio_gui.services.scheduler_engine import SchedulerEngine
+
+DAY_SECONDS = 86400.0
+
+
+class FakeClock:
+    def __init__(self, start: float = 1000.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _segment(number: int, duration: int) -> SegmentEntry:
+    return SegmentEntry(f"Segment {number}", "", duration, duration, f"S{number}")
+
+
+def test_no_drift_over_simulated_day() -> None:
+    # The boundary timer fires late by QTimer-like jitter plus occasional
+    # multi-second event-loop stalls; deadlines must not absorb any of it.
+    clock = FakeClock()
+    rng = random.Random(33)
+    engine = SchedulerEngine(clock=clock)
+    numbers = iter(range(1, 100000))
+    engine.extend(_segment(next(numbers), rng.randint(30, 900)) for _ in range(7))
+    origin = engine.current().start_deadline
+    aired = 0
+    worst_late = 0.0
+    while clock.now - origin < DAY_SECONDS:
+        boundary = engine.next_boundary()
+        late = rng.uniform(0.0, 0.05)
+        if rng.random() < 0.01:
+            late += rng.uniform(1.0, 5.0)
+        clock.now = boundary + late
+        for segment in engine.advance():
+            # Every segment ends exactly where the sum of durations says.
+            aired += segment.duration_seconds
+            assert segment.end_deadline - origin == aired
+        worst_late = max(worst_late, late)
+        while len(engine) < 7:
+            engine.extend([_segment(next(numbers), rng.randint(30, 900))])
+    current = engine.current()
+    assert aired > DAY_SECONDS - 900
+    assert current.start_deadline - origin == aired
+    # Lateness is bounded by the worst single stall, not accumulated.
+    assert clock.now - engine.current().start_deadline <= worst_late
+
+
+def test_remaining_seconds_follow_deadlines() -> None:
+    clock = FakeClock()
+    engine = SchedulerEngine(clock=clock)
+    engine.extend([_segment(1, 120), _segment(2, 60)])
+    first = engine.current()
+    clock.now += 30.4
+    assert engine.remaining_seconds(first) == 90
+    # A stalled update loop does not change what is left on air.
+    clock.now += 59.6
+    engine.update_remaining()
+    assert first.remaining_seconds == 30
+    assert engine.remaining_seconds(engine.segments()[1]) == 60
+
+
+def test_pause_shifts_deadlines_by_paused_time() -> None:
+    clock = FakeClock()
+    engine = SchedulerEngine(clock=clock)
+    engine.extend([_segment(1, 120), _segment(2, 60)])
+    first, second = engine.segments()
+    end = first.end_deadline
+    clock.now += 50
+    engine.pause()
+    assert engine.next_boundary() is None
+    assert engine.advance() == []
+    clock.now += 500
+    assert engine.remaining_seconds(first) == 70
+    engine.resume()
+    assert first.end_deadline == end + 500
+    assert second.start_deadline == first.end_deadline
+    clock.now = first.end_deadline
+    assert engine.advance() == [first]
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ai_radio_gui.services.script_cache import ScriptCache
+
+
+def test_memory_limit_counts_encoded_bytes(tmp_path: Path) -> None:
+    cache = ScriptCache(tmp_path, max_memory_bytes=100)
+    cache.put("first", "é" * 40)
+    cache.put("second", "é" * 40)
+    assert cache._memory_bytes == 80
+    assert list(cache._memory) == ["second"]